@@ -0,0 +1,110 @@
+"""
+效能測試的測試檔案
+以DisplayTestDataGenerator產生邊緣衰減的面板數據，存成含標題行與摘要行的.xlsx/.csv，
+或只有數值的.npy/.parquet/.bep（二進位格式沒有文字儲存格），
+產生過的檔案保留在快取目錄中，之後的執行直接使用
+"""
+
+import contextlib
+import io
+import os
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # 數據生成器會匯入pyplot，效能測試不需要視窗
+
+from blue_edge_analyzer.core.raw_panel import write_raw_panel
+from data_samples.test_data_generator import DisplayTestDataGenerator
+
+
+# 預設的測試檔案大小（行數, 欄數）
+DEFAULT_SHAPES = [(400, 400), (2000, 2000), (4000, 400)]
+DEFAULT_FORMATS = ['csv', 'xlsx', 'npy']
+# 可用的格式（parquet需要安裝pyarrow；bep為float32原始面板）
+FORMATS = ['csv', 'xlsx', 'npy', 'parquet', 'bep']
+DEFAULT_FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.fixtures')
+# 邊緣衰減百分比與隨機種子固定，每次產生的數據相同
+DECAY_PERCENTAGE = 0.15
+SEED = 0
+
+
+def shape_label(shape: Tuple[int, int]) -> str:
+    """測試檔案大小的標籤，例如 '400x400'"""
+    return f'{shape[0]}x{shape[1]}'
+
+
+def parse_shape(text: str) -> Tuple[int, int]:
+    """將 '400x400' 轉為 (400, 400)"""
+    rows, cols = text.lower().split('x')
+    return int(rows), int(cols)
+
+
+def generate_panel(shape: Tuple[int, int], seed: int = SEED) -> np.ndarray:
+    """
+    以DisplayTestDataGenerator產生指定大小的面板數據
+    
+    生成器只產生正方形矩陣：欄數為正方形的邊長，行數較多時上下堆疊多個面板。
+    
+    Args:
+        shape: (行數, 欄數)
+        seed: 隨機種子
+        
+    Returns:
+        np.ndarray: 數值矩陣（四捨五入到小數點後兩位）
+    """
+    rows, cols = shape
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator = DisplayTestDataGenerator(seed=seed)
+    generator.matrix_size = cols
+    
+    panels = [generator.generate_edge_decay_data(DECAY_PERCENTAGE) for _ in range(-(-rows // cols))]
+    return np.vstack(panels)[:rows].round(2)
+
+
+def panel_frame(values: np.ndarray) -> pd.DataFrame:
+    """在數值矩陣前後加上標題行與摘要行，與實際量測檔案的版面相同"""
+    cols = values.shape[1]
+    header = [['Blue Edge Panel'] + [None] * (cols - 1)]
+    footer = [['Summary', f'{values.mean():.2f}'] + [None] * (cols - 2)]
+    return pd.DataFrame(header + values.tolist() + footer)
+
+
+def fixture_path(shape: Tuple[int, int], file_format: str, fixture_dir: str = DEFAULT_FIXTURE_DIR) -> str:
+    """
+    取得測試檔案路徑，檔案不存在時產生
+    
+    Args:
+        shape: (行數, 欄數)
+        file_format: 'csv'、'xlsx'、'npy'、'parquet' 或 'bep'
+        fixture_dir: 快取目錄
+        
+    Returns:
+        str: 檔案路徑
+    """
+    os.makedirs(fixture_dir, exist_ok=True)
+    path = os.path.join(fixture_dir, f'panel_{shape_label(shape)}_seed{SEED}.{file_format}')
+    if os.path.exists(path):
+        return path
+    
+    print(f"產生測試檔案: {os.path.basename(path)}（僅第一次執行）...")
+    values = generate_panel(shape)
+    # 先寫入暫存檔，中斷時不會留下不完整的測試檔案
+    temp_path = os.path.join(fixture_dir, f'.partial_{os.path.basename(path)}')
+    if file_format == 'csv':
+        panel_frame(values).to_csv(temp_path, header=False, index=False)
+    elif file_format == 'xlsx':
+        with pd.ExcelWriter(temp_path, engine='openpyxl') as writer:
+            panel_frame(values).to_excel(writer, sheet_name='PanelData', header=False, index=False)
+    elif file_format == 'npy':
+        with open(temp_path, 'wb') as f:
+            np.save(f, values, allow_pickle=False)
+    elif file_format == 'bep':
+        write_raw_panel(temp_path, values, np.float32)
+    elif file_format == 'parquet':
+        pd.DataFrame(values, columns=[str(col) for col in range(values.shape[1])]).to_parquet(temp_path, index=False)
+    else:
+        raise ValueError(f"不支援的測試檔案格式: {file_format}")
+    os.replace(temp_path, path)
+    return path
@@ -0,0 +1,291 @@
+"""
+效能測試
+量測載入、開始/結束行偵測、矩陣取得與Blue Edge Index計算的時間，結果存成JSON，
+可與其他commit的結果比較找出效能退步
+
+使用方式:
+    python benchmarks/run_benchmarks.py run                        # 執行並存到 benchmarks/results/<commit>.json
+    python benchmarks/run_benchmarks.py run --shapes 400x400 --formats csv -k calculator
+    python benchmarks/run_benchmarks.py compare old.json new.json  # 比較兩次結果
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+sys.path.insert(0, BENCHMARK_DIR)
+
+from blue_edge_analyzer.core.batch_processor import analyze_file  # noqa: E402
+from blue_edge_analyzer.core.blue_edge_calculator import BlueEdgeCalculator  # noqa: E402
+from blue_edge_analyzer.core.excel_processor import ExcelProcessor  # noqa: E402
+from fixtures import (  # noqa: E402
+    DEFAULT_FIXTURE_DIR, DEFAULT_FORMATS, DEFAULT_SHAPES, FORMATS, fixture_path, parse_shape, shape_label
+)
+
+
+DEFAULT_RESULTS_DIR = os.path.join(BENCHMARK_DIR, 'results')
+# 中位數比基準慢超過此比例視為退步
+DEFAULT_TOLERANCE = 0.2
+
+
+@dataclass
+class Benchmark:
+    """一項效能測試：每次量測前執行setup（不計時），再以其回傳值呼叫run（計時）"""
+    
+    name: str
+    setup: Callable[[], object]
+    run: Callable[[object], object]
+
+
+def time_benchmark(benchmark: Benchmark, min_repeats: int = 3, max_repeats: int = 50,
+                   max_time: float = 2.0) -> dict:
+    """
+    重複量測一項效能測試
+    
+    至少量測min_repeats次；之後累計時間超過max_time或達到max_repeats次即停止，
+    單次需要數十秒的測試（例如大型.xlsx載入）只量測一次。
+    
+    Returns:
+        dict: min/median/mean/stdev（秒）與量測次數
+    """
+    times = []
+    started = time.perf_counter()
+    while len(times) < max_repeats:
+        state = benchmark.setup()
+        t0 = time.perf_counter()
+        benchmark.run(state)
+        times.append(time.perf_counter() - t0)
+        
+        elapsed = time.perf_counter() - started
+        if elapsed > max_time and (len(times) >= min_repeats or elapsed > max_time * min_repeats):
+            break
+    
+    return {
+        'min': min(times),
+        'median': statistics.median(times),
+        'mean': statistics.fmean(times),
+        'stdev': statistics.stdev(times) if len(times) > 1 else 0.0,
+        'repeats': len(times)
+    }
+
+
+def _fresh_processor(sheet) -> ExcelProcessor:
+    """以已解析的工作表建立處理器，逐行分類與清理結果尚未快取"""
+    processor = ExcelProcessor()
+    processor._set_sheet(sheet)
+    return processor
+
+
+def _calculate_blue_edge(processor: ExcelProcessor, calculator: BlueEdgeCalculator, start_row: int,
+                         end_row: int):
+    """與GUI背景計算相同的流程（MainWindow.calculate_blue_edge，不需要Tk）"""
+    matrix_view = processor.get_matrix_view(start_row=start_row, end_row=end_row)
+    sanitized = processor.get_sanitized_middle_column(start_row, end_row)
+    return matrix_view.shape, calculator.evaluate(sanitized.values, include_details=True)
+
+
+def build_benchmarks(shapes: List[Tuple[int, int]], formats: List[str],
+                     fixture_dir: str = DEFAULT_FIXTURE_DIR) -> List[Benchmark]:
+    """
+    建立所有效能測試
+    
+    Args:
+        shapes: 測試檔案大小（行數, 欄數）
+        formats: 測試檔案格式
+        fixture_dir: 測試檔案快取目錄
+        
+    Returns:
+        List[Benchmark]: 效能測試清單
+    """
+    benchmarks = []
+    calculator = BlueEdgeCalculator()
+    
+    for shape in shapes:
+        label = shape_label(shape)
+        paths = {file_format: fixture_path(shape, file_format, fixture_dir) for file_format in formats}
+        
+        for file_format, path in paths.items():
+            benchmarks.append(Benchmark(f'load_file[{label}.{file_format}]', ExcelProcessor,
+                                        lambda processor, path=path: processor.load_file(path)))
+            benchmarks.append(Benchmark(f'end_to_end[{label}.{file_format}]', lambda: None,
+                                        lambda state, path=path: analyze_file(path)))
+        
+        # 以下測試與檔案格式無關，使用已解析的工作表
+        loaded = ExcelProcessor()
+        if not loaded.load_file(next(iter(paths.values())), streaming=False):
+            raise RuntimeError(f"無法載入測試檔案: {label}")
+        sheet = loaded.get_compact_sheet()
+        start_row = loaded.detect_data_start_row()
+        end_row = loaded.detect_data_end_row(start_row)
+        middle_column = loaded.get_middle_column_view(start_row, end_row).copy()
+        
+        benchmarks += [
+            Benchmark(f'detect_data_start_row[{label}]', lambda sheet=sheet: _fresh_processor(sheet),
+                      lambda processor: processor.detect_data_start_row()),
+            Benchmark(f'detect_data_end_row[{label}]', lambda sheet=sheet: _fresh_processor(sheet),
+                      lambda processor, start_row=start_row: processor.detect_data_end_row(start_row)),
+            Benchmark(f'get_matrix_data[{label}]', lambda processor=loaded: processor,
+                      lambda processor, start_row=start_row, end_row=end_row:
+                      processor.get_matrix_data(start_row, end_row)),
+            Benchmark(f'calculator_topside[{label}]', lambda data=middle_column: data,
+                      calculator.calculate_blue_edge_index),
+            Benchmark(f'calculator_bottomside[{label}]', lambda data=middle_column: data,
+                      calculator.calculate_bottomside_blue_edge_index),
+            Benchmark(f'calculate_blue_edge[{label}]', lambda sheet=sheet: _fresh_processor(sheet),
+                      lambda processor, start_row=start_row, end_row=end_row:
+                      _calculate_blue_edge(processor, calculator, start_row, end_row)),
+        ]
+    
+    return benchmarks
+
+
+def git_commit() -> Optional[str]:
+    """目前的commit，無法取得時為None"""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=BENCHMARK_DIR, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(benchmarks: List[Benchmark], max_time: float = 2.0) -> dict:
+    """
+    依序執行效能測試
+    
+    Returns:
+        dict: 可直接存成JSON的結果，包含執行環境與每項測試的量測值
+    """
+    results = {}
+    for benchmark in benchmarks:
+        stats = time_benchmark(benchmark, max_time=max_time)
+        results[benchmark.name] = stats
+        print(f"{benchmark.name:<45} {stats['median'] * 1000:12.3f} ms  (x{stats['repeats']})")
+    
+    return {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'machine': {
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+        },
+        'benchmarks': results
+    }
+
+
+def compare_results(baseline: dict, current: dict, tolerance: float = DEFAULT_TOLERANCE) -> pd.DataFrame:
+    """
+    比較兩次結果的中位數
+    
+    Args:
+        baseline: 基準結果
+        current: 目前結果
+        tolerance: 比基準慢超過此比例視為退步
+        
+    Returns:
+        pd.DataFrame: 兩邊都有的測試，包含兩次的中位數（秒）、比值（目前/基準）與是否退步
+    """
+    rows = []
+    for name, stats in current['benchmarks'].items():
+        if name not in baseline['benchmarks']:
+            continue
+        before, after = baseline['benchmarks'][name]['median'], stats['median']
+        ratio = after / before if before > 0 else float('inf')
+        rows.append({'name': name, 'baseline': before, 'current': after, 'ratio': ratio,
+                     'regression': ratio > 1.0 + tolerance})
+    return pd.DataFrame(rows, columns=['name', 'baseline', 'current', 'ratio', 'regression'])
+
+
+def print_comparison(comparison: pd.DataFrame):
+    """印出比較結果"""
+    for row in comparison.itertuples():
+        flag = '  ← 退步' if row.regression else ''
+        print(f"{row.name:<45} {row.baseline * 1000:12.3f} ms → {row.current * 1000:12.3f} ms  "
+              f"x{row.ratio:.2f}{flag}")
+
+
+def load_results(path: str) -> dict:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """建立命令列參數解析器"""
+    parser = argparse.ArgumentParser(description='Blue Edge Index Analyzer 效能測試')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    run_parser = subparsers.add_parser('run', help='執行效能測試並存成JSON')
+    run_parser.add_argument('--shapes', nargs='+', default=[shape_label(shape) for shape in DEFAULT_SHAPES],
+                            help='測試檔案大小，預設為 400x400 2000x2000 4000x400')
+    run_parser.add_argument('--formats', nargs='+', choices=FORMATS, default=DEFAULT_FORMATS,
+                            help='測試檔案格式，預設為 csv xlsx npy（另有parquet與bep，parquet需要pyarrow）')
+    run_parser.add_argument('-k', '--filter', default=None, help='只執行名稱包含此字串的測試')
+    run_parser.add_argument('-o', '--output', default=None,
+                            help='結果檔案路徑，預設為 benchmarks/results/<commit>.json')
+    run_parser.add_argument('--compare', default=None, help='執行後與此結果檔案比較')
+    run_parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                            help='比基準慢超過此比例視為退步，預設0.2')
+    run_parser.add_argument('--max-time', type=float, default=2.0, help='每項測試的量測時間上限（秒），預設2')
+    run_parser.add_argument('--fixture-dir', default=DEFAULT_FIXTURE_DIR, help='測試檔案快取目錄')
+    
+    compare_parser = subparsers.add_parser('compare', help='比較兩個結果檔案')
+    compare_parser.add_argument('baseline', help='基準結果檔案')
+    compare_parser.add_argument('current', help='目前結果檔案')
+    compare_parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                                help='比基準慢超過此比例視為退步，預設0.2')
+    
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令列主程式
+    
+    Returns:
+        int: 結束代碼，比較結果有退步時為1
+    """
+    args = build_parser().parse_args(argv)
+    
+    if args.command == 'compare':
+        comparison = compare_results(load_results(args.baseline), load_results(args.current), args.tolerance)
+        print_comparison(comparison)
+        return 1 if comparison['regression'].any() else 0
+    
+    benchmarks = build_benchmarks([parse_shape(shape) for shape in args.shapes], args.formats, args.fixture_dir)
+    if args.filter:
+        benchmarks = [benchmark for benchmark in benchmarks if args.filter in benchmark.name]
+    
+    results = run_benchmarks(benchmarks, max_time=args.max_time)
+    
+    output = args.output
+    if output is None:
+        os.makedirs(DEFAULT_RESULTS_DIR, exist_ok=True)
+        output = os.path.join(DEFAULT_RESULTS_DIR, f"{(results['commit'] or 'unknown')[:10]}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"結果已儲存: {output}")
+    
+    if args.compare:
+        comparison = compare_results(load_results(args.compare), results, args.tolerance)
+        print_comparison(comparison)
+        return 1 if comparison['regression'].any() else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
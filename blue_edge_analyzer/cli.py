@@ -0,0 +1,97 @@
+"""
+命令列入口
+不帶子命令時啟動GUI，`batch` 子命令則以無介面模式批次分析檔案
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+
+def positive_int(value: str) -> int:
+    """argparse的型態檢查：大於0的整數"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"必須至少為1，實際為 {number}")
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """建立命令列參數解析器"""
+    parser = argparse.ArgumentParser(
+        prog='blue-edge-analyzer',
+        description='Blue Edge Index Analyzer'
+    )
+    subparsers = parser.add_subparsers(dest='command')
+    
+    subparsers.add_parser('gui', help='啟動GUI（預設）')
+    
+    batch_parser = subparsers.add_parser('batch', help='批次分析目錄或glob樣式中的所有檔案')
+    batch_parser.add_argument('inputs', nargs='+', help='目錄、檔案或glob樣式（例如 "data/**/*.xlsx"）')
+    batch_parser.add_argument('-o', '--output', default='blue_edge_results.csv',
+                              help='結果檔案路徑（.csv、.jsonl 或 .parquet），預設為 blue_edge_results.csv')
+    batch_parser.add_argument('--format', choices=['csv', 'jsonl', 'parquet'], default=None,
+                              help='輸出格式，預設依副檔名判斷')
+    batch_parser.add_argument('-j', '--workers', type=positive_int, default=None,
+                              help='平行行程數，預設為CPU核心數')
+    batch_parser.add_argument('--sheet', default=None, help='Excel工作表或.npz陣列名稱，預設為第一個')
+    batch_parser.add_argument('--topside', type=float, default=10.0, help='TopSide N%%閾值，預設10')
+    batch_parser.add_argument('--bottomside', type=float, default=10.0, help='BottomSide N%%閾值，預設10')
+    batch_parser.add_argument('--ng-threshold', type=float, default=10.0, help='NG判斷閾值，預設10.0')
+    batch_parser.add_argument('--cache-dir', default=None,
+                              help='已解析檔案的磁碟快取目錄，重新分析同一批檔案時不必再解析，預設不使用')
+    
+    return parser
+
+
+def run_batch_command(args: argparse.Namespace) -> int:
+    """執行batch子命令"""
+    from .core.batch_processor import collect_files, run_batch, write_results
+    
+    files = collect_files(args.inputs)
+    if not files:
+        print("找不到任何支援的檔案")
+        return 1
+    
+    print(f"開始分析 {len(files)} 個檔案...")
+    results = run_batch(
+        files,
+        workers=args.workers,
+        topside_percentage=args.topside / 100.0,
+        bottomside_percentage=args.bottomside / 100.0,
+        ng_threshold=args.ng_threshold,
+        sheet_name=args.sheet,
+        cache_dir=args.cache_dir
+    )
+    write_results(results, args.output, args.format)
+    
+    failed = int((results['status'] == 'error').sum())
+    ng_count = int(((results['topside_judgment'] == 'NG') | (results['bottomside_judgment'] == 'NG')).sum())
+    print(f"完成: {len(results)} 個檔案，NG {ng_count} 個，失敗 {failed} 個")
+    print(f"結果已儲存: {args.output}")
+    
+    return 1 if failed else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令列主程式
+    
+    Args:
+        argv: 命令列參數，預設為None（使用sys.argv）
+        
+    Returns:
+        int: 結束代碼
+    """
+    args = build_parser().parse_args(argv)
+    
+    if args.command == 'batch':
+        return run_batch_command(args)
+    
+    from .gui.main_window import run_application
+    run_application()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""
+批次分析模組
+不經由GUI，平行分析整個目錄的Excel/CSV量測檔案
+"""
+
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Iterable, List, Optional
+
+import pandas as pd
+
+from .blue_edge_calculator import BlueEdgeCalculator
+from .excel_processor import ExcelProcessor
+
+
+# 結果表格的欄位順序
+RESULT_COLUMNS = [
+    'file', 'sheet', 'status', 'error',
+    'start_row', 'end_row', 'total_data_points', 'dropped_cells',
+    'topside_max', 'topside_position', 'topside_judgment',
+    'bottomside_max', 'bottomside_position', 'bottomside_judgment',
+]
+
+
+def collect_files(patterns: Iterable[str]) -> List[str]:
+    """
+    將目錄或glob樣式展開為排序後的檔案清單
+    
+    Args:
+        patterns: 目錄路徑、檔案路徑或glob樣式
+        
+    Returns:
+        List[str]: 依路徑排序且不重複的支援檔案清單
+    """
+    files = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            candidates = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+        else:
+            candidates = glob.glob(pattern, recursive=True)
+        
+        for path in candidates:
+            if os.path.isfile(path) and os.path.splitext(path)[1].lower() in ExcelProcessor.SUPPORTED_EXTENSIONS:
+                files.add(os.path.abspath(path))
+    
+    return sorted(files)
+
+
+def analyze_file(file_path: str, topside_percentage: float = 0.1, bottomside_percentage: float = 0.1,
+                 ng_threshold: float = 10.0, sheet_name: Optional[str] = None,
+                 cache_dir: Optional[str] = None) -> dict:
+    """
+    分析單一檔案：載入、自動偵測開始/結束行數並計算TopSide/BottomSide
+    
+    Args:
+        file_path: 檔案路徑
+        topside_percentage: TopSide閾值百分比 (0.0 - 1.0)
+        bottomside_percentage: BottomSide閾值百分比 (0.0 - 1.0)
+        ng_threshold: NG判斷閾值
+        sheet_name: 工作表名稱，預設為None（第一個工作表）
+        cache_dir: 磁碟快取目錄，預設為None（不使用磁碟快取）
+        
+    Returns:
+        dict: 一列結果，欄位見RESULT_COLUMNS
+    """
+    row = dict.fromkeys(RESULT_COLUMNS)
+    row['file'] = file_path
+    row['sheet'] = sheet_name
+    
+    processor = ExcelProcessor(cache_dir=cache_dir)
+    try:
+        if not processor.load_file(file_path, sheet_name):
+            row['status'] = 'error'
+            row['error'] = processor.last_error or '無法載入檔案'
+            return row
+        
+        if processor.get_file_type() in ('excel', 'npz'):
+            row['sheet'] = sheet_name or processor.get_available_sheets()[0]
+        
+        calculator = BlueEdgeCalculator()
+        calculator.set_topside_threshold_percentage(topside_percentage)
+        calculator.set_bottomside_threshold_percentage(bottomside_percentage)
+        calculator.set_ng_threshold(ng_threshold)
+        
+        # 與GUI相同的自動偵測流程
+        start_row = processor.detect_data_start_row()
+        end_row = processor.detect_data_end_row(start_row)
+        
+        sanitized = processor.get_sanitized_middle_column(start_row, end_row)
+        result = calculator.evaluate(sanitized.values)
+        
+        row.update({
+            'status': 'ok' if result.total_data_points > 0 else 'no_data',
+            'start_row': start_row + 1,  # Excel行號
+            'end_row': end_row,
+            'total_data_points': result.total_data_points,
+            'dropped_cells': sanitized.dropped_count,
+            'topside_max': result.topside.max_value,
+            'topside_position': result.topside.max_position,
+            'topside_judgment': result.topside.judgment,
+            'bottomside_max': result.bottomside.max_value,
+            'bottomside_position': result.bottomside.max_position,
+            'bottomside_judgment': result.bottomside.judgment,
+        })
+    except Exception as e:
+        row['status'] = 'error'
+        row['error'] = str(e)
+    finally:
+        processor.close()
+    
+    return row
+
+
+def run_batch(files: List[str], workers: Optional[int] = None, **settings) -> pd.DataFrame:
+    """
+    以多個行程平行分析檔案，結果順序與輸入檔案順序一致
+    
+    Args:
+        files: 檔案清單
+        workers: 行程數，預設為None（CPU核心數）；1表示在目前行程中依序執行
+        **settings: 傳給analyze_file的計算參數
+        
+    Returns:
+        pd.DataFrame: 每個檔案一列的結果表格
+        
+    Raises:
+        ValueError: 行程數小於1
+    """
+    if workers is not None and workers < 1:
+        raise ValueError(f"行程數必須至少為1，實際為 {workers}")
+    
+    worker = partial(analyze_file, **settings)
+    
+    if workers == 1 or len(files) <= 1:
+        rows = [worker(path) for path in files]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # map會依輸入順序回傳結果
+            rows = list(executor.map(worker, files))
+    
+    return pd.DataFrame(rows, columns=RESULT_COLUMNS)
+
+
+def write_results(results: pd.DataFrame, output_path: str, output_format: Optional[str] = None):
+    """
+    將結果表格寫入檔案
+    
+    Args:
+        results: 結果表格
+        output_path: 輸出路徑
+        output_format: 'csv'、'jsonl' 或 'parquet'，預設依副檔名判斷
+    """
+    if output_format is None:
+        ext = os.path.splitext(output_path)[1].lower()
+        output_format = {'.jsonl': 'jsonl', '.json': 'jsonl', '.parquet': 'parquet'}.get(ext, 'csv')
+    
+    if output_format == 'csv':
+        results.to_csv(output_path, index=False, encoding='utf-8')
+    elif output_format == 'jsonl':
+        results.to_json(output_path, orient='records', lines=True, force_ascii=False)
+    elif output_format == 'parquet':
+        # 需要安裝pyarrow
+        results.to_parquet(output_path, index=False)
+    else:
+        raise ValueError(f"不支援的輸出格式: {output_format}")
@@ -4,12 +4,219 @@ Blue Edge Index 計算模組
 """
 
 import numpy as np
-from typing import Tuple, Optional
+import pandas as pd
+from dataclasses import dataclass, field, replace
+from typing import Hashable, Tuple, Optional
+
+from ..utils.sanitizer import coerce_numeric_matrix, sanitize_numeric
+
+
+def compute_index_values(threshold_data: np.ndarray, baseline_value: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    向量化計算閾值區段內每個數據點的比值與Index值
+    
+    公式為 (基準值 ÷ 各個數據 - 1) × 100，數據為0的點比值與結果皆為0.0
+    
+    Args:
+        threshold_data: 閾值區段內的數據
+        baseline_value: 基準值
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (比值陣列, Index值陣列)
+    """
+    threshold_data = np.asarray(threshold_data, dtype=float)
+    nonzero = threshold_data != 0
+    
+    ratios = np.zeros(threshold_data.shape, dtype=float)
+    np.divide(baseline_value, threshold_data, out=ratios, where=nonzero)
+    results = np.where(nonzero, (ratios - 1) * 100, 0.0)
+    
+    return ratios, results
+
+
+@dataclass
+class SideResult:
+    """單側（TopSide/BottomSide）的計算結果"""
+    
+    side_type: str
+    max_value: float
+    max_position: int
+    judgment: str
+    threshold_points: int = 0
+    threshold_percentage: float = 0.0
+    baseline_value: Optional[float] = None
+    baseline_position: int = 0
+    # 以下為逐點詳細資料，僅在 include_details=True 時提供
+    threshold_data: Optional[np.ndarray] = None
+    ratios: Optional[np.ndarray] = None
+    calculated_values: Optional[np.ndarray] = None
+
+
+@dataclass
+class BlueEdgeResult:
+    """一次評估同時取得的TopSide與BottomSide結果"""
+    
+    topside: SideResult
+    bottomside: SideResult
+    total_data_points: int
+    data_range: Optional[Tuple[float, float]] = None
+
+
+@dataclass
+class MatrixSideResult:
+    """矩陣中每一列（或每一行）單側的計算結果"""
+    
+    side_type: str
+    max_values: np.ndarray
+    max_positions: np.ndarray  # 位置從1開始，無有效數據時為0
+    judgments: np.ndarray  # 'Pass'/'NG' 字串陣列
+    threshold_points: np.ndarray
+
+
+@dataclass
+class BlueEdgeMatrixResult:
+    """整個矩陣的Blue Edge Index評估結果"""
+    
+    topside: MatrixSideResult  # 每一列由上往下
+    bottomside: MatrixSideResult  # 每一列由下往上
+    total_data_points: np.ndarray  # 每一列的有效數據點數
+    leftside: Optional[MatrixSideResult] = None  # 每一行由左往右（include_rows=True時提供）
+    rightside: Optional[MatrixSideResult] = None  # 每一行由右往左（include_rows=True時提供）
+
+
+@dataclass
+class EvaluationState:
+    """同一組數據（檔案、工作表、開始/結束行）的評估快取"""
+    
+    key: Hashable
+    clean_data: np.ndarray
+    data_range: Optional[Tuple[float, float]] = None
+    # {(side, threshold_index, include_details): SideResult}，判斷結果在取出時依NG閾值重新決定
+    sides: dict = field(default_factory=dict)
+
+
+def _compact_columns(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    將每一列的有效值依原順序移到頂端，相當於逐列移除NaN
+    
+    Args:
+        values: float二維矩陣
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (壓縮後的矩陣, 每一列的有效數據點數)
+    """
+    invalid = np.isnan(values)
+    n_valid = values.shape[0] - invalid.sum(axis=0)
+    
+    if not invalid.any():
+        return values, n_valid
+    
+    order = np.argsort(invalid, axis=0, kind='stable')
+    return np.take_along_axis(values, order, axis=0), n_valid
+
+
+def _evaluate_columns(compact: np.ndarray, n_valid: np.ndarray, percentage: float,
+                      side: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    以二維向量化運算同時計算每一列單側的Blue Edge Index
+    
+    Args:
+        compact: 經_compact_columns壓縮的float矩陣
+        n_valid: 每一列的有效數據點數
+        percentage: 閾值百分比
+        side: 'TopSide' 或 'BottomSide'
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: (最大值, 最大值位置, 閾值點數)
+    """
+    n_cols = compact.shape[1]
+    max_values = np.zeros(n_cols, dtype=float)
+    max_positions = np.zeros(n_cols, dtype=int)
+    
+    # 與單列計算相同：int(len * N%)，至少1個點；無有效數據的列為0
+    threshold_points = np.maximum((n_valid * percentage).astype(int), 1)
+    threshold_points[n_valid == 0] = 0
+    
+    has_data = n_valid > 0
+    if not has_data.any():
+        return max_values, max_positions, threshold_points
+    
+    cols = np.flatnonzero(has_data)
+    k = threshold_points[cols]
+    offsets = np.arange(k.max())[:, None]
+    in_range = offsets < k[None, :]
+    
+    if side == 'TopSide':
+        rows = np.broadcast_to(offsets, in_range.shape)
+        baseline_rows = k - 1
+    else:
+        start = n_valid[cols] - k
+        rows = np.minimum(start[None, :] + offsets, compact.shape[0] - 1)
+        baseline_rows = start
+    
+    threshold_data = compact[rows, cols[None, :]]
+    baseline_values = compact[baseline_rows, cols]
+    
+    _, results = compute_index_values(threshold_data, baseline_values[None, :])
+    results[~in_range] = -np.inf
+    
+    max_index = np.argmax(results, axis=0)
+    max_values[cols] = results[max_index, np.arange(len(cols))]
+    max_positions[cols] = max_index + 1
+    
+    return max_values, max_positions, threshold_points
+
+
+def _sweep_side(clean_data: np.ndarray, threshold_points: np.ndarray,
+                side: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    以一個比值矩陣同時計算多個閾值點數的單側Blue Edge Index
+    
+    矩陣的每一行是前（或後）kmax個數據點，每一列是一個閾值點數k對應的基準值，
+    超出該列區段長度的元素不參與比較。TopSide區段為數據開頭，BottomSide則將數據反轉，
+    使每個區段都從第一行開始，不需要逐列取出不同的範圍。
+    
+    Args:
+        clean_data: 已清理的float陣列（不可為空）
+        threshold_points: 每一列的閾值點數（1 - len(clean_data)）
+        side: 'TopSide' 或 'BottomSide'
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (最大值, 最大值位置)，位置從1開始
+    """
+    k_max = int(threshold_points.max())
+    if side == 'TopSide':
+        # 前k個數據，基準值為第k個
+        segment = clean_data[:k_max]
+        baseline_values = clean_data[threshold_points - 1]
+    else:
+        # 後k個數據反轉後為前k個，基準值（倒數第k個）同樣位於第k行
+        segment = clean_data[::-1][:k_max]
+        baseline_values = clean_data[len(clean_data) - threshold_points]
+    
+    segment = np.broadcast_to(segment[:, None], (k_max, len(threshold_points)))
+    _, results = compute_index_values(segment, baseline_values[None, :])
+    results[np.arange(k_max)[:, None] >= threshold_points[None, :]] = -np.inf
+    
+    if side == 'TopSide':
+        max_index = np.argmax(results, axis=0)
+        positions = max_index + 1
+    else:
+        # 原始順序的第一個最大值是反轉後的最後一個最大值
+        max_index = k_max - 1 - np.argmax(results[::-1], axis=0)
+        positions = threshold_points - max_index
+    
+    return results[max_index, np.arange(len(threshold_points))], positions
 
 
 class BlueEdgeCalculator:
     """Blue Edge Index 計算器"""
     
+    # 每組數據最多保留的單側結果數量（不同閾值點數）
+    MAX_CACHED_SIDES = 64
+    # sweep()每次計算的比值矩陣元素上限，超過時分批計算
+    SWEEP_BLOCK_SIZE = 4_000_000
+    
     def __init__(self):
         self.topside_threshold_percentage = 0.1  # TopSide 前10%的閾值
         self.bottomside_threshold_percentage = 0.1  # BottomSide 後10%的閾值
@@ -17,6 +224,292 @@ class BlueEdgeCalculator:
         self.threshold_percentage = 0.1
         # NG判斷閾值 - Index值大於此數值則判斷為NG
         self.ng_threshold = 10.0
+        # evaluate(cache_key=...)的快取，只保留最近一組數據
+        self._evaluation_state = None
+    
+    @staticmethod
+    def _clean_data(data: np.ndarray) -> np.ndarray:
+        """
+        將輸入數據轉換為float並移除NaN值
+        
+        Args:
+            data: 輸入的數據陣列
+            
+        Returns:
+            np.ndarray: 清理後的float陣列
+        """
+        return sanitize_numeric(data).values
+    
+    def _calculate_side(self, clean_data: np.ndarray, side: str) -> dict:
+        """
+        以向量化核心計算單側的Blue Edge Index
+        
+        Args:
+            clean_data: 已清理的float陣列（不可為空）
+            side: 'TopSide' 或 'BottomSide'
+            
+        Returns:
+            dict: 包含閾值區段、基準值、比值、結果與最大值資訊
+        """
+        if side == 'TopSide':
+            percentage = self.topside_threshold_percentage
+        else:
+            percentage = self.bottomside_threshold_percentage
+        
+        # 計算前/後N%位置的索引
+        threshold_index = int(len(clean_data) * percentage)
+        if threshold_index == 0:
+            threshold_index = 1
+        
+        if side == 'TopSide':
+            # 前N%的數據，基準值為最後一個（第N%位置）
+            threshold_data = clean_data[:threshold_index]
+            baseline_value = threshold_data[-1]
+        else:
+            # 後N%的數據，基準值為第一個（倒數第N%位置）
+            threshold_data = clean_data[-threshold_index:]
+            baseline_value = threshold_data[0]
+        
+        ratios, results = compute_index_values(threshold_data, baseline_value)
+        
+        # 找出最大值和其位置（argmax與max()/list.index()同樣取第一個最大值）
+        max_index = int(np.argmax(results))
+        
+        return {
+            'percentage': percentage,
+            'threshold_index': threshold_index,
+            'threshold_data': threshold_data,
+            'baseline_value': float(baseline_value),
+            'ratios': ratios,
+            'results': results,
+            'max_value': float(results[max_index]),
+            'max_position': max_index + 1  # 位置從1開始計數
+        }
+    
+    def _judge(self, max_value: float) -> str:
+        """依使用者設定的NG閾值判斷Pass/NG"""
+        return 'NG' if max_value > self.ng_threshold else 'Pass'
+    
+    def _build_side_result(self, clean_data: np.ndarray, side: str, include_details: bool) -> SideResult:
+        """
+        將單側計算結果包裝為SideResult
+        
+        Args:
+            clean_data: 已清理的float陣列（不可為空）
+            side: 'TopSide' 或 'BottomSide'
+            include_details: 是否附帶逐點詳細資料
+            
+        Returns:
+            SideResult: 單側計算結果
+        """
+        side_result = self._calculate_side(clean_data, side)
+        threshold_index = side_result['threshold_index']
+        
+        result = SideResult(
+            side_type=side,
+            max_value=side_result['max_value'],
+            max_position=side_result['max_position'],
+            judgment=self._judge(side_result['max_value']),
+            threshold_points=threshold_index,
+            threshold_percentage=side_result['percentage'],
+            baseline_value=side_result['baseline_value'],
+            baseline_position=threshold_index if side == 'TopSide' else 1
+        )
+        
+        if include_details:
+            result.threshold_data = side_result['threshold_data']
+            result.ratios = side_result['ratios']
+            result.calculated_values = side_result['results']
+        
+        return result
+    
+    def _threshold_index(self, data_length: int, side: str) -> int:
+        """依目前的閾值百分比計算單側的閾值點數（與_calculate_side相同）"""
+        if side == 'TopSide':
+            percentage = self.topside_threshold_percentage
+        else:
+            percentage = self.bottomside_threshold_percentage
+        return max(int(data_length * percentage), 1)
+    
+    def _cached_side_result(self, state: EvaluationState, side: str, include_details: bool) -> SideResult:
+        """
+        從快取取得單側結果，閾值點數改變時才重新計算該側的前/後N%區段
+        
+        Args:
+            state: 評估快取
+            side: 'TopSide' 或 'BottomSide'
+            include_details: 是否附帶逐點詳細資料
+            
+        Returns:
+            SideResult: 依目前NG閾值判斷的單側結果
+        """
+        threshold_index = self._threshold_index(len(state.clean_data), side)
+        key = (side, threshold_index, include_details)
+        
+        side_result = state.sides.get(key)
+        if side_result is None:
+            if len(state.sides) >= self.MAX_CACHED_SIDES:
+                state.sides.clear()
+            side_result = self._build_side_result(state.clean_data, side, include_details)
+            state.sides[key] = side_result
+        
+        # 百分比不同但閾值點數相同時結果相同，只需更新百分比；NG閾值只影響判斷
+        return replace(side_result, judgment=self._judge(side_result.max_value),
+                       threshold_percentage=(self.topside_threshold_percentage if side == 'TopSide'
+                                             else self.bottomside_threshold_percentage))
+    
+    def evaluate(self, data: np.ndarray, include_details: bool = False,
+                 cache_key: Optional[Hashable] = None) -> BlueEdgeResult:
+        """
+        一次清理數據並同時計算TopSide與BottomSide的Blue Edge Index
+        
+        指定cache_key時保留清理後的數據與各側結果：以相同cache_key再次評估時不再清理數據，
+        只改變NG閾值時直接重新判斷，只改變一側的百分比時只重新計算該側。
+        
+        Args:
+            data: 輸入的數據陣列
+            include_details: 是否附帶每個數據點的比值與計算結果
+            cache_key: 識別數據的鍵（例如檔案、工作表與開始/結束行），預設為None（不使用快取）
+            
+        Returns:
+            BlueEdgeResult: 兩側的最大值、位置、判斷結果及（選擇性）詳細資料
+        """
+        if cache_key is None:
+            clean_data = self._clean_data(np.asarray(data)) if len(data) > 0 else np.array([])
+            state = None
+        else:
+            state = self._evaluation_state
+            if state is None or state.key != cache_key:
+                clean_data = self._clean_data(np.asarray(data)) if len(data) > 0 else np.array([])
+                data_range = (float(np.min(clean_data)), float(np.max(clean_data))) if len(clean_data) else None
+                state = EvaluationState(cache_key, clean_data, data_range)
+                self._evaluation_state = state
+            clean_data = state.clean_data
+        
+        if len(clean_data) == 0:
+            return BlueEdgeResult(
+                topside=SideResult('TopSide', 0.0, 0, 'NG'),
+                bottomside=SideResult('BottomSide', 0.0, 0, 'NG'),
+                total_data_points=0
+            )
+        
+        if state is not None:
+            return BlueEdgeResult(
+                topside=self._cached_side_result(state, 'TopSide', include_details),
+                bottomside=self._cached_side_result(state, 'BottomSide', include_details),
+                total_data_points=len(clean_data),
+                data_range=state.data_range
+            )
+        
+        return BlueEdgeResult(
+            topside=self._build_side_result(clean_data, 'TopSide', include_details),
+            bottomside=self._build_side_result(clean_data, 'BottomSide', include_details),
+            total_data_points=len(clean_data),
+            data_range=(float(np.min(clean_data)), float(np.max(clean_data)))
+        )
+    
+    def clear_evaluation_cache(self):
+        """清除evaluate(cache_key=...)保留的數據與結果（重新載入檔案時呼叫）"""
+        self._evaluation_state = None
+    
+    def _evaluate_matrix_side(self, compact: np.ndarray, n_valid: np.ndarray, side: str,
+                              side_type: str) -> MatrixSideResult:
+        """計算矩陣中每一列單側的結果並判斷Pass/NG"""
+        if side == 'TopSide':
+            percentage = self.topside_threshold_percentage
+        else:
+            percentage = self.bottomside_threshold_percentage
+        
+        max_values, max_positions, threshold_points = _evaluate_columns(compact, n_valid, percentage, side)
+        judgments = np.where((max_values > self.ng_threshold) | (n_valid == 0), 'NG', 'Pass')
+        
+        return MatrixSideResult(
+            side_type=side_type,
+            max_values=max_values,
+            max_positions=max_positions,
+            judgments=judgments,
+            threshold_points=threshold_points
+        )
+    
+    def evaluate_matrix(self, matrix: np.ndarray, include_rows: bool = False) -> BlueEdgeMatrixResult:
+        """
+        一次計算整個矩陣每一列的TopSide/BottomSide Blue Edge Index
+        
+        每一列的結果與將該列單獨傳入evaluate()相同
+        
+        Args:
+            matrix: 二維數據矩陣
+            include_rows: 是否同時計算每一行的左側/右側結果（左右邊緣）
+            
+        Returns:
+            BlueEdgeMatrixResult: 每一列（及每一行）的最大值、位置與判斷結果陣列
+        """
+        values = coerce_numeric_matrix(matrix)
+        
+        compact, n_valid = _compact_columns(values)
+        result = BlueEdgeMatrixResult(
+            topside=self._evaluate_matrix_side(compact, n_valid, 'TopSide', 'TopSide'),
+            bottomside=self._evaluate_matrix_side(compact, n_valid, 'BottomSide', 'BottomSide'),
+            total_data_points=n_valid
+        )
+        
+        if include_rows:
+            # 將矩陣轉置後，每一行即成為一列：左側對應TopSide、右側對應BottomSide
+            row_compact, row_n_valid = _compact_columns(values.T)
+            result.leftside = self._evaluate_matrix_side(row_compact, row_n_valid, 'TopSide', 'LeftSide')
+            result.rightside = self._evaluate_matrix_side(row_compact, row_n_valid, 'BottomSide', 'RightSide')
+        
+        return result
+    
+    def sweep(self, data: np.ndarray, percentages) -> pd.DataFrame:
+        """
+        一次計算多個閾值百分比的TopSide/BottomSide Blue Edge Index（閾值敏感度）
+        
+        數據只清理一次，所有百分比以同一個比值矩陣計算，
+        結果與逐一設定百分比後呼叫evaluate()相同。
+        
+        Args:
+            data: 輸入的數據陣列
+            percentages: 閾值百分比序列 (0.0 - 1.0]，例如 np.arange(1, 51) / 100
+            
+        Returns:
+            pd.DataFrame: 每個百分比一行，包含兩側的閾值點數、最大值、位置與判斷結果
+        """
+        percentages = np.asarray(percentages, dtype=float).ravel()
+        if np.any(~((percentages > 0.0) & (percentages <= 1.0))):
+            raise ValueError(f"閾值百分比必須介於0與1之間: {percentages}")
+        
+        clean_data = self._clean_data(np.asarray(data)) if len(data) > 0 else np.array([])
+        count = len(percentages)
+        table = {'percentage': percentages}
+        
+        if len(clean_data) == 0:
+            for side in ('topside', 'bottomside'):
+                table[f'{side}_threshold_points'] = np.zeros(count, dtype=int)
+                table[f'{side}_max_value'] = np.zeros(count, dtype=float)
+                table[f'{side}_max_position'] = np.zeros(count, dtype=int)
+                table[f'{side}_judgment'] = np.full(count, 'NG', dtype=object)
+            return pd.DataFrame(table)
+        
+        # 與單側計算相同：int(len * N%)，至少1個點
+        threshold_points = np.maximum((len(clean_data) * percentages).astype(int), 1)
+        # 依最長的區段分批，限制比值矩陣的大小
+        batch = max(self.SWEEP_BLOCK_SIZE // int(threshold_points.max()), 1)
+        
+        for side in ('TopSide', 'BottomSide'):
+            max_values = np.zeros(count, dtype=float)
+            max_positions = np.zeros(count, dtype=int)
+            for lo in range(0, count, batch):
+                max_values[lo:lo + batch], max_positions[lo:lo + batch] = _sweep_side(
+                    clean_data, threshold_points[lo:lo + batch], side)
+            
+            prefix = side.lower()
+            table[f'{prefix}_threshold_points'] = threshold_points
+            table[f'{prefix}_max_value'] = max_values
+            table[f'{prefix}_max_position'] = max_positions
+            table[f'{prefix}_judgment'] = np.where(max_values > self.ng_threshold, 'NG', 'Pass').astype(object)
+        
+        return pd.DataFrame(table)
     
     def calculate_blue_edge_index(self, data: np.ndarray) -> Tuple[float, str]:
         """
@@ -31,62 +524,20 @@ class BlueEdgeCalculator:
         if len(data) == 0:
             return 0.0, 'NG'
         
-        # 移除NaN值
-        try:
-            # 嘗試轉換為float並移除NaN
-            float_data = data.astype(float)
-            clean_data = float_data[~np.isnan(float_data)]
-        except (ValueError, TypeError):
-            # 如果轉換失敗，嘗試逐個處理
-            clean_list = []
-            for val in data:
-                try:
-                    float_val = float(val)
-                    if not np.isnan(float_val):
-                        clean_list.append(float_val)
-                except (ValueError, TypeError):
-                    continue
-            clean_data = np.array(clean_list)
+        clean_data = self._clean_data(data)
         
         if len(clean_data) == 0:
             return 0.0, 'NG'
         
         try:
-            # 計算前N%位置的索引
-            threshold_index = int(len(clean_data) * self.topside_threshold_percentage)
-            if threshold_index == 0:
-                threshold_index = 1
-            
-            # 取得前N%的數據
-            threshold_data = clean_data[:threshold_index]
-            
-            # 取得基準值（第threshold_index個數據，即最後一個）
-            baseline_value = threshold_data[-1]  # 第N%位置的數據
-            
-            # 計算比值並應用公式（基準值 ÷ 各個數據）
-            calculated_values = []
-            for i in range(threshold_index):
-                current_value = threshold_data[i]
-                if current_value != 0:
-                    ratio = baseline_value / current_value
-                    result = (ratio - 1) * 100
-                    calculated_values.append(result)
-                else:
-                    calculated_values.append(0.0)
-            
-            # 找出最大值和其位置
-            if calculated_values:
-                max_value = max(calculated_values)
-                max_position = calculated_values.index(max_value) + 1  # 位置從1開始計數
-            else:
-                max_value = 0.0
-                max_position = 0
+            side_result = self._calculate_side(clean_data, 'TopSide')
+            max_value = side_result['max_value']
             
             # 判斷Pass/NG - 使用使用者設定的NG閾值
             judgment = 'NG' if max_value > self.ng_threshold else 'Pass'
             
             return max_value, judgment
-            
+        
         except Exception as e:
             print(f"計算Blue Edge Index時發生錯誤: {e}")
             return 0.0, 'NG'
@@ -145,62 +596,20 @@ class BlueEdgeCalculator:
         if len(data) == 0:
             return 0.0, 'NG'
         
-        # 移除NaN值
-        try:
-            # 嘗試轉換為float並移除NaN
-            float_data = data.astype(float)
-            clean_data = float_data[~np.isnan(float_data)]
-        except (ValueError, TypeError):
-            # 如果轉換失敗，嘗試逐個處理
-            clean_list = []
-            for val in data:
-                try:
-                    float_val = float(val)
-                    if not np.isnan(float_val):
-                        clean_list.append(float_val)
-                except (ValueError, TypeError):
-                    continue
-            clean_data = np.array(clean_list)
+        clean_data = self._clean_data(data)
         
         if len(clean_data) == 0:
             return 0.0, 'NG'
         
         try:
-            # 計算後N%位置的索引
-            threshold_index = int(len(clean_data) * self.bottomside_threshold_percentage)
-            if threshold_index == 0:
-                threshold_index = 1
-            
-            # 取得後N%的數據（從底部開始）
-            threshold_data = clean_data[-threshold_index:]  # 取最後N%個數據
-            
-            # 取得基準值（倒數第threshold_index個數據，即第一個）
-            baseline_value = threshold_data[0]  # 倒數第N%位置的數據
-            
-            # 計算比值並應用公式（基準值 ÷ 各個數據）
-            calculated_values = []
-            for i in range(threshold_index):
-                current_value = threshold_data[i]
-                if current_value != 0:
-                    ratio = baseline_value / current_value
-                    result = (ratio - 1) * 100
-                    calculated_values.append(result)
-                else:
-                    calculated_values.append(0.0)
-            
-            # 找出最大值和其位置
-            if calculated_values:
-                max_value = max(calculated_values)
-                max_position = calculated_values.index(max_value) + 1  # 位置從1開始計數
-            else:
-                max_value = 0.0
-                max_position = 0
+            side_result = self._calculate_side(clean_data, 'BottomSide')
+            max_value = side_result['max_value']
             
             # 判斷Pass/NG - 使用使用者設定的NG閾值
             judgment = 'NG' if max_value > self.ng_threshold else 'Pass'
             
             return max_value, judgment
-            
+        
         except Exception as e:
             print(f"計算BottomSide Blue Edge Index時發生錯誤: {e}")
             return 0.0, 'NG'
@@ -218,68 +627,31 @@ class BlueEdgeCalculator:
         if len(data) == 0:
             return {}
         
-        try:
-            # 嘗試轉換為float並移除NaN
-            float_data = data.astype(float)
-            clean_data = float_data[~np.isnan(float_data)]
-        except (ValueError, TypeError):
-            # 如果轉換失敗，嘗試逐個處理
-            clean_list = []
-            for val in data:
-                try:
-                    float_val = float(val)
-                    if not np.isnan(float_val):
-                        clean_list.append(float_val)
-                except (ValueError, TypeError):
-                    continue
-            clean_data = np.array(clean_list)
+        clean_data = self._clean_data(data)
         
         if len(clean_data) == 0:
             return {}
         
         try:
-            # 計算前N%位置的索引
-            threshold_index = int(len(clean_data) * self.topside_threshold_percentage)
-            if threshold_index == 0:
-                threshold_index = 1
-            
-            # 取得前N%的數據
-            threshold_data = clean_data[:threshold_index]
-            
-            # 取得基準值
-            baseline_value = threshold_data[-1]
-            
-            # 計算所有比值和結果
-            calculated_values = []
-            calculation_details = []
-            
-            for i in range(threshold_index):
-                current_value = threshold_data[i]
-                position = i + 1
-                
-                if current_value != 0:
-                    ratio = baseline_value / current_value
-                    result = (ratio - 1) * 100
-                else:
-                    ratio = 0.0
-                    result = 0.0
-                
-                calculated_values.append(result)
-                calculation_details.append({
-                    'position': position,
+            side_result = self._calculate_side(clean_data, 'TopSide')
+            threshold_index = side_result['threshold_index']
+            baseline_value = side_result['baseline_value']
+            calculated_values = side_result['results'].tolist()
+            
+            calculation_details = [
+                {
+                    'position': i + 1,
                     'current_value': current_value,
                     'baseline_value': baseline_value,
                     'ratio': ratio,
                     'final_result': result
-                })
-            
-            # 找出最大值和其位置
-            if calculated_values:
-                max_value = max(calculated_values)
-                max_position = calculated_values.index(max_value) + 1
-            else:
-                max_value = 0.0
-                max_position = 0
+                }
+                for i, (current_value, ratio, result) in enumerate(zip(
+                    side_result['threshold_data'].tolist(),
+                    side_result['ratios'].tolist(),
+                    calculated_values
+                ))
+            ]
             
             return {
                 'total_data_points': len(clean_data),
@@ -289,12 +661,12 @@ class BlueEdgeCalculator:
                 'baseline_position': threshold_index,
                 'calculated_values': calculated_values,
                 'calculation_details': calculation_details,
-                'max_value': max_value,
-                'max_position': max_position,
+                'max_value': side_result['max_value'],
+                'max_position': side_result['max_position'],
                 'data_range': (np.min(clean_data), np.max(clean_data)),
                 'side_type': 'TopSide'
             }
-            
+        
         except Exception as e:
             print(f"取得計算詳情時發生錯誤: {e}")
             return {}
@@ -312,73 +684,34 @@ class BlueEdgeCalculator:
         if len(data) == 0:
             return {}
         
-        try:
-            # 嘗試轉換為float並移除NaN
-            float_data = data.astype(float)
-            clean_data = float_data[~np.isnan(float_data)]
-        except (ValueError, TypeError):
-            # 如果轉換失敗，嘗試逐個處理
-            clean_list = []
-            for val in data:
-                try:
-                    float_val = float(val)
-                    if not np.isnan(float_val):
-                        clean_list.append(float_val)
-                except (ValueError, TypeError):
-                    continue
-            clean_data = np.array(clean_list)
+        clean_data = self._clean_data(data)
         
         if len(clean_data) == 0:
             return {}
         
         try:
-            # 計算後N%位置的索引
-            threshold_index = int(len(clean_data) * self.bottomside_threshold_percentage)
-            if threshold_index == 0:
-                threshold_index = 1
-            
-            # 取得後N%的數據（從底部開始）
-            threshold_data = clean_data[-threshold_index:]
-            
-            # 取得基準值
-            baseline_value = threshold_data[0]
-            
-            # 計算所有比值和結果
-            calculated_values = []
-            calculation_details = []
-            
-            for i in range(threshold_index):
-                current_value = threshold_data[i]
-                position = i + 1
-                # 實際在原數據中的位置（從底部開始計算）
-                actual_position_from_bottom = i + 1
-                actual_position_from_top = len(clean_data) - threshold_index + i + 1
-                
-                if current_value != 0:
-                    ratio = baseline_value / current_value
-                    result = (ratio - 1) * 100
-                else:
-                    ratio = 0.0
-                    result = 0.0
-                
-                calculated_values.append(result)
-                calculation_details.append({
-                    'position': position,
-                    'position_from_bottom': actual_position_from_bottom,
-                    'position_from_top': actual_position_from_top,
+            side_result = self._calculate_side(clean_data, 'BottomSide')
+            threshold_index = side_result['threshold_index']
+            baseline_value = side_result['baseline_value']
+            calculated_values = side_result['results'].tolist()
+            
+            calculation_details = [
+                {
+                    'position': i + 1,
+                    # 實際在原數據中的位置（從底部開始計算）
+                    'position_from_bottom': i + 1,
+                    'position_from_top': len(clean_data) - threshold_index + i + 1,
                     'current_value': current_value,
                     'baseline_value': baseline_value,
                     'ratio': ratio,
                     'final_result': result
-                })
-            
-            # 找出最大值和其位置
-            if calculated_values:
-                max_value = max(calculated_values)
-                max_position = calculated_values.index(max_value) + 1
-            else:
-                max_value = 0.0
-                max_position = 0
+                }
+                for i, (current_value, ratio, result) in enumerate(zip(
+                    side_result['threshold_data'].tolist(),
+                    side_result['ratios'].tolist(),
+                    calculated_values
+                ))
+            ]
             
             return {
                 'total_data_points': len(clean_data),
@@ -388,12 +721,12 @@ class BlueEdgeCalculator:
                 'baseline_position': 1,  # BottomSide的基準值是第1個（倒數第N%個）
                 'calculated_values': calculated_values,
                 'calculation_details': calculation_details,
-                'max_value': max_value,
-                'max_position': max_position,
+                'max_value': side_result['max_value'],
+                'max_position': side_result['max_position'],
                 'data_range': (np.min(clean_data), np.max(clean_data)),
                 'side_type': 'BottomSide'
             }
-            
+        
         except Exception as e:
             print(f"取得BottomSide計算詳情時發生錯誤: {e}")
             return {}
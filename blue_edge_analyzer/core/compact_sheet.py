@@ -0,0 +1,261 @@
+"""
+精簡工作表模組
+將載入的工作表拆成連續的數值矩陣與少量的文字儲存格，取代object dtype的DataFrame
+"""
+
+import weakref
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+from ..utils.sanitizer import coerce_numeric_column
+
+
+class CompactSheet:
+    """
+    工作表的精簡表示
+    
+    數值儲存格存放在欄優先的float32或float64矩陣中（非數值為NaN），每欄切片都是連續記憶體；
+    無法轉為數字的非空值儲存格（標題、說明文字等）另外以(行, 欄, 原值)保存。
+    同時保存每行的數值/非空值數量，開始/結束行偵測不需要原始數據。
+    """
+    
+    # 純數值工作表計算逐行數量時，每次處理的儲存格數上限
+    COUNT_BLOCK_CELLS = 1 << 22
+    
+    def __init__(self, values: np.ndarray, columns: list, text_rows: np.ndarray, text_cols: np.ndarray,
+                 text_values: np.ndarray, column_dtypes: dict, numeric_count: Optional[np.ndarray],
+                 non_null_count: Optional[np.ndarray]):
+        """
+        Args:
+            values: 數值矩陣
+            columns: 欄位名稱
+            text_rows: 文字儲存格的行索引（依欄、行排序）
+            text_cols: 文字儲存格的欄索引
+            text_values: 文字儲存格的原值
+            column_dtypes: 需要還原型態的數值欄位 {欄索引: dtype}（整數、布林欄位）
+            numeric_count: 每行數值數量，None表示純數值工作表，第一次使用時由數值矩陣計算
+            non_null_count: 每行非空值數量，None時與numeric_count相同
+        """
+        self.values = values
+        self.columns = list(columns)
+        self.text_rows = text_rows
+        self.text_cols = text_cols
+        self.text_values = text_values
+        self.column_dtypes = column_dtypes
+        self._numeric_count = numeric_count
+        self._non_null_count = non_null_count
+        self._frame_ref = None  # frame()還原的DataFrame（弱參照，不再被使用時釋放）
+    
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame, dtype=np.float64) -> 'CompactSheet':
+        """
+        由DataFrame建立精簡工作表，逐欄轉換，不會把整個DataFrame複製成object陣列
+        
+        Args:
+            data: 工作表數據
+            dtype: 數值矩陣的型態（np.float64或np.float32）
+            
+        Returns:
+            CompactSheet: 精簡工作表
+        """
+        rows, cols = data.shape
+        values = np.empty((rows, cols), dtype=dtype, order='F')
+        numeric_count = np.zeros(rows, dtype=np.int64)
+        non_null_count = np.zeros(rows, dtype=np.int64)
+        text_rows, text_cols, text_values = [], [], []
+        column_dtypes = {}
+        
+        for col in range(cols):
+            column = data.iloc[:, col]
+            float_values, numeric, non_null = coerce_numeric_column(column)
+            values[:, col] = float_values
+            numeric_count += numeric
+            non_null_count += non_null
+            
+            if column.dtype.kind in 'biu':
+                column_dtypes[col] = column.dtype
+            
+            # 非空值但轉換後為NaN的儲存格（包括'nan'等字串）保留原值
+            text_positions = np.flatnonzero(non_null & np.isnan(float_values))
+            if len(text_positions):
+                text_rows.append(text_positions)
+                text_cols.append(np.full(len(text_positions), col))
+                text_values.append(column.iloc[text_positions].to_numpy(dtype=object))
+        
+        def concat(parts, dtype):
+            return np.concatenate(parts).astype(dtype, copy=False) if parts else np.empty(0, dtype=dtype)
+        
+        return cls(values, data.columns, concat(text_rows, np.int64), concat(text_cols, np.int64),
+                   concat(text_values, object), column_dtypes, numeric_count, non_null_count)
+    
+    @classmethod
+    def from_array(cls, array: np.ndarray, dtype=np.float64) -> 'CompactSheet':
+        """
+        由純數值陣列（.npy等二進位格式）建立精簡工作表，不經過DataFrame，也沒有文字儲存格
+        
+        逐行數值數量在第一次偵測開始/結束行時才計算；整數陣列不可能有NaN，不需要掃描數據。
+        
+        Args:
+            array: 一維或二維的數值陣列（一維視為單欄）
+            dtype: 數值矩陣的型態（np.float64或np.float32）；None表示直接引用原陣列
+                   （包括記憶體映射的陣列），不轉換型態也不複製
+            
+        Returns:
+            CompactSheet: 精簡工作表，欄位名稱為欄位序號
+        """
+        if not isinstance(array, np.ndarray):
+            array = np.asarray(array)
+        if array.ndim == 1:
+            array = array.reshape(-1, 1)
+        if array.ndim != 2 or array.dtype.kind not in 'biuf':
+            raise ValueError(f"需要一維或二維的數值陣列，實際為 {array.ndim} 維 {array.dtype}")
+        
+        if dtype is None:
+            values, column_dtypes = array, {}
+        else:
+            values = np.asarray(array, dtype=dtype, order='F')
+            column_dtypes = {col: array.dtype for col in range(array.shape[1])} if array.dtype.kind in 'biu' else {}
+        
+        empty = np.empty(0, dtype=np.int64)
+        return cls(values, range(array.shape[1]), empty, empty.copy(), np.empty(0, dtype=object), column_dtypes,
+                   None, None)
+    
+    @property
+    def numeric_count(self) -> np.ndarray:
+        """每行數值數量"""
+        if self._numeric_count is None:
+            self._numeric_count = self._count_numeric_rows()
+        return self._numeric_count
+    
+    @property
+    def non_null_count(self) -> np.ndarray:
+        """每行非空值數量"""
+        if self._non_null_count is None:
+            return self.numeric_count
+        return self._non_null_count
+    
+    def _count_numeric_rows(self) -> np.ndarray:
+        """
+        計算純數值工作表每行的非NaN數量
+        
+        分段處理，暫存的布林陣列大小固定；映射的記憶體只依序讀取一次。
+        """
+        rows, cols = self.values.shape
+        if self.values.dtype.kind in 'biu':
+            return np.full(rows, cols, dtype=np.int64)
+        
+        counts = np.empty(rows, dtype=np.int64)
+        step = max(self.COUNT_BLOCK_CELLS // max(cols, 1), 1)
+        for start in range(0, rows, step):
+            block = self.values[start:start + step]
+            counts[start:start + step] = cols - np.count_nonzero(np.isnan(block), axis=1)
+        return counts
+    
+    @property
+    def shape(self) -> tuple:
+        """(行數, 欄數)"""
+        return self.values.shape
+    
+    @property
+    def dtypes(self) -> pd.Series:
+        """還原為DataFrame後各欄位的型態（不需要還原）"""
+        text_columns = set(self.text_cols.tolist())
+        dtypes = [np.dtype(object) if col in text_columns else self.column_dtypes.get(col, np.dtype(np.float64))
+                  for col in range(self.shape[1])]
+        return pd.Series(dtypes, index=self.columns, dtype=object)
+    
+    @property
+    def nbytes(self) -> int:
+        """數值矩陣與文字儲存格索引佔用的位元組數（不含文字物件本身，映射的數值矩陣為檔案中的大小）"""
+        return (self.values.nbytes + self.text_rows.nbytes + self.text_cols.nbytes + self.text_values.nbytes
+                + self.numeric_count.nbytes + self.non_null_count.nbytes)
+    
+    def _text_range(self, col: int) -> slice:
+        """第col欄的文字儲存格在text_*陣列中的範圍"""
+        return slice(np.searchsorted(self.text_cols, col, side='left'),
+                     np.searchsorted(self.text_cols, col, side='right'))
+    
+    def column(self, col: int, start_row: int = 0, end_row: Optional[int] = None) -> np.ndarray:
+        """
+        取得一欄的原始值，沒有文字儲存格時直接回傳數值矩陣的視圖
+        
+        Args:
+            col: 欄位索引
+            start_row: 開始行數
+            end_row: 結束行數，預設為None（到最後一行）
+            
+        Returns:
+            np.ndarray: 數值視圖，含文字時為object陣列
+        """
+        start_row, end_row, _ = slice(start_row, end_row).indices(self.shape[0])
+        column = self.values[start_row:end_row, col]
+        
+        if col in self.column_dtypes:
+            column = column.astype(self.column_dtypes[col])
+        
+        cells = self._text_range(col)
+        rows = self.text_rows[cells]
+        in_range = (rows >= start_row) & (rows < end_row)
+        if not in_range.any():
+            return column
+        
+        column = column.astype(object)
+        column[rows[in_range] - start_row] = self.text_values[cells][in_range]
+        return column
+    
+    def to_frame(self, start_row: int = 0, end_row: Optional[int] = None,
+                 max_cols: Optional[int] = None) -> pd.DataFrame:
+        """
+        還原指定範圍的DataFrame（文字儲存格與整數欄位恢復原本的內容與型態）
+        
+        Args:
+            start_row: 開始行數
+            end_row: 結束行數，預設為None（到最後一行）
+            max_cols: 最多還原的欄數，預設為None（所有欄位）
+            
+        Returns:
+            pd.DataFrame: 索引與原始工作表相同的DataFrame
+        """
+        start_row, end_row, _ = slice(start_row, end_row).indices(self.shape[0])
+        col_count = self.shape[1] if max_cols is None else min(max_cols, self.shape[1])
+        
+        block = self.values[start_row:end_row, :col_count].astype(np.float64, copy=False)
+        frame = pd.DataFrame(block, columns=self.columns[:col_count], index=pd.RangeIndex(start_row, end_row),
+                             copy=False)
+        
+        # 只有含文字或需要還原型態的欄位需要另外建立
+        restore = set(self.text_cols.tolist()) | set(self.column_dtypes)
+        for col in sorted(col for col in restore if col < col_count):
+            frame.isetitem(col, self.column(col, start_row, end_row))
+        
+        return frame
+    
+    def frame(self) -> pd.DataFrame:
+        """
+        還原整個工作表的DataFrame
+        
+        還原結果以弱參照保存：呼叫端仍持有時重複使用同一個物件，
+        不再被使用時即釋放，不會一直佔用object陣列的記憶體。
+        
+        Returns:
+            pd.DataFrame: 整個工作表
+        """
+        frame = self._frame_ref() if self._frame_ref is not None else None
+        if frame is None:
+            frame = self.to_frame()
+            self._frame_ref = weakref.ref(frame)
+        return frame
+    
+    def cell_block(self, start_row: int, end_row: int, start_col: int, end_col: int) -> np.ndarray:
+        """
+        取得指定範圍儲存格的原值，供表格顯示
+        
+        Returns:
+            np.ndarray: object陣列
+        """
+        start_row, end_row, _ = slice(start_row, end_row).indices(self.shape[0])
+        block = np.empty((end_row - start_row, max(end_col - start_col, 0)), dtype=object)
+        for j, col in enumerate(range(start_col, end_col)):
+            block[:, j] = self.column(col, start_row, end_row)
+        return block
@@ -1,72 +1,765 @@
 """
 Excel和CSV文件處理模組
-負責讀取、解析和預處理Excel和CSV數據
+負責讀取、解析和預處理Excel、CSV、NumPy/Parquet/Feather與原始面板數據
 """
 
 import pandas as pd
+import csv
+import itertools
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Tuple, Optional, List
 import numpy as np
 import os
 
+from .compact_sheet import CompactSheet
+from .file_cache import ParsedFileCache
+from .raw_panel import open_raw_panel
+from ..utils.sanitizer import SanitizedData, coerce_numeric_column, sanitize_numeric
+
+
+# pd.read_excel/pd.read_csv預設視為NaN的字串（pandas文件中na_values的預設清單），
+# 串流讀取Excel時以相同規則判斷空值，結果與完整載入一致
+NA_STRINGS = frozenset({
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+})
+
+
+@dataclass
+class RowClassification:
+    """每個工作表的逐行分類結果，載入後只計算一次"""
+    
+    numeric_count: np.ndarray  # 每行可轉換為數字的儲存格數
+    non_null_count: np.ndarray  # 每行非空值的儲存格數
+    data_start_row: int  # 第一個數據行（偵測不到時為0）
+    end_rows: np.ndarray  # 所有「非數據行」的索引（已排序），用於二分搜尋結束行
+    
+    @classmethod
+    def from_counts(cls, numeric_count: np.ndarray, non_null_count: np.ndarray) -> 'RowClassification':
+        """
+        由逐行計數建立分類結果
+        
+        Args:
+            numeric_count: 每行數值數量
+            non_null_count: 每行非空值數量
+            
+        Returns:
+            RowClassification: 分類結果
+        """
+        # 有數值數據、且數值佔非空值的比例超過50%的行為數據行
+        is_data_row = (non_null_count > 0) & (numeric_count * 2 > non_null_count) & (numeric_count >= 1)
+        # 沒有數值數據，或數值佔比低於50%的行視為數據結束
+        is_end_row = (non_null_count == 0) | (numeric_count * 2 < non_null_count)
+        
+        return cls(
+            numeric_count=numeric_count,
+            non_null_count=non_null_count,
+            data_start_row=int(np.argmax(is_data_row)) if is_data_row.any() else 0,
+            end_rows=np.flatnonzero(is_end_row)
+        )
+    
+    @property
+    def total_rows(self) -> int:
+        """總行數"""
+        return len(self.numeric_count)
+    
+    def find_end_row(self, start_row: int) -> int:
+        """
+        以二分搜尋找出start_row之後第一個非數據行
+        
+        Args:
+            start_row: 開始搜尋的行數（負數與逐行迴圈相同，從尾端計算）
+            
+        Returns:
+            int: 第一個非數據行的索引，找不到時為總行數
+        """
+        total_rows = self.total_rows
+        start_row = max(start_row, -total_rows)
+        
+        if start_row < 0:
+            # 先搜尋尾端的 [total_rows + start_row, total_rows) 區段
+            idx = np.searchsorted(self.end_rows, total_rows + start_row)
+            if idx < len(self.end_rows):
+                return int(self.end_rows[idx]) - total_rows
+            start_row = 0
+        
+        idx = np.searchsorted(self.end_rows, start_row)
+        if idx < len(self.end_rows):
+            return int(self.end_rows[idx])
+        
+        return total_rows
+
 
 class ExcelProcessor:
     """Excel和CSV文件處理器"""
     
-    def __init__(self):
-        self.data = None
+    # 支援的副檔名
+    SUPPORTED_EXTENSIONS = ('.xlsx', '.xls', '.csv', '.npy', '.npz', '.parquet', '.feather', '.bep')
+    # 記憶體中保留的已解析工作表數量
+    SHEET_CACHE_SIZE = 8
+    # 超過此大小的CSV自動使用串流模式，只讀取需要的欄位
+    STREAMING_THRESHOLD_BYTES = 100 * 1024 * 1024
+    # 超過此大小的.xlsx自動使用串流模式（xlsx為壓縮格式，門檻較低）
+    EXCEL_STREAMING_THRESHOLD_BYTES = 20 * 1024 * 1024
+    # 串流讀取CSV時每段的儲存格數上限（每段行數 = 此值 / 欄位數），暫存記憶體與工作表寬度無關
+    CSV_CHUNK_CELLS = 1 << 21
+    # 串流模式偵測欄位數（決定中間列）時讀取的行數；
+    # .xlsx在之後的行發現更寬的行時改用完整載入，CSV中比偵測寬度更寬的行則與完整載入一樣無法解析
+    SNIFF_LINES = 50
+    # 磁碟快取的大小上限
+    DISK_CACHE_MAX_BYTES = ParsedFileCache.DEFAULT_MAX_BYTES
+    
+    def __init__(self, cache_dir: Optional[str] = None, dtype=np.float64):
+        """
+        Args:
+            cache_dir: 磁碟快取目錄，預設為None（不使用磁碟快取）
+            dtype: 數值矩陣的型態，np.float32可再減少一半記憶體（整數超過2**24時會失去精度）
+        """
+        self.dtype = np.dtype(dtype)
+        self._sheet = None  # 目前工作表的CompactSheet
+        self._sanitized_columns = {}  # (start_row, end_row) -> SanitizedData
+        self._row_classification = None  # RowClassification，首次偵測時計算
+        self._sheet_entry = None  # 目前工作表在_sheet_cache中的項目
+        self._sheet_cache = OrderedDict()  # (路徑, 修改時間, 大小, 工作表) -> 已解析的工作表
+        self._excel_file = None  # 目前開啟的pd.ExcelFile，切換工作表時重複使用
+        self._excel_file_key = None
+        self._disk_cache = None
+        if cache_dir:
+            try:
+                self._disk_cache = ParsedFileCache(cache_dir, self.DISK_CACHE_MAX_BYTES)
+            except OSError as e:
+                # 快取目錄無法建立（例如沒有寫入權限）時不使用磁碟快取
+                print(f"無法使用快取目錄，停用磁碟快取: {e}")
         self.file_path = None
-        self.file_type = None  # 'excel' 或 'csv'
+        self.file_type = None  # 'excel'、'csv'、'numpy'、'npz'、'parquet'、'feather' 或 'raw'
         self.available_sheets = []  # 可用的工作表清單
+        self.loaded_columns = None  # 串流模式下載入的原始欄位索引，None表示載入全部欄位
+        self.source_column_count = None  # 原始檔案的欄位數
+        self.last_error = None  # 最近一次載入失敗的原因，成功時為None
+    
+    @property
+    def data(self) -> Optional[pd.DataFrame]:
+        """
+        目前載入的工作表數據
+        
+        工作表以CompactSheet保存，存取時才還原為DataFrame；計算與預覽應使用
+        get_float_block()、get_matrix_view()等視圖，不需要還原。
+        """
+        if self._sheet is None:
+            return None
+        return self._sheet.frame()
+    
+    @data.setter
+    def data(self, value: Optional[pd.DataFrame]):
+        self._set_sheet(None if value is None else CompactSheet.from_frame(value, self.dtype))
+    
+    @property
+    def has_data(self) -> bool:
+        """是否已載入數據（不需要還原DataFrame）"""
+        return self._sheet is not None
+    
+    def get_compact_sheet(self) -> Optional[CompactSheet]:
+        """
+        取得目前工作表的精簡表示
+        
+        Returns:
+            Optional[CompactSheet]: 精簡工作表，尚未載入數據時為None
+        """
+        return self._sheet
+    
+    def _set_sheet(self, sheet: Optional[CompactSheet]):
+        # 更換數據時清除所有由舊數據衍生的快取
+        self._sheet = sheet
+        self._sanitized_columns = {}
+        self._row_classification = None
+        self._sheet_entry = None
+        self.loaded_columns = None
+        self.source_column_count = None if sheet is None else sheet.shape[1]
+    
+    @staticmethod
+    def _file_key(file_path: str) -> tuple:
+        """以路徑、修改時間與大小作為快取鍵，檔案被覆寫時自動失效"""
+        stat = os.stat(file_path)
+        return os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size
+    
+    def _get_excel_file(self, file_path: str) -> pd.ExcelFile:
+        """
+        取得Excel檔案的pd.ExcelFile，同一檔案只開啟並解析一次
+        
+        Args:
+            file_path: 文件路徑
+            
+        Returns:
+            pd.ExcelFile: 已開啟的Excel檔案
+        """
+        file_key = self._file_key(file_path)
+        if self._excel_file is None or self._excel_file_key != file_key:
+            self.close()
+            self._excel_file = pd.ExcelFile(file_path)
+            self._excel_file_key = file_key
+        return self._excel_file
+    
+    def _use_sheet(self, file_path: str, sheet_name: str, parse, variant=None, disk_cache: bool = True) -> None:
+        """
+        從快取取得已解析的工作表，沒有時呼叫parse()解析並放入LRU快取
+        
+        依序查詢記憶體快取、磁碟快取（有設定cache_dir時），都沒有才解析檔案。
+        
+        Args:
+            file_path: 文件路徑
+            sheet_name: 工作表名稱
+            parse: 解析函式，回傳包含data（以及可選的row_classification、loaded_columns、
+                   source_column_count）的字典，data會轉為CompactSheet後釋放；
+                   純數值格式可改為直接回傳已建立的sheet
+            variant: 載入方式，完整載入為None，串流模式為('stream', 指定欄位)
+            disk_cache: 是否使用磁碟快取（二進位格式直接讀取檔案即可，不需要快取）
+        """
+        file_key = self._file_key(file_path)
+        key = file_key + (sheet_name, variant)
+        entry = self._sheet_cache.get(key)
+        
+        if entry is None:
+            entry = self._load_cached_sheet(file_key, sheet_name, variant) if disk_cache else None
+            if entry is None:
+                entry = {'row_classification': None, 'loaded_columns': None, 'source_column_count': None}
+                entry.update(parse())
+                if 'sheet' not in entry:
+                    entry['sheet'] = CompactSheet.from_frame(entry.pop('data'), self.dtype)
+                if disk_cache:
+                    self._store_cached_sheet(file_key, sheet_name, variant, entry)
+            entry['sanitized_columns'] = {}
+            entry['source_column_count'] = entry['source_column_count'] or entry['sheet'].shape[1]
+            
+            self._sheet_cache[key] = entry
+            while len(self._sheet_cache) > self.SHEET_CACHE_SIZE:
+                self._sheet_cache.popitem(last=False)
+        else:
+            self._sheet_cache.move_to_end(key)
+        
+        # 連同該工作表已計算過的分類與清理結果一起還原
+        self._set_sheet(entry['sheet'])
+        self._row_classification = entry['row_classification']
+        self._sanitized_columns = entry['sanitized_columns']
+        self.loaded_columns = entry['loaded_columns']
+        self.source_column_count = entry['source_column_count']
+        self._sheet_entry = entry
+    
+    def _load_cached_sheet(self, file_key: tuple, sheet_name: str, variant) -> Optional[dict]:
+        """
+        從磁碟快取載入工作表
+        
+        Returns:
+            Optional[dict]: 工作表快取項目，沒有磁碟快取時為None
+        """
+        if self._disk_cache is None:
+            return None
+        
+        cached = self._disk_cache.load_sheet(file_key, sheet_name, variant)
+        if cached is None:
+            return None
+        
+        sheet = cached['sheet']
+        if sheet.values.dtype != self.dtype:
+            sheet.values = sheet.values.astype(self.dtype, order='F')
+        
+        return {
+            'sheet': sheet,
+            'row_classification': RowClassification.from_counts(cached['numeric_count'], cached['non_null_count']),
+            'loaded_columns': cached['loaded_columns'],
+            'source_column_count': cached['source_column_count']
+        }
+    
+    def _store_cached_sheet(self, file_key: tuple, sheet_name: str, variant, entry: dict):
+        """
+        將剛解析的工作表連同逐行分類寫入磁碟快取
+        
+        寫入失敗（例如磁碟空間不足）不影響載入結果。
+        """
+        if self._disk_cache is None:
+            return
+        
+        try:
+            sheet = entry['sheet']
+            if entry['row_classification'] is None:
+                entry['row_classification'] = RowClassification.from_counts(sheet.numeric_count, sheet.non_null_count)
+            
+            classification = entry['row_classification']
+            self._disk_cache.store_sheet(
+                file_key, sheet_name, variant, sheet,
+                classification.numeric_count, classification.non_null_count,
+                data_start_row=classification.data_start_row,
+                data_end_row=classification.find_end_row(classification.data_start_row),
+                loaded_columns=entry['loaded_columns'],
+                source_column_count=entry['source_column_count']
+            )
+        except OSError as e:
+            print(f"寫入快取失敗: {e}")
+    
+    def _sniff_csv_columns(self, file_path: str, encoding: str) -> int:
+        """
+        從CSV前SNIFF_LINES行判斷欄位數
+        
+        之後的行若比此寬度更寬，pd.read_csv會回報欄位數不符（ParserError）；
+        完整載入以第一行的寬度解析，同樣無法載入，兩種模式不會選到不同的中間列。
+        
+        Args:
+            file_path: 文件路徑
+            encoding: 文字編碼
+            
+        Returns:
+            int: 欄位數
+        """
+        with open(file_path, newline='', encoding=encoding) as f:
+            rows = itertools.islice(csv.reader(f), self.SNIFF_LINES)
+            return max((len(row) for row in rows), default=0)
+    
+    def _read_csv_columns(self, file_path: str, encoding: str, source_column_count: int,
+                          columns: List[int]) -> Tuple[pd.DataFrame, RowClassification]:
+        """
+        分段讀取CSV中指定的欄位
+        
+        每段的行數依CSV_CHUNK_CELLS與欄位數決定，解析時暫存的儲存格數固定；
+        每段同時統計整行（所有欄位）的數值/非空值數量，開始/結束行數偵測結果與完整載入相同，
+        之後只保留指定的欄位，保留的記憶體只與行數及指定欄位數成正比。
+        
+        Args:
+            file_path: 文件路徑
+            encoding: 文字編碼
+            source_column_count: 原始檔案的欄位數
+            columns: 要讀取的欄位索引
+            
+        Returns:
+            Tuple[pd.DataFrame, RowClassification]: (只包含指定欄位的數據，欄位名稱為原始欄位索引, 逐行分類)
+        """
+        chunks = pd.read_csv(
+            file_path,
+            encoding=encoding,
+            header=None,
+            names=list(range(source_column_count)),
+            chunksize=max(self.CSV_CHUNK_CELLS // max(source_column_count, 1), 1)
+        )
+        
+        parts, numeric_counts, non_null_counts = [], [], []
+        for chunk in chunks:
+            # 數值欄位一次計算（非空值即為數值），只有含文字的欄位需要逐欄轉換
+            numeric_columns = [col for col, dtype in enumerate(chunk.dtypes) if dtype.kind in 'biuf']
+            block = chunk.iloc[:, numeric_columns].to_numpy(dtype=np.float64)
+            numeric_count = len(numeric_columns) - np.count_nonzero(np.isnan(block), axis=1)
+            non_null_count = numeric_count.copy()
+            del block
+            
+            for col in sorted(set(range(chunk.shape[1])) - set(numeric_columns)):
+                _, numeric, non_null = coerce_numeric_column(chunk.iloc[:, col])
+                numeric_count += numeric
+                non_null_count += non_null
+            numeric_counts.append(numeric_count)
+            non_null_counts.append(non_null_count)
+            parts.append(chunk[list(columns)])
+        
+        data = pd.concat(parts, ignore_index=True)
+        row_classification = RowClassification.from_counts(
+            np.concatenate(numeric_counts) if numeric_counts else np.empty(0, dtype=np.int64),
+            np.concatenate(non_null_counts) if non_null_counts else np.empty(0, dtype=np.int64)
+        )
+        return data, row_classification
+    
+    def _sniff_excel_columns(self, worksheet) -> int:
+        """
+        從工作表前SNIFF_LINES行判斷欄位數（與pandas相同，忽略每行尾端的空白儲存格）
+        
+        Args:
+            worksheet: openpyxl唯讀工作表
+            
+        Returns:
+            int: 欄位數
+        """
+        worksheet.reset_dimensions()
+        source_column_count = 0
+        for row in worksheet.iter_rows(max_row=self.SNIFF_LINES, values_only=True):
+            width = len(row)
+            while width > 0 and row[width - 1] in (None, ''):
+                width -= 1
+            source_column_count = max(source_column_count, width)
+        return source_column_count
+    
+    @staticmethod
+    def _read_excel_columns(worksheet, columns: List[int]) -> Tuple[pd.DataFrame, RowClassification, int]:
+        """
+        以openpyxl唯讀模式逐行讀取指定欄位，直接建立float64陣列
+        
+        一次只保留一行，記憶體用量只與行數及欄位數量成正比，與工作表寬度無關。
+        讀取時同時統計整行的數值/非空值數量，開始/結束行數偵測結果與完整載入相同，
+        並記錄整個工作表的欄位數，供確認偵測的欄位數是否正確。
+        
+        Args:
+            worksheet: openpyxl唯讀工作表
+            columns: 要讀取的欄位索引（已排序）
+            
+        Returns:
+            Tuple[pd.DataFrame, RowClassification, int]: (只包含指定欄位的數據，欄位名稱為原始欄位索引,
+                                                          逐行分類, 整個工作表的欄位數（忽略尾端空白儲存格）)
+        """
+        from openpyxl.cell.cell import ERROR_CODES
+        
+        null_strings = set(ERROR_CODES) | NA_STRINGS
+        values = [array('d') for _ in columns]
+        numeric_count = array('q')
+        non_null_count = array('q')
+        text_cells = []  # (行, 欄位序號, 原值)
+        last_row_with_content = -1
+        column_count = 0
+        
+        for row_index, row in enumerate(worksheet.iter_rows(values_only=True)):
+            row_numeric = row_non_null = 0
+            for position, value in enumerate(row):
+                if value is not None and value != '':
+                    last_row_with_content = row_index
+                    column_count = max(column_count, position + 1)
+                if value is None or (isinstance(value, str) and value in null_strings):
+                    continue
+                row_non_null += 1
+                if isinstance(value, (int, float)):
+                    row_numeric += 1
+                elif isinstance(value, str):
+                    try:
+                        float(value)
+                        row_numeric += 1
+                    except ValueError:
+                        pass
+            numeric_count.append(row_numeric)
+            non_null_count.append(row_non_null)
+            
+            for j, col in enumerate(columns):
+                value = row[col] if col < len(row) else None
+                if value is None or (isinstance(value, str) and value in null_strings):
+                    values[j].append(np.nan)
+                elif isinstance(value, (int, float)):
+                    values[j].append(float(value))
+                else:
+                    values[j].append(np.nan)
+                    text_cells.append((row_index, j, value))
+        
+        # 與pd.read_excel相同，去除尾端的空白行
+        row_count = last_row_with_content + 1
+        data = pd.DataFrame({
+            col: np.frombuffer(values[j], dtype=np.float64)[:row_count].copy()
+            for j, col in enumerate(columns)
+        })
+        
+        for row_index, j, value in text_cells:
+            if data[columns[j]].dtype != object:
+                data[columns[j]] = data[columns[j]].astype(object)
+            data.iat[row_index, j] = value
+        
+        row_classification = RowClassification.from_counts(
+            np.frombuffer(numeric_count, dtype=np.int64)[:row_count].copy(),
+            np.frombuffer(non_null_count, dtype=np.int64)[:row_count].copy()
+        )
+        return data, row_classification, column_count
+    
+    def _load_excel(self, file_path: str, sheet_name: str, streaming: Optional[bool],
+                    columns: Optional[List[int]]) -> None:
+        """
+        載入Excel工作表，串流模式下以openpyxl唯讀模式只讀取中間列（或指定欄位）
+        
+        Args:
+            file_path: 文件路徑
+            sheet_name: 工作表名稱
+            streaming: 是否使用串流模式，None表示依檔案大小自動判斷
+            columns: 串流模式下要讀取的欄位索引，預設為None（中間列）
+        """
+        if streaming is None:
+            streaming = columns is not None or os.path.getsize(file_path) >= self.EXCEL_STREAMING_THRESHOLD_BYTES
+        
+        def parse_full():
+            return {'data': self._get_excel_file(file_path).parse(sheet_name, header=None)}
+        
+        def parse_streaming():
+            excel_file = self._get_excel_file(file_path)
+            # .xls（xlrd）不支援逐行讀取，使用完整解析
+            if excel_file.engine != 'openpyxl':
+                return parse_full()
+            
+            worksheet = excel_file.book[sheet_name]
+            source_column_count = self._sniff_excel_columns(worksheet)
+            loaded_columns = sorted(columns) if columns is not None else [source_column_count // 2]
+            data, row_classification, column_count = self._read_excel_columns(worksheet, loaded_columns)
+            if column_count != source_column_count:
+                if columns is None:
+                    # 前SNIFF_LINES行之後才出現更寬的行，中間列與完整載入不同，改用完整載入
+                    print(f"工作表 {sheet_name} 的欄位數為 {column_count}，與前 {self.SNIFF_LINES} 行偵測的 "
+                          f"{source_column_count} 不同，改用完整載入")
+                    return parse_full()
+                source_column_count = column_count
+            return {
+                'data': data,
+                'row_classification': row_classification,
+                'loaded_columns': loaded_columns,
+                'source_column_count': source_column_count
+            }
+        
+        if streaming:
+            self._use_sheet(file_path, sheet_name, parse_streaming, ('stream', self._columns_key(columns)))
+        else:
+            self._use_sheet(file_path, sheet_name, parse_full)
+    
+    def _load_csv(self, file_path: str, encoding: str, streaming: Optional[bool],
+                  columns: Optional[List[int]]) -> None:
+        """
+        載入CSV文件，串流模式下只讀取中間列（或指定欄位）
+        
+        Args:
+            file_path: 文件路徑
+            encoding: 文字編碼
+            streaming: 是否使用串流模式，None表示依檔案大小自動判斷
+            columns: 串流模式下要讀取的欄位索引，預設為None（中間列）
+        """
+        if streaming is None:
+            streaming = columns is not None or os.path.getsize(file_path) >= self.STREAMING_THRESHOLD_BYTES
+        
+        def parse_full():
+            return {'data': pd.read_csv(file_path, encoding=encoding, header=None)}
+        
+        def parse_streaming():
+            source_column_count = self._sniff_csv_columns(file_path, encoding)
+            loaded_columns = sorted(columns) if columns is not None else [source_column_count // 2]
+            data, row_classification = self._read_csv_columns(file_path, encoding, source_column_count,
+                                                              loaded_columns)
+            return {
+                'data': data,
+                'row_classification': row_classification,
+                'loaded_columns': loaded_columns,
+                'source_column_count': source_column_count
+            }
+        
+        if streaming:
+            self._use_sheet(file_path, self.available_sheets[0], parse_streaming,
+                            ('stream', self._columns_key(columns)))
+        else:
+            self._use_sheet(file_path, self.available_sheets[0], parse_full)
+    
+    def _load_numpy(self, file_path: str) -> None:
+        """
+        以記憶體映射載入NumPy .npy檔案（一維或二維數值陣列）
+        
+        數值矩陣直接引用映射的記憶體並保留檔案中的型態，不複製也不解析文字，
+        只有實際讀取的部分（例如中間列）才會從磁碟載入。
+        
+        Args:
+            file_path: 文件路徑
+        """
+        def parse():
+            return {'sheet': CompactSheet.from_array(np.load(file_path, mmap_mode='r', allow_pickle=False), None)}
+        
+        self._use_sheet(file_path, self.available_sheets[0], parse, disk_cache=False)
+    
+    def _load_raw_panel(self, file_path: str) -> None:
+        """
+        以記憶體映射載入原始面板（.bep，格式見raw_panel模組）
+        
+        面板大小由檔頭決定；與.npy相同，逐行數值數量在第一次偵測開始/結束行時才由數據計算
+        （全為NaN的壞行或空白行不是數據行，整數型態不需要掃描），
+        其他時候只有實際使用的部分（例如中間列）才會從磁碟載入。
+        
+        Args:
+            file_path: 文件路徑
+        """
+        def parse():
+            return {'sheet': CompactSheet.from_array(open_raw_panel(file_path), None)}
+        
+        self._use_sheet(file_path, self.available_sheets[0], parse, disk_cache=False)
+    
+    @staticmethod
+    def _get_npz_names(file_path: str) -> List[str]:
+        """取得.npz檔案中的陣列名稱（每個陣列視為一個工作表）"""
+        with np.load(file_path, allow_pickle=False) as archive:
+            return list(archive.files)
+    
+    def _load_npz(self, file_path: str, sheet_name: str) -> None:
+        """
+        載入.npz檔案中的一個陣列（壓縮檔內的陣列無法映射，只解壓縮選擇的陣列）
+        
+        Args:
+            file_path: 文件路徑
+            sheet_name: 陣列名稱
+        """
+        def parse():
+            with np.load(file_path, allow_pickle=False) as archive:
+                return {'sheet': CompactSheet.from_array(archive[sheet_name], None)}
+        
+        self._use_sheet(file_path, sheet_name, parse, disk_cache=False)
+    
+    def _load_arrow(self, file_path: str, file_format: str) -> None:
+        """
+        以pyarrow載入Parquet或Feather檔案（需要安裝pyarrow）
+        
+        欄位都是整數或浮點數時直接把Arrow欄位寫入數值矩陣（只有一欄時直接引用，
+        單一區塊且沒有空值的欄位不另外複製），不經過DataFrame；含其他型態的欄位時轉為DataFrame，與其他格式相同處理文字。
+        
+        Args:
+            file_path: 文件路徑
+            file_format: 'parquet' 或 'feather'
+        """
+        def parse():
+            try:
+                import pyarrow as pa
+                if file_format == 'parquet':
+                    import pyarrow.parquet as pq
+                    table = pq.read_table(file_path, memory_map=True)
+                else:
+                    import pyarrow.feather as feather
+                    table = feather.read_table(file_path, memory_map=True)
+            except ImportError as e:
+                raise ImportError("讀取Parquet/Feather檔案需要安裝pyarrow") from e
+            
+            if not all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in table.schema.types):
+                data = table.to_pandas()
+                # 與header=None讀取的CSV相同，欄位名稱改為欄位序號
+                data.columns = range(data.shape[1])
+                return {'data': data}
+
+            if table.num_columns == 1:
+                return {'sheet': CompactSheet.from_array(table.column(0).to_numpy(), None)}
+            
+            values = np.empty((table.num_rows, table.num_columns), dtype=self.dtype, order='F')
+            for col in range(table.num_columns):
+                # 整數欄位有空值時轉為含NaN的浮點數
+                values[:, col] = table.column(col).to_numpy()
+            return {'sheet': CompactSheet.from_array(values, None)}
+        
+        self._use_sheet(file_path, self.available_sheets[0], parse, disk_cache=False)
     
-    def load_file(self, file_path: str, sheet_name: Optional[str] = None) -> bool:
+    @staticmethod
+    def _columns_key(columns: Optional[List[int]]) -> Optional[tuple]:
+        """串流模式指定欄位的快取鍵，None表示預設的中間列"""
+        return tuple(sorted(columns)) if columns is not None else None
+    
+    def _get_sheet_names(self, file_path: str) -> List[str]:
         """
-        載入Excel或CSV文件
+        取得Excel檔案的工作表清單，有磁碟快取時不必開啟檔案
         
         Args:
             file_path: 文件路徑
-            sheet_name: 工作表名稱（僅適用於Excel），預設為None（第一個工作表）
             
         Returns:
-            bool: 載入是否成功
+            List[str]: 工作表名稱清單
+        """
+        file_key = self._file_key(file_path)
+        if self._disk_cache is not None:
+            sheet_names = self._disk_cache.load_sheet_names(file_key)
+            if sheet_names is not None:
+                return sheet_names
+        
+        sheet_names = self._get_excel_file(file_path).sheet_names
+        if self._disk_cache is not None:
+            try:
+                self._disk_cache.store_sheet_names(file_key, sheet_names)
+            except OSError as e:
+                print(f"寫入快取失敗: {e}")
+        return sheet_names
+    
+    def close(self):
+        """關閉目前開啟的Excel檔案"""
+        if self._excel_file is not None:
+            self._excel_file.close()
+        self._excel_file = None
+        self._excel_file_key = None
+    
+    def clear_cache(self):
+        """清除所有已解析工作表的快取並關閉檔案"""
+        self._sheet_cache.clear()
+        self.close()
+    
+    def load_file(self, file_path: str, sheet_name: Optional[str] = None, streaming: Optional[bool] = None,
+                  columns: Optional[List[int]] = None) -> bool:
         """
+        載入Excel、CSV、NumPy (.npy/.npz)、Parquet、Feather或原始面板 (.bep) 文件
+        
+        二進位格式（.npy、.npz、.parquet、.feather、.bep）不需要解析文字也不使用磁碟快取；
+        .npy、.npz與.bep保留檔案中的數值型態（不轉換為dtype）。
+        
+        Args:
+            file_path: 文件路徑
+            sheet_name: 工作表名稱（Excel的工作表或.npz的陣列名稱），預設為None（第一個）
+            streaming: 是否使用串流模式只讀取需要的欄位（適用於CSV與.xlsx），
+                       預設為None（檔案超過大小門檻時自動使用）
+            columns: 串流模式下要讀取的原始欄位索引，預設為None（中間列）
+            
+        Returns:
+            bool: 載入是否成功（失敗原因見last_error）
+        """
+        self.last_error = None
         try:
             file_ext = os.path.splitext(file_path)[1].lower()
             
             if file_ext in ['.xlsx', '.xls']:
                 self.file_type = 'excel'
-                # 先取得所有工作表名稱
-                excel_file = pd.ExcelFile(file_path)
-                self.available_sheets = excel_file.sheet_names
+                # 先取得所有工作表名稱（同一檔案只開啟一次）
+                self.available_sheets = self._get_sheet_names(file_path)
                 
                 # 載入指定的工作表
                 if sheet_name is None:
                     sheet_name = self.available_sheets[0]  # 預設第一個工作表
                 
-                self.data = pd.read_excel(file_path, sheet_name=sheet_name, header=None)
-                
+                self._load_excel(file_path, sheet_name, streaming, columns)
+            
             elif file_ext == '.csv':
                 self.file_type = 'csv'
                 self.available_sheets = ['CSV資料']  # CSV只有一個"工作表"
-                self.data = pd.read_csv(file_path, encoding='utf-8', header=None)
-                
+                self._load_csv(file_path, 'utf-8', streaming, columns)
+            
+            elif file_ext == '.npy':
+                # 記憶體映射，不需要串流讀取
+                self.file_type = 'numpy'
+                self.available_sheets = ['NumPy陣列']
+                self._load_numpy(file_path)
+            
+            elif file_ext == '.npz':
+                # 每個陣列視為一個工作表
+                self.file_type = 'npz'
+                self.available_sheets = self._get_npz_names(file_path)
+                if sheet_name is None:
+                    sheet_name = self.available_sheets[0]
+                self._load_npz(file_path, sheet_name)
+            
+            elif file_ext in ['.parquet', '.feather']:
+                self.file_type = file_ext[1:]
+                self.available_sheets = ['Parquet資料' if self.file_type == 'parquet' else 'Feather資料']
+                self._load_arrow(file_path, self.file_type)
+            
+            elif file_ext == '.bep':
+                self.file_type = 'raw'
+                self.available_sheets = ['原始面板']
+                self._load_raw_panel(file_path)
+            
             else:
-                print(f"不支援的檔案格式: {file_ext}")
+                self.last_error = f"不支援的檔案格式: {file_ext or '(無副檔名)'}"
+                print(self.last_error)
                 return False
             
             self.file_path = file_path
             return True
-            
-        except UnicodeDecodeError:
+        
+        except UnicodeDecodeError as e:
             # 嘗試其他編碼
+            if self.file_type != 'csv':
+                self.last_error = f"編碼錯誤: {e}"
+                print(f"載入檔案失敗（{self.last_error}）")
+                return False
             try:
-                if self.file_type == 'csv':
-                    self.data = pd.read_csv(file_path, encoding='big5', header=None)
-                    return True
+                self._load_csv(file_path, 'big5', streaming, columns)
+                self.file_path = file_path
+                return True
             except Exception as e:
-                print(f"載入檔案失敗（編碼錯誤）: {e}")
+                self.last_error = f"編碼錯誤: {type(e).__name__}: {e}"
+                print(f"載入檔案失敗（{self.last_error}）")
                 return False
         except Exception as e:
-            print(f"載入檔案失敗: {e}")
+            # 保留例外類型，區分檔案損壞、被其他程式鎖定（PermissionError）等原因
+            self.last_error = f"{type(e).__name__}: {e}"
+            print(f"載入檔案失敗: {self.last_error}")
             return False
     
     def get_available_sheets(self) -> List[str]:
@@ -83,10 +776,28 @@ class ExcelProcessor:
         取得檔案類型
         
         Returns:
-            Optional[str]: 檔案類型 ('excel' 或 'csv')
+            Optional[str]: 檔案類型 ('excel'、'csv'、'numpy'、'npz'、'parquet'、'feather' 或 'raw')
         """
         return self.file_type
     
+    def get_row_classification(self) -> Optional[RowClassification]:
+        """
+        取得目前工作表的逐行分類，第一次呼叫時計算並保存到下次載入為止
+        
+        Returns:
+            Optional[RowClassification]: 分類結果，尚未載入數據時為None
+        """
+        if self._sheet is None:
+            return None
+        
+        if self._row_classification is None:
+            self._row_classification = RowClassification.from_counts(self._sheet.numeric_count,
+                                                                     self._sheet.non_null_count)
+            if self._sheet_entry is not None:
+                self._sheet_entry['row_classification'] = self._row_classification
+        
+        return self._row_classification
+    
     def detect_data_start_row(self, column_index: int = 0) -> int:
         """
         自動偵測數值數據開始的行數
@@ -97,31 +808,10 @@ class ExcelProcessor:
         Returns:
             int: 數據開始的行數
         """
-        if self.data is None:
+        if self._sheet is None:
             return 0
         
-        # 尋找第一個數值（非文字標題）的行
-        for i in range(len(self.data)):
-            # 檢查這一行是否包含數值數據
-            row_data = self.data.iloc[i]
-            numeric_count = 0
-            total_non_nan = 0
-            
-            for val in row_data:
-                if pd.notna(val):
-                    total_non_nan += 1
-                    # 嘗試轉換為數字
-                    try:
-                        float(val)
-                        numeric_count += 1
-                    except (ValueError, TypeError):
-                        pass
-            
-            # 如果這一行有數值數據，且數值佔非空值的比例超過50%
-            if total_non_nan > 0 and numeric_count / total_non_nan > 0.5 and numeric_count >= 1:
-                return i
-        
-        return 0
+        return self.get_row_classification().data_start_row
     
     def detect_data_end_row(self, start_row: int = 0) -> int:
         """
@@ -133,32 +823,10 @@ class ExcelProcessor:
         Returns:
             int: 數據結束的行數
         """
-        if self.data is None:
-            return len(self.data) if self.data is not None else 0
-        
-        # 從start_row開始往下搜尋
-        for i in range(start_row, len(self.data)):
-            # 檢查這一行是否包含數值數據
-            row_data = self.data.iloc[i]
-            numeric_count = 0
-            total_non_nan = 0
-            
-            for val in row_data:
-                if pd.notna(val):
-                    total_non_nan += 1
-                    # 嘗試轉換為數字
-                    try:
-                        float(val)
-                        numeric_count += 1
-                    except (ValueError, TypeError):
-                        pass
-            
-            # 如果這一行沒有數值數據，或數值佔比太低，認為數據結束
-            if total_non_nan == 0 or (total_non_nan > 0 and numeric_count / total_non_nan < 0.5):
-                return i  # 返回第一個非數據行的索引
+        if self._sheet is None:
+            return 0
         
-        # 如果沒有找到結束行，返回最後一行
-        return len(self.data)
+        return self.get_row_classification().find_end_row(start_row)
     
     def get_matrix_data(self, start_row: int = 0, end_row: Optional[int] = None) -> np.ndarray:
         """
@@ -171,13 +839,60 @@ class ExcelProcessor:
         Returns:
             numpy.ndarray: 矩陣數據
         """
-        if self.data is None:
+        if self._sheet is None:
             return np.array([])
         
-        if end_row is None:
-            end_row = len(self.data)
+        return self._sheet.to_frame(start_row, end_row).values
+    
+    def get_float_block(self) -> Optional[np.ndarray]:
+        """
+        取得整個工作表的數值矩陣（型態為self.dtype，.npy/.npz/.bep為檔案中的型態；非數值內容為NaN）
+        
+        即為CompactSheet保存的矩陣，從磁碟快取載入時是映射的記憶體，不另外複製。
+        
+        Returns:
+            Optional[np.ndarray]: 數值矩陣（唯讀使用），尚未載入數據時為None
+        """
+        if self._sheet is None:
+            return None
+        
+        return self._sheet.values
+    
+    def get_matrix_view(self, start_row: int = 0, end_row: Optional[int] = None,
+                        column: Optional[int] = None) -> np.ndarray:
+        """
+        取得數值矩陣指定範圍的視圖（不複製數據）
+        
+        Args:
+            start_row: 開始行數
+            end_row: 結束行數，預設為None（到最後一行）
+            column: 欄位索引，預設為None（所有欄位）
+            
+        Returns:
+            numpy.ndarray: 二維視圖，指定column時為一維視圖
+        """
+        block = self.get_float_block()
+        if block is None:
+            return np.array([])
+        
+        rows = slice(start_row, end_row)
+        return block[rows] if column is None else block[rows, column]
+    
+    def get_middle_column_view(self, start_row: int = 0, end_row: Optional[int] = None) -> np.ndarray:
+        """
+        取得中間列指定範圍的數值視圖（不複製數據）
         
-        return self.data.iloc[start_row:end_row].values
+        Args:
+            start_row: 開始行數
+            end_row: 結束行數，預設為None（到最後一行）
+            
+        Returns:
+            numpy.ndarray: 中間列數值，非數值內容為NaN
+        """
+        if self._sheet is None or self._sheet.shape[1] == 0:
+            return np.array([])
+        
+        return self.get_matrix_view(start_row, end_row, column=self._sheet.shape[1] // 2)
     
     def get_middle_column_data(self, matrix: np.ndarray) -> np.ndarray:
         """
@@ -195,6 +910,46 @@ class ExcelProcessor:
         middle_col_index = matrix.shape[1] // 2
         return matrix[:, middle_col_index]
     
+    def get_middle_column_index(self) -> Optional[int]:
+        """
+        取得中間列在原始檔案中的欄位索引
+        
+        Returns:
+            Optional[int]: 欄位索引，尚未載入數據時為None
+        """
+        if self._sheet is None:
+            return None
+        
+        if self.loaded_columns is not None:
+            return self.loaded_columns[len(self.loaded_columns) // 2]
+        
+        return self._sheet.shape[1] // 2
+    
+    def get_sanitized_middle_column(self, start_row: int = 0, end_row: Optional[int] = None) -> SanitizedData:
+        """
+        取得清理後的中間列數值，每次載入後同一範圍只會清理一次
+        
+        Args:
+            start_row: 開始行數
+            end_row: 結束行數，預設為None（到最後一行）
+            
+        Returns:
+            SanitizedData: 清理後的數值及被移除儲存格的數量與位置
+        """
+        if self._sheet is None or 0 in self._sheet.shape:
+            return sanitize_numeric(np.array([]))
+        
+        total_rows, total_cols = self._sheet.shape
+        start_row, end_row, _ = slice(start_row, end_row).indices(total_rows)
+        key = (start_row, end_row)
+        
+        if key not in self._sanitized_columns:
+            # 沒有文字儲存格時直接清理數值矩陣的視圖
+            column = self._sheet.column(total_cols // 2, start_row, end_row)
+            self._sanitized_columns[key] = sanitize_numeric(column)
+        
+        return self._sanitized_columns[key]
+    
     def get_data_info(self) -> dict:
         """
         取得數據基本資訊
@@ -202,69 +957,71 @@ class ExcelProcessor:
         Returns:
             dict: 包含數據形狀、列名等資訊
         """
-        if self.data is None:
+        if self._sheet is None:
             return {}
         
+        sheet = self._sheet
         return {
-            'shape': self.data.shape,
-            'columns': list(self.data.columns),
-            'dtypes': dict(self.data.dtypes),
-            'has_null': self.data.isnull().any().any(),
+            'shape': sheet.shape,
+            'columns': list(sheet.columns),
+            'dtypes': dict(sheet.dtypes),
+            'has_null': bool(sheet.non_null_count.sum() < sheet.values.size),
+            'memory_bytes': sheet.nbytes,
             'file_path': self.file_path,
             'file_type': self.file_type,
-            'available_sheets': self.available_sheets
+            'available_sheets': self.available_sheets,
+            'loaded_columns': self.loaded_columns,
+            'source_column_count': self.source_column_count
         }
     
-    def get_preview_data(self, start_row: int = 0, end_row: Optional[int] = None, max_rows: int = 20, max_cols: int = 10) -> dict:
+    def get_preview_data(self, start_row: int = 0, end_row: Optional[int] = None, max_rows: Optional[int] = 20,
+                         max_cols: Optional[int] = 10) -> dict:
         """
         取得數據預覽
         
         Args:
             start_row: 開始行數
             end_row: 結束行數，預設為None（到最後一行）
-            max_rows: 最大顯示行數
-            max_cols: 最大顯示列數
+            max_rows: 最大顯示行數，None表示不限制（供虛擬化表格使用）
+            max_cols: 最大顯示列數，None表示不限制
             
         Returns:
             dict: 包含預覽數據的字典
         """
-        if self.data is None:
+        if self._sheet is None:
             return {}
         
+        total_rows, total_cols = self._sheet.shape
         if end_row is None:
-            end_row = len(self.data)
+            end_row = total_rows
         
-        # 限制預覽範圍
-        preview_end_row = min(start_row + max_rows, end_row, len(self.data))
-        preview_data = self.data.iloc[start_row:preview_end_row]
-        
-        # 限制列數
-        if preview_data.shape[1] > max_cols:
-            preview_data = preview_data.iloc[:, :max_cols]
-            truncated_cols = True
-        else:
-            truncated_cols = False
+        # 限制預覽範圍（只還原預覽範圍的DataFrame）
+        preview_end_row = min(end_row, total_rows)
+        if max_rows is not None:
+            preview_end_row = min(start_row + max_rows, preview_end_row)
+        truncated_cols = max_cols is not None and total_cols > max_cols
+        preview_data = self._sheet.to_frame(start_row, preview_end_row, max_cols)
         
-        # 取得矩陣資料
-        matrix_data = self.get_matrix_data(start_row=start_row, end_row=end_row)
+        # 取得矩陣視圖（不複製數據）
+        matrix_view = self.get_matrix_view(start_row=start_row, end_row=end_row)
         
-        # 取得中間列資料
+        # 取得中間列資料（只取預覽的行數）
         middle_column_data = None
         middle_col_index = None
-        if matrix_data.size > 0:
-            middle_col_index = matrix_data.shape[1] // 2
-            middle_column_data = self.get_middle_column_data(matrix_data)
+        if matrix_view.size > 0:
+            middle_col_index = self.get_middle_column_index()
+            middle_column_data = self.get_middle_column_view(start_row, end_row)[:max_rows]
         
         return {
             'preview_dataframe': preview_data,
-            'matrix_shape': matrix_data.shape if matrix_data.size > 0 else (0, 0),
+            'matrix_shape': matrix_view.shape if matrix_view.size > 0 else (0, 0),
             'middle_column_index': middle_col_index,
-            'middle_column_data': middle_column_data[:max_rows] if middle_column_data is not None else None,
+            'middle_column_data': middle_column_data,
             'start_row': start_row,
-            'end_row': min(end_row, len(self.data)),
-            'total_rows': len(self.data),
+            'end_row': min(end_row, total_rows),
+            'total_rows': total_rows,
             'truncated_cols': truncated_cols,
-            'actual_cols': self.data.shape[1]
+            'actual_cols': total_cols
         }
     
     def get_end_preview_data(self, end_row: int, max_rows: int = 10, max_cols: int = 10) -> dict:
@@ -279,41 +1036,38 @@ class ExcelProcessor:
         Returns:
             dict: 包含預覽數據的字典
         """
-        if self.data is None:
+        if self._sheet is None:
             return {}
         
+        total_rows, total_cols = self._sheet.shape
+        
         # 計算預覽範圍（從結束行往前取max_rows行）
         preview_start_row = max(0, end_row - max_rows)
-        preview_end_row = min(end_row, len(self.data))
+        preview_end_row = min(end_row, total_rows)
         
-        preview_data = self.data.iloc[preview_start_row:preview_end_row]
-        
-        # 限制列數
-        if preview_data.shape[1] > max_cols:
-            preview_data = preview_data.iloc[:, :max_cols]
-            truncated_cols = True
-        else:
-            truncated_cols = False
+        # 限制列數（只還原預覽範圍的DataFrame）
+        truncated_cols = total_cols > max_cols
+        preview_data = self._sheet.to_frame(preview_start_row, preview_end_row, max_cols)
         
-        # 取得矩陣資料
-        matrix_data = self.get_matrix_data(start_row=preview_start_row, end_row=preview_end_row)
+        # 取得矩陣視圖（不複製數據）
+        matrix_view = self.get_matrix_view(start_row=preview_start_row, end_row=preview_end_row)
         
         # 取得中間列資料
         middle_column_data = None
         middle_col_index = None
-        if matrix_data.size > 0:
-            middle_col_index = matrix_data.shape[1] // 2
-            middle_column_data = self.get_middle_column_data(matrix_data)
+        if matrix_view.size > 0:
+            middle_col_index = self.get_middle_column_index()
+            middle_column_data = self.get_middle_column_view(preview_start_row, preview_end_row)[:max_rows]
         
         return {
             'preview_dataframe': preview_data,
-            'matrix_shape': matrix_data.shape if matrix_data.size > 0 else (0, 0),
+            'matrix_shape': matrix_view.shape if matrix_view.size > 0 else (0, 0),
             'middle_column_index': middle_col_index,
-            'middle_column_data': middle_column_data[:max_rows] if middle_column_data is not None else None,
+            'middle_column_data': middle_column_data,
             'preview_start_row': preview_start_row,
             'preview_end_row': preview_end_row,
             'end_row': end_row,
-            'total_rows': len(self.data),
+            'total_rows': total_rows,
             'truncated_cols': truncated_cols,
-            'actual_cols': self.data.shape[1]
+            'actual_cols': total_cols
         }
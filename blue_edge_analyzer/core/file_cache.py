@@ -0,0 +1,336 @@
+"""
+已解析檔案的磁碟快取模組
+將解析後的工作表存成可記憶體映射的.npy檔案，重新開啟同一檔案時不必再解析XML/CSV
+"""
+
+import contextlib
+import datetime
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .compact_sheet import CompactSheet
+
+
+class ParsedFileCache:
+    """
+    已解析工作表的磁碟快取
+    
+    每個來源檔案（以路徑、修改時間與大小識別）對應一個子目錄：
+        meta.json          工作表清單及各工作表的欄位、文字儲存格與偵測結果
+        <工作表ID>.npy      數值矩陣（非數值儲存格為NaN，欄優先順序）
+        <工作表ID>_rows.npy 每行的數值數量與非空值數量
+    總大小超過上限時，依最後使用時間刪除最舊的檔案快取（LRU）。
+    """
+    
+    # 預設的快取大小上限
+    DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+    META_FILE = 'meta.json'
+    LOCK_FILE = 'meta.lock'
+    # 文字儲存格的保存格式版本（每個儲存格記錄原值的型態）
+    TEXT_CELL_FORMAT = 2
+    
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            cache_dir: 快取目錄，不存在時自動建立
+            max_bytes: 快取大小上限
+            
+        Raises:
+            OSError: 無法建立快取目錄
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    @staticmethod
+    def default_cache_dir() -> str:
+        """預設的快取目錄（~/.cache/blue_edge_analyzer）"""
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        return os.path.join(base, 'blue_edge_analyzer')
+    
+    @staticmethod
+    def _hash(value) -> str:
+        return hashlib.sha1(json.dumps(value, default=str).encode('utf-8')).hexdigest()
+    
+    def _entry_dir(self, file_key: tuple) -> str:
+        return os.path.join(self.cache_dir, self._hash(list(file_key)))
+    
+    def _read_meta(self, entry_dir: str) -> Optional[dict]:
+        try:
+            with open(os.path.join(entry_dir, self.META_FILE), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _write_meta(self, entry_dir: str, meta: dict):
+        # 先寫入暫存檔再取代，避免其他行程讀到寫到一半的內容
+        fd, tmp_path = tempfile.mkstemp(dir=entry_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_path, os.path.join(entry_dir, self.META_FILE))
+    
+    @contextlib.contextmanager
+    def _meta_lock(self, entry_dir: str):
+        """
+        跨行程的meta.json更新鎖，平行批次分析的多個行程同時快取同一檔案時，
+        讀取-修改-寫入不會互相覆蓋
+        """
+        with open(os.path.join(entry_dir, self.LOCK_FILE), 'a+b') as f:
+            if os.name == 'nt':
+                import msvcrt
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                try:
+                    yield
+                finally:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    
+    @staticmethod
+    def _save_array(path: str, array: np.ndarray):
+        # 每次寫入使用不同的暫存檔，多個行程同時寫入同一快取時不會互相干擾
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, array)
+            os.replace(tmp_path, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            raise
+    
+    @staticmethod
+    def _encode_text_cell(value) -> Optional[list]:
+        """
+        將文字儲存格的原值轉為可存成JSON的 [型態, 內容]
+        
+        Returns:
+            Optional[list]: 編碼結果，無法保存的型態為None
+        """
+        if isinstance(value, str):
+            return ['str', value]
+        if isinstance(value, (bool, np.bool_)):
+            return ['bool', bool(value)]
+        if isinstance(value, (int, np.integer)):
+            return ['int', int(value)]
+        if isinstance(value, pd.Timestamp):
+            return ['timestamp', value.isoformat()]
+        if isinstance(value, datetime.datetime):
+            return ['datetime', value.isoformat()]
+        if isinstance(value, datetime.date):
+            return ['date', value.isoformat()]
+        if isinstance(value, datetime.time):
+            return ['time', value.isoformat()]
+        if isinstance(value, datetime.timedelta):
+            return ['timedelta', value.total_seconds()]
+        return None
+    
+    @staticmethod
+    def _decode_text_cell(kind: str, value):
+        """還原_encode_text_cell編碼的原值"""
+        if kind == 'timestamp':
+            return pd.Timestamp(value)
+        if kind == 'datetime':
+            return datetime.datetime.fromisoformat(value)
+        if kind == 'date':
+            return datetime.date.fromisoformat(value)
+        if kind == 'time':
+            return datetime.time.fromisoformat(value)
+        if kind == 'timedelta':
+            return datetime.timedelta(seconds=value)
+        return value
+    
+    def _touch(self, entry_dir: str):
+        """更新最後使用時間（LRU依據）"""
+        try:
+            os.utime(os.path.join(entry_dir, self.META_FILE))
+        except OSError:
+            pass
+    
+    def load_sheet_names(self, file_key: tuple) -> Optional[List[str]]:
+        """
+        取得快取中的工作表清單
+        
+        Args:
+            file_key: 檔案鍵（路徑, 修改時間, 大小）
+            
+        Returns:
+            Optional[List[str]]: 工作表名稱清單，沒有快取時為None
+        """
+        meta = self._read_meta(self._entry_dir(file_key))
+        if meta is None:
+            return None
+        return meta.get('sheet_names')
+    
+    def store_sheet_names(self, file_key: tuple, sheet_names: List[str]):
+        """
+        儲存工作表清單
+        
+        Args:
+            file_key: 檔案鍵（路徑, 修改時間, 大小）
+            sheet_names: 工作表名稱清單
+        """
+        entry_dir = self._entry_dir(file_key)
+        os.makedirs(entry_dir, exist_ok=True)
+        with self._meta_lock(entry_dir):
+            meta = self._read_meta(entry_dir) or {'source': list(file_key), 'sheets': {}}
+            meta['sheet_names'] = list(sheet_names)
+            self._write_meta(entry_dir, meta)
+        self._evict()
+    
+    def load_sheet(self, file_key: tuple, sheet_name: str, variant=None) -> Optional[dict]:
+        """
+        以記憶體映射方式載入已快取的工作表
+        
+        Args:
+            file_key: 檔案鍵（路徑, 修改時間, 大小）
+            sheet_name: 工作表名稱
+            variant: 載入方式（完整載入為None，串流模式為載入的欄位）
+            
+        Returns:
+            Optional[dict]: 包含sheet（數值矩陣為映射記憶體的CompactSheet）、numeric_count、
+                            non_null_count、loaded_columns、source_column_count的字典，沒有快取時為None
+        """
+        entry_dir = self._entry_dir(file_key)
+        meta = self._read_meta(entry_dir)
+        if meta is None:
+            return None
+        
+        sheet_id = self._hash([sheet_name, variant])
+        sheet_meta = meta['sheets'].get(sheet_id)
+        if sheet_meta is None:
+            return None
+        
+        try:
+            values = np.load(os.path.join(entry_dir, sheet_id + '.npy'), mmap_mode='r')
+            row_counts = np.load(os.path.join(entry_dir, sheet_id + '_rows.npy'))
+        except (OSError, ValueError):
+            return None
+        
+        if 'column_dtypes' not in sheet_meta or sheet_meta.get('text_cell_format') != self.TEXT_CELL_FORMAT:
+            return None  # 舊版格式的快取，重新解析後覆寫
+        
+        # 數值矩陣直接引用映射的記憶體
+        text_cells = sheet_meta['text_cells']
+        text_values = np.empty(len(text_cells), dtype=object)
+        text_values[:] = [self._decode_text_cell(kind, value) for _, _, kind, value in text_cells]
+        sheet = CompactSheet(
+            values, sheet_meta['columns'],
+            text_rows=np.array([row for row, _, _, _ in text_cells], dtype=np.int64),
+            text_cols=np.array([col for _, col, _, _ in text_cells], dtype=np.int64),
+            text_values=text_values,
+            column_dtypes={int(col): np.dtype(dtype) for col, dtype in sheet_meta['column_dtypes'].items()},
+            numeric_count=row_counts[0],
+            non_null_count=row_counts[1]
+        )
+        
+        self._touch(entry_dir)
+        return {
+            'sheet': sheet,
+            'numeric_count': row_counts[0],
+            'non_null_count': row_counts[1],
+            'loaded_columns': sheet_meta['loaded_columns'],
+            'source_column_count': sheet_meta['source_column_count'],
+        }
+    
+    def store_sheet(self, file_key: tuple, sheet_name: str, variant, data: Union[CompactSheet, pd.DataFrame],
+                    numeric_count: np.ndarray, non_null_count: np.ndarray, data_start_row: int,
+                    data_end_row: int, loaded_columns: Optional[List[int]] = None,
+                    source_column_count: Optional[int] = None):
+        """
+        將解析後的工作表寫入快取（含無法保存型態的文字儲存格時不寫入）
+        
+        Args:
+            file_key: 檔案鍵（路徑, 修改時間, 大小）
+            sheet_name: 工作表名稱
+            variant: 載入方式（完整載入為None，串流模式為載入的欄位）
+            data: 工作表數據（CompactSheet或DataFrame）
+            numeric_count: 每行數值數量
+            non_null_count: 每行非空值數量
+            data_start_row: 偵測到的數據開始行數
+            data_end_row: 偵測到的數據結束行數
+            loaded_columns: 串流模式下載入的原始欄位索引
+            source_column_count: 原始檔案的欄位數
+        """
+        sheet = data if isinstance(data, CompactSheet) else CompactSheet.from_frame(data)
+        text_cells = []
+        for row, col, text in zip(sheet.text_rows, sheet.text_cols, sheet.text_values):
+            encoded = self._encode_text_cell(text)
+            if encoded is None:
+                return  # 還原後的預覽會與未快取時不同
+            text_cells.append([int(row), int(col)] + encoded)
+        
+        entry_dir = self._entry_dir(file_key)
+        os.makedirs(entry_dir, exist_ok=True)
+        sheet_id = self._hash([sheet_name, variant])
+        
+        self._save_array(os.path.join(entry_dir, sheet_id + '.npy'), sheet.values)
+        self._save_array(os.path.join(entry_dir, sheet_id + '_rows.npy'),
+                         np.vstack([numeric_count, non_null_count]).astype(np.int64))
+        
+        with self._meta_lock(entry_dir):
+            meta = self._read_meta(entry_dir) or {'source': list(file_key), 'sheets': {}}
+            meta['sheets'][sheet_id] = {
+                'sheet_name': sheet_name,
+                'columns': [int(col) if isinstance(col, (int, np.integer)) else str(col) for col in sheet.columns],
+                'column_dtypes': {str(col): dtype.str for col, dtype in sheet.column_dtypes.items()},
+                'text_cell_format': self.TEXT_CELL_FORMAT,
+                'text_cells': text_cells,
+                'loaded_columns': loaded_columns,
+                'source_column_count': source_column_count,
+                'data_start_row': data_start_row,
+                'data_end_row': data_end_row,
+            }
+            self._write_meta(entry_dir, meta)
+        self._evict()
+    
+    def total_bytes(self) -> int:
+        """快取目前佔用的位元組數"""
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+        return total
+    
+    def _evict(self):
+        """刪除最久未使用的檔案快取，直到總大小不超過上限"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            entry_dir = os.path.join(self.cache_dir, name)
+            if not os.path.isdir(entry_dir):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(entry_dir) if entry.is_file())
+            try:
+                last_used = os.path.getmtime(os.path.join(entry_dir, self.META_FILE))
+            except OSError:
+                last_used = 0.0
+            entries.append((last_used, size, entry_dir))
+        
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry_dir in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+    
+    def clear(self):
+        """刪除所有快取"""
+        for name in os.listdir(self.cache_dir):
+            shutil.rmtree(os.path.join(self.cache_dir, name), ignore_errors=True)
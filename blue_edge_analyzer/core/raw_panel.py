@@ -0,0 +1,131 @@
+"""
+原始面板格式模組
+亮度量測儀器輸出的二進位面板：固定長度的檔頭加上逐行排列的little-endian數值，
+以np.memmap直接映射，不複製數據，只有實際讀取的部分才會從磁碟載入
+"""
+
+import os
+import struct
+from dataclasses import dataclass
+
+import numpy as np
+
+
+# 檔案格式（副檔名 .bep，所有欄位皆為little-endian）：
+#   位移  大小  內容
+#   0     4     魔術字串 b'BEP1'
+#   4     4     寬度（每行的數值數量，uint32）
+#   8     4     高度（行數，uint32）
+#   12    2     數值型態代碼（uint16，見DTYPE_CODES）
+#   14    2     保留（0）
+#   16    ...   寬度 x 高度 個數值，逐行排列（row-major）
+MAGIC = b'BEP1'
+HEADER = struct.Struct('<4sIIHH')
+HEADER_SIZE = HEADER.size
+# 數值型態代碼
+DTYPE_CODES = {
+    1: np.dtype('<f4'),
+    2: np.dtype('<u2'),
+    3: np.dtype('<f8'),
+}
+
+
+@dataclass(frozen=True)
+class RawPanelHeader:
+    """原始面板的檔頭"""
+    
+    width: int  # 每行的數值數量（欄數）
+    height: int  # 行數
+    dtype: np.dtype  # 數值型態
+    
+    @property
+    def shape(self) -> tuple:
+        """(行數, 欄數)"""
+        return self.height, self.width
+    
+    @property
+    def data_bytes(self) -> int:
+        """數值部分的位元組數"""
+        return self.width * self.height * self.dtype.itemsize
+
+
+def _dtype_code(dtype) -> int:
+    """數值型態對應的代碼"""
+    dtype = np.dtype(dtype).newbyteorder('<')
+    for code, supported in DTYPE_CODES.items():
+        if supported == dtype:
+            return code
+    raise ValueError(f"原始面板不支援的數值型態: {dtype}，可用 float32、uint16、float64")
+
+
+def read_raw_panel_header(file_path: str) -> RawPanelHeader:
+    """
+    讀取並驗證原始面板的檔頭
+    
+    Args:
+        file_path: 文件路徑
+        
+    Returns:
+        RawPanelHeader: 檔頭
+        
+    Raises:
+        ValueError: 不是原始面板檔案、型態代碼未知或檔案大小與檔頭不符
+    """
+    with open(file_path, 'rb') as f:
+        header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE:
+        raise ValueError("檔案太小，不是原始面板檔案")
+    
+    magic, width, height, code, _ = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError(f"不是原始面板檔案（魔術字串為 {magic!r}）")
+    if code not in DTYPE_CODES:
+        raise ValueError(f"未知的數值型態代碼: {code}")
+    
+    result = RawPanelHeader(width, height, DTYPE_CODES[code])
+    actual_bytes = os.path.getsize(file_path) - HEADER_SIZE
+    if actual_bytes < result.data_bytes:
+        raise ValueError(f"檔案大小與檔頭不符：需要 {result.data_bytes} 位元組的數據，實際為 {actual_bytes}")
+    return result
+
+
+def open_raw_panel(file_path: str) -> np.memmap:
+    """
+    以記憶體映射開啟原始面板（唯讀，不複製）
+    
+    Args:
+        file_path: 文件路徑
+        
+    Returns:
+        np.memmap: (高度, 寬度) 的數值陣列
+    """
+    header = read_raw_panel_header(file_path)
+    if header.data_bytes == 0:
+        return np.empty(header.shape, dtype=header.dtype)
+    return np.memmap(file_path, dtype=header.dtype, mode='r', offset=HEADER_SIZE, shape=header.shape)
+
+
+def write_raw_panel(file_path: str, data: np.ndarray, dtype=np.float64):
+    """
+    將二維數值陣列寫成原始面板
+    
+    Args:
+        file_path: 文件路徑
+        data: 二維數值陣列
+        dtype: 儲存的數值型態（float64、float32或uint16），預設float64不失去精度；
+               整數型態會四捨五入並限制在可表示的範圍內
+    """
+    data = np.asarray(data)
+    if data.ndim != 2:
+        raise ValueError(f"原始面板需要二維陣列，實際為 {data.ndim} 維")
+    
+    code = _dtype_code(dtype)
+    dtype = DTYPE_CODES[code]
+    if dtype.kind == 'u' and data.dtype.kind == 'f':
+        info = np.iinfo(dtype)
+        data = np.clip(np.rint(data), info.min, info.max)
+    
+    height, width = data.shape
+    with open(file_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, width, height, code, 0))
+        np.ascontiguousarray(data, dtype=dtype).tofile(f)
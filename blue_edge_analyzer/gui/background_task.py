@@ -0,0 +1,154 @@
+"""
+背景工作模組
+在背景執行緒執行載入與計算，透過佇列與root.after把結果送回tkinter主執行緒
+"""
+
+import queue
+import threading
+from typing import Callable, Optional
+
+
+class TaskCancelled(Exception):
+    """工作已被使用者取消"""
+
+
+class BackgroundTaskRunner:
+    """
+    依提交順序在單一背景執行緒中執行耗時工作
+    
+    每次submit都會產生新的世代編號，只有最新世代的進度與結果會送回主執行緒，
+    使用者在載入途中切換工作表時，舊的結果不會覆蓋新的結果。
+    所有工作在同一個執行緒中依序執行，共用的處理器不會同時被兩個工作存取。
+    """
+    
+    # 主執行緒檢查結果佇列的間隔（毫秒）
+    POLL_INTERVAL_MS = 50
+    
+    def __init__(self, root, on_busy_changed: Optional[Callable[[bool], None]] = None,
+                 on_progress: Optional[Callable[[Optional[float], str], None]] = None):
+        """
+        Args:
+            root: tkinter根視窗（只使用root.after排程）
+            on_busy_changed: 忙碌狀態改變時的回調函數
+            on_progress: 進度回調函數，參數為(進度0.0-1.0或None表示不確定, 訊息)
+        """
+        self.root = root
+        self.on_busy_changed = on_busy_changed
+        self.on_progress = on_progress
+        self._tasks = queue.Queue()
+        self._results = queue.Queue()
+        self._worker = None
+        self._generation = 0
+        self._cancel_event = threading.Event()
+        self._callbacks = None  # 最新工作的(on_done, on_error)
+        self._busy = False
+        self._polling = False
+    
+    @property
+    def busy(self) -> bool:
+        """最新提交的工作是否仍在執行"""
+        return self._busy
+    
+    def submit(self, work: Callable, on_done: Callable, on_error: Optional[Callable] = None) -> int:
+        """
+        提交背景工作，較早提交但尚未完成的工作結果將被捨棄
+        
+        Args:
+            work: 在背景執行緒執行的函式，參數為(progress, cancel_event)，
+                  progress(進度, 訊息)可回報進度，cancel_event被設定時應儘早結束
+            on_done: 成功時在主執行緒呼叫，參數為work的回傳值
+            on_error: 發生例外時在主執行緒呼叫，參數為例外物件
+            
+        Returns:
+            int: 此工作的世代編號
+        """
+        self._cancel_event.set()  # 通知前一個工作儘早結束
+        self._generation += 1
+        self._cancel_event = threading.Event()
+        self._callbacks = (on_done, on_error)
+        self._tasks.put((self._generation, work, self._cancel_event))
+        
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run_worker, daemon=True)
+            self._worker.start()
+        
+        self._set_busy(True)
+        self._schedule_poll()
+        return self._generation
+    
+    @property
+    def cancelling(self) -> bool:
+        """目前的工作是否已取消但背景執行緒尚未結束"""
+        return self._busy and self._callbacks is None
+    
+    def cancel(self):
+        """
+        取消目前的工作，其後送回的進度與結果都會被捨棄
+        
+        忙碌狀態保持到背景執行緒確認工作已結束（包括工作本身的還原處理），
+        在此之前共用的處理器仍可能被背景執行緒修改。
+        """
+        if not self._busy or self._callbacks is None:
+            return
+        self._cancel_event.set()
+        self._callbacks = None
+    
+    def _set_busy(self, busy: bool):
+        if busy != self._busy:
+            self._busy = busy
+            if self.on_busy_changed is not None:
+                self.on_busy_changed(busy)
+    
+    def _run_worker(self):
+        """背景執行緒：依序執行佇列中的工作"""
+        while True:
+            generation, work, cancel_event = self._tasks.get()
+            
+            def progress(fraction: Optional[float] = None, message: str = '', generation=generation):
+                self._results.put((generation, 'progress', (fraction, message)))
+            
+            try:
+                if cancel_event.is_set():
+                    raise TaskCancelled()
+                result = work(progress, cancel_event)
+                self._results.put((generation, 'done', result))
+            except TaskCancelled:
+                self._results.put((generation, 'cancelled', None))
+            except Exception as e:
+                self._results.put((generation, 'error', e))
+    
+    def _schedule_poll(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.POLL_INTERVAL_MS, self._poll)
+    
+    def _poll(self):
+        """主執行緒：取出結果佇列中最新世代的進度與結果"""
+        self._polling = False
+        while True:
+            try:
+                generation, kind, payload = self._results.get_nowait()
+            except queue.Empty:
+                break
+            
+            if generation != self._generation:
+                continue  # 已被較新的工作取代或已取消
+            
+            if kind == 'progress':
+                if self.on_progress is not None and self._callbacks is not None:
+                    self.on_progress(*payload)
+                continue
+            
+            callbacks = self._callbacks
+            self._callbacks = None
+            self._set_busy(False)
+            if callbacks is None:
+                continue  # 已取消的工作結束，結果捨棄
+            on_done, on_error = callbacks
+            if kind == 'done':
+                on_done(payload)
+            elif kind == 'error' and on_error is not None:
+                on_error(payload)
+        
+        if self._busy:
+            self._schedule_poll()
@@ -6,15 +6,27 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import os
+import warnings
 import pandas as pd
+import numpy as np
 from typing import Optional
 import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 from matplotlib.figure import Figure
 import matplotlib.font_manager as fm
 
 from ..core.excel_processor import ExcelProcessor
+from ..core.file_cache import ParsedFileCache
 from ..core.blue_edge_calculator import BlueEdgeCalculator
+from .background_task import BackgroundTaskRunner, TaskCancelled
+from .virtual_grid import GridSource, VirtualGrid
+from ..utils.plotting import BlitManager, DecimatedLine, nearest_point_index
+
+
+# 閾值輸入停止變動多久後重新計算（毫秒）
+LIVE_RECALC_DELAY_MS = 250
+# 閾值敏感度曲線掃描的百分比（1% - 50%，與閾值輸入框的範圍相同）
+SWEEP_PERCENTAGES = np.arange(1, 51) / 100
 
 
 class MainWindow:
@@ -25,8 +37,8 @@ class MainWindow:
         self.root.title("Blue Edge Index Analyzer v1.0")
         self.root.geometry("800x600")
         
-        # 核心處理器
-        self.excel_processor = ExcelProcessor()
+        # 核心處理器（重新開啟同一檔案時從磁碟快取載入）
+        self.excel_processor = ExcelProcessor(cache_dir=ParsedFileCache.default_cache_dir())
         self.calculator = BlueEdgeCalculator()
         
         # 結果變數
@@ -36,6 +48,16 @@ class MainWindow:
         # 為了向後相容，保持舊的threshold_var引用
         self.threshold_var = None
         
+        # 載入與計算在背景執行緒執行，避免視窗凍結
+        self.task_runner = BackgroundTaskRunner(self.root, on_busy_changed=self.on_busy_changed,
+                                                on_progress=self.on_task_progress)
+        self.busy_buttons = []  # 背景工作執行中停用的按鈕（會讀取處理器數據）
+        self.loaded_sheet_name = None  # 處理器目前載入的工作表，取消載入時用來還原
+        
+        # 最近一次計算的數據，閾值改變時以計算器的快取即時重新計算
+        self.last_calculation = None
+        self.live_recalc_job = None
+        
         self.setup_ui()
     
     def setup_ui(self):
@@ -71,10 +93,12 @@ class MainWindow:
         start_row_spinbox.grid(row=1, column=1, sticky=tk.W, padx=(0, 20), pady=(5, 0))
         
         # 自動偵測按鈕
-        ttk.Button(param_frame, text="自動偵測", command=self.auto_detect_start_row).grid(row=1, column=2, pady=(5, 0))
+        detect_start_button = ttk.Button(param_frame, text="自動偵測", command=self.auto_detect_start_row)
+        detect_start_button.grid(row=1, column=2, pady=(5, 0))
         
         # 預覽數據按鈕
-        ttk.Button(param_frame, text="預覽數據", command=self.preview_data).grid(row=1, column=3, padx=(10, 0), pady=(5, 0))
+        preview_button = ttk.Button(param_frame, text="預覽數據", command=self.preview_data)
+        preview_button.grid(row=1, column=3, padx=(10, 0), pady=(5, 0))
         
         # 資料結束行數
         ttk.Label(param_frame, text="資料結束行數:").grid(row=2, column=0, sticky=tk.W, padx=(0, 10), pady=(5, 0))
@@ -83,10 +107,12 @@ class MainWindow:
         end_row_spinbox.grid(row=2, column=1, sticky=tk.W, padx=(0, 20), pady=(5, 0))
         
         # 自動偵測結束行數按鈕
-        ttk.Button(param_frame, text="自動偵測", command=self.auto_detect_end_row).grid(row=2, column=2, pady=(5, 0))
+        detect_end_button = ttk.Button(param_frame, text="自動偵測", command=self.auto_detect_end_row)
+        detect_end_button.grid(row=2, column=2, pady=(5, 0))
         
         # 預覽結束數據按鈕
-        ttk.Button(param_frame, text="預覽結束數據", command=self.preview_end_data).grid(row=2, column=3, padx=(10, 0), pady=(5, 0))
+        preview_end_button = ttk.Button(param_frame, text="預覽結束數據", command=self.preview_end_data)
+        preview_end_button.grid(row=2, column=3, padx=(10, 0), pady=(5, 0))
         
         # TopSide 閾值設定
         ttk.Label(param_frame, text="TopSide N%閾值:").grid(row=3, column=0, sticky=tk.W, padx=(0, 10), pady=(5, 0))
@@ -120,7 +146,14 @@ class MainWindow:
         
         chart_button = ttk.Button(calc_frame, text="顯示中間列曲線圖", 
                                 command=self.show_middle_column_chart)
-        chart_button.pack(side=tk.LEFT)
+        chart_button.pack(side=tk.LEFT, padx=(0, 10))
+        
+        sensitivity_button = ttk.Button(calc_frame, text="閾值敏感度曲線",
+                                        command=self.show_threshold_sensitivity)
+        sensitivity_button.pack(side=tk.LEFT)
+        
+        self.busy_buttons = [detect_start_button, preview_button, detect_end_button, preview_end_button,
+                             calc_button, chart_button, sensitivity_button]
         
         # 結果顯示區域
         result_frame = ttk.LabelFrame(main_frame, text="計算結果", padding="5")
@@ -144,6 +177,17 @@ class MainWindow:
         ttk.Button(button_frame, text="複製結果", command=self.copy_result).pack(side=tk.LEFT, padx=(0, 10))
         ttk.Button(button_frame, text="清除結果", command=self.clear_result).pack(side=tk.LEFT)
         
+        # 背景工作進度列
+        status_frame = ttk.Frame(main_frame)
+        status_frame.grid(row=5, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(10, 0))
+        
+        self.status_text = tk.StringVar(value="就緒")
+        ttk.Label(status_frame, textvariable=self.status_text).pack(side=tk.LEFT)
+        self.cancel_button = ttk.Button(status_frame, text="取消", command=self.cancel_task, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.RIGHT)
+        self.progress_bar = ttk.Progressbar(status_frame, mode='determinate', maximum=1.0, length=200)
+        self.progress_bar.pack(side=tk.RIGHT, padx=(10, 10))
+        
         # 設定網格權重
         main_frame.columnconfigure(0, weight=1)
         main_frame.rowconfigure(3, weight=1)
@@ -153,6 +197,10 @@ class MainWindow:
         # 為了向後相容，設定threshold_var引用
         self.threshold_var = self.topside_threshold_var
         
+        # 閾值改變時即時重新計算（只重新判斷或重新計算受影響的一側）
+        for var in (self.topside_threshold_var, self.bottomside_threshold_var, self.ng_threshold_var):
+            var.trace_add('write', self.on_threshold_changed)
+        
         # 設定matplotlib中文字體
         self.setup_matplotlib_fonts()
     
@@ -241,20 +289,18 @@ class MainWindow:
         file_path = filedialog.askopenfilename(
             title="選擇Excel或CSV檔案",
             filetypes=[
-                ("支援的檔案", "*.xlsx *.xls *.csv"),
+                ("支援的檔案", "*.xlsx *.xls *.csv *.npy *.npz *.parquet *.feather *.bep"),
                 ("Excel files", "*.xlsx *.xls"), 
                 ("CSV files", "*.csv"),
+                ("NumPy files", "*.npy *.npz"),
+                ("Parquet / Feather files", "*.parquet *.feather"),
+                ("Raw panel files", "*.bep"),
                 ("All files", "*.*")
             ]
         )
         
         if file_path:
-            if self.excel_processor.load_file(file_path):
-                self.file_path_text.set(os.path.basename(file_path))
-                self.update_sheet_list()
-                self.show_file_info()
-            else:
-                messagebox.showerror("錯誤", "無法載入檔案")
+            self.run_load_task(file_path, None, detect_rows=False)
     
     def update_sheet_list(self):
         """更新工作表選擇清單"""
@@ -269,24 +315,105 @@ class MainWindow:
         if selected_sheet and self.excel_processor.file_path:
             # 重新載入選擇的工作表
             file_type = self.excel_processor.get_file_type()
-            if file_type == 'excel':
-                if self.excel_processor.load_file(self.excel_processor.file_path, selected_sheet):
-                    self.show_file_info()
-                    # 重新偵測資料開始行數
-                    start_pandas_index = self.excel_processor.detect_data_start_row()
-                    start_excel_row = start_pandas_index + 1
-                    self.start_row_var.set(str(start_excel_row))
-                    
-                    # 重新偵測資料結束行數
-                    end_pandas_index = self.excel_processor.detect_data_end_row(start_pandas_index)
-                    end_excel_row = end_pandas_index
-                    self.end_row_var.set(str(end_excel_row))
+            if file_type in ('excel', 'npz'):
+                self.run_load_task(self.excel_processor.file_path, selected_sheet, detect_rows=True)
+    
+    def run_load_task(self, file_path: str, sheet_name: Optional[str], detect_rows: bool):
+        """
+        在背景執行緒載入檔案（或工作表），完成後更新介面
+        
+        Args:
+            file_path: 文件路徑
+            sheet_name: 工作表名稱，None表示載入新檔案的第一個工作表
+            detect_rows: 是否同時重新偵測資料開始/結束行數
+        """
+        processor = self.excel_processor
+        # 取消時還原為目前顯示的檔案與工作表（已在記憶體快取中）
+        previous = (processor.file_path, self.loaded_sheet_name)
+        
+        def work(progress, cancel_event):
+            progress(None, f"載入 {os.path.basename(file_path)}{f' [{sheet_name}]' if sheet_name else ''}...")
+            loaded = processor.load_file(file_path, sheet_name)
+            
+            if loaded and detect_rows and not cancel_event.is_set():
+                progress(0.8, "偵測資料開始/結束行數...")
+                start_pandas_index = processor.detect_data_start_row()
+                end_pandas_index = processor.detect_data_end_row(start_pandas_index)
+            else:
+                start_pandas_index = end_pandas_index = None
+            
+            if cancel_event.is_set():
+                if loaded and previous[0] is not None:
+                    processor.load_file(previous[0], previous[1])
+                raise TaskCancelled()
+            return loaded, start_pandas_index, end_pandas_index
+        
+        def done(outcome):
+            loaded, start_pandas_index, end_pandas_index = outcome
+            if not loaded:
+                if sheet_name is None:
+                    messagebox.showerror("錯誤", "無法載入檔案")
                 else:
-                    messagebox.showerror("錯誤", f"無法載入工作表: {selected_sheet}")
+                    messagebox.showerror("錯誤", f"無法載入工作表: {sheet_name}")
+                return
+            
+            if sheet_name is None:
+                self.file_path_text.set(os.path.basename(file_path))
+                self.update_sheet_list()
+            self.loaded_sheet_name = sheet_name or self.sheet_var.get() or None
+            # 數據已更換，舊的計算結果不能再用於即時重新計算
+            self.last_calculation = None
+            self.calculator.clear_evaluation_cache()
+            self.show_file_info()
+            
+            if start_pandas_index is not None:
+                # 重新偵測的資料開始/結束行數
+                start_excel_row = start_pandas_index + 1
+                self.start_row_var.set(str(start_excel_row))
+                end_excel_row = end_pandas_index
+                self.end_row_var.set(str(end_excel_row))
+        
+        self.task_runner.submit(work, done, lambda e: messagebox.showerror("錯誤", f"載入檔案失敗: {e}"))
+    
+    def cancel_task(self):
+        """取消目前的背景工作，按鈕在背景執行緒結束（含還原原本的工作表）後才重新啟用"""
+        self.task_runner.cancel()
+        self.cancel_button.configure(state=tk.DISABLED)
+        # 工作表清單還原為目前已載入的工作表
+        if self.loaded_sheet_name is not None:
+            self.sheet_var.set(self.loaded_sheet_name)
+        self.status_text.set("正在取消...")
+    
+    def on_busy_changed(self, busy: bool):
+        """背景工作開始/結束時切換進度列與按鈕狀態"""
+        state = tk.DISABLED if busy else tk.NORMAL
+        for button in self.busy_buttons:
+            button.configure(state=state)
+        self.cancel_button.configure(state=tk.NORMAL if busy else tk.DISABLED)
+        
+        if busy:
+            self.progress_bar.configure(mode='indeterminate')
+            self.progress_bar.start(15)
+        else:
+            self.progress_bar.stop()
+            self.progress_bar.configure(mode='determinate', value=0)
+            self.status_text.set("就緒")
+    
+    def on_task_progress(self, fraction: Optional[float], message: str):
+        """更新背景工作進度（fraction為None表示無法估計進度）"""
+        if fraction is None:
+            if str(self.progress_bar.cget('mode')) != 'indeterminate':
+                self.progress_bar.configure(mode='indeterminate')
+                self.progress_bar.start(15)
+        else:
+            self.progress_bar.stop()
+            self.progress_bar.configure(mode='determinate', value=fraction)
+        if message:
+            self.status_text.set(message)
     
     def auto_detect_start_row(self):
         """自動偵測資料開始行數"""
-        if self.excel_processor.data is None:
+        if not self.excel_processor.has_data:
             messagebox.showwarning("警告", "請先選擇檔案")
             return
         
@@ -297,7 +424,7 @@ class MainWindow:
     
     def auto_detect_end_row(self):
         """自動偵測資料結束行數"""
-        if self.excel_processor.data is None:
+        if not self.excel_processor.has_data:
             messagebox.showwarning("警告", "請先選擇檔案")
             return
         
@@ -315,7 +442,7 @@ class MainWindow:
     
     def preview_end_data(self):
         """預覽結束數據"""
-        if self.excel_processor.data is None:
+        if not self.excel_processor.has_data:
             messagebox.showwarning("警告", "請先選擇檔案")
             return
         
@@ -340,7 +467,7 @@ class MainWindow:
     
     def preview_data(self):
         """預覽選取的數據"""
-        if self.excel_processor.data is None:
+        if not self.excel_processor.has_data:
             messagebox.showwarning("警告", "請先選擇檔案")
             return
         
@@ -363,6 +490,13 @@ class MainWindow:
         except Exception as e:
             messagebox.showerror("錯誤", f"預覽數據時發生錯誤: {e}")
     
+    def excel_row_to_index(self, row_var: tk.StringVar, default: int) -> int:
+        """將行數輸入框中的Excel行號轉為pandas索引，未輸入或格式錯誤時回傳default"""
+        try:
+            return int(row_var.get()) - 1
+        except ValueError:
+            return default
+    
     def show_preview_window(self, preview_info: dict):
         """顯示數據預覽視窗"""
         preview_window = tk.Toplevel(self.root)
@@ -387,44 +521,19 @@ class MainWindow:
 矩陣形狀: {preview_info['matrix_shape']}
 中間列索引: {preview_info['middle_column_index']}"""
         
-        if preview_info['truncated_cols']:
-            info_text += f"\n注意: 只顯示前10列，實際共有 {preview_info['actual_cols']} 列"
-        
         ttk.Label(info_frame, text=info_text, font=('Arial', 10)).pack(anchor=tk.W)
         
-        # 數據表格
-        tree_frame = ttk.Frame(raw_frame)
-        tree_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        # 數據表格（整個工作表，只格式化可見範圍）
+        grid = VirtualGrid(raw_frame, GridSource(self.excel_processor.get_compact_sheet()), row_heading='行號')
         
-        # 建立Treeview
-        columns = list(preview_info['preview_dataframe'].columns)
-        tree = ttk.Treeview(tree_frame, columns=columns, show='tree headings')
+        jump_frame = ttk.Frame(raw_frame)
+        jump_frame.pack(fill=tk.X, padx=5)
+        ttk.Button(jump_frame, text="跳到開始行", command=lambda: grid.scroll_to_row(preview_info['start_row'])).pack(side=tk.LEFT)
+        ttk.Button(jump_frame, text="跳到結束行",
+                   command=lambda: grid.scroll_to_row(self.excel_row_to_index(self.end_row_var, preview_info['end_row'] - 1))).pack(side=tk.LEFT, padx=(5, 0))
         
-        # 設定列標題
-        tree.heading('#0', text='行號')
-        tree.column('#0', width=60, minwidth=60)
-        
-        for col in columns:
-            tree.heading(col, text=str(col))
-            tree.column(col, width=100, minwidth=80)
-        
-        # 插入數據
-        df = preview_info['preview_dataframe']
-        for idx, row in df.iterrows():
-            values = [str(val) if not pd.isna(val) else '' for val in row.values]
-            tree.insert('', 'end', text=str(idx + 1), values=values)  # 顯示Excel行號
-        
-        # 滾動條
-        v_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=tree.yview)
-        h_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=tree.xview)
-        tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
-        
-        tree.grid(row=0, column=0, sticky='nsew')
-        v_scrollbar.grid(row=0, column=1, sticky='ns')
-        h_scrollbar.grid(row=1, column=0, sticky='ew')
-        
-        tree_frame.grid_rowconfigure(0, weight=1)
-        tree_frame.grid_columnconfigure(0, weight=1)
+        grid.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        grid.scroll_to_row(preview_info['start_row'])
         
         # 第二個分頁：中間列數據
         middle_frame = ttk.Frame(notebook)
@@ -435,36 +544,20 @@ class MainWindow:
         middle_info_frame.pack(fill=tk.X, padx=5, pady=5)
         
         if preview_info['middle_column_data'] is not None:
+            # 從開始行到最後一行的中間列數值視圖
+            middle_column_view = self.excel_processor.get_middle_column_view(start_row=preview_info['start_row'])
             middle_info_text = f"""中間列索引: {preview_info['middle_column_index']}
-數據點數: {len(preview_info['middle_column_data'])}
+數據點數: {len(middle_column_view)}
 這些數據將用於Blue Edge Index計算"""
             
             ttk.Label(middle_info_frame, text=middle_info_text, font=('Arial', 10)).pack(anchor=tk.W)
             
-            # 中間列數據表格
-            middle_tree_frame = ttk.Frame(middle_frame)
-            middle_tree_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-            
-            middle_tree = ttk.Treeview(middle_tree_frame, columns=['value'], show='tree headings')
-            middle_tree.heading('#0', text='行號')
-            middle_tree.heading('value', text='數值')
-            middle_tree.column('#0', width=100, minwidth=100)
-            middle_tree.column('value', width=150, minwidth=150)
-            
-            # 插入中間列數據
-            for i, val in enumerate(preview_info['middle_column_data']):
-                display_val = str(val) if not pd.isna(val) else 'NaN'
-                middle_tree.insert('', 'end', text=str(preview_info['start_row'] + i + 1), values=[display_val])  # 顯示Excel行號
-            
-            # 中間列滾動條
-            middle_v_scrollbar = ttk.Scrollbar(middle_tree_frame, orient=tk.VERTICAL, command=middle_tree.yview)
-            middle_tree.configure(yscrollcommand=middle_v_scrollbar.set)
-            
-            middle_tree.grid(row=0, column=0, sticky='nsew')
-            middle_v_scrollbar.grid(row=0, column=1, sticky='ns')
-            
-            middle_tree_frame.grid_rowconfigure(0, weight=1)
-            middle_tree_frame.grid_columnconfigure(0, weight=1)
+            # 中間列數據表格（顯示Excel行號）
+            middle_source = GridSource(middle_column_view, first_row_number=preview_info['start_row'] + 1,
+                                       column_labels=['數值'], empty_text='NaN')
+            middle_grid = VirtualGrid(middle_frame, middle_source, row_heading='行號',
+                                      row_heading_width=100, column_width=150)
+            middle_grid.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         else:
             ttk.Label(middle_info_frame, text="無法取得中間列數據", font=('Arial', 10)).pack(anchor=tk.W)
         
@@ -500,44 +593,18 @@ class MainWindow:
 矩陣形狀: {preview_info['matrix_shape']}
 中間列索引: {preview_info['middle_column_index']}"""
         
-        if preview_info['truncated_cols']:
-            info_text += f"\n注意: 只顯示前10列，實際共有 {preview_info['actual_cols']} 列"
-        
         ttk.Label(info_frame, text=info_text, font=('Arial', 10)).pack(anchor=tk.W)
         
-        # 數據表格
-        tree_frame = ttk.Frame(raw_frame)
-        tree_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        # 建立Treeview
-        columns = list(preview_info['preview_dataframe'].columns)
-        tree = ttk.Treeview(tree_frame, columns=columns, show='tree headings')
-        
-        # 設定列標題
-        tree.heading('#0', text='Excel行號')
-        tree.column('#0', width=60, minwidth=60)
-        
-        for col in columns:
-            tree.heading(col, text=str(col))
-            tree.column(col, width=100, minwidth=80)
+        # 數據表格（整個工作表，只格式化可見範圍）
+        grid = VirtualGrid(raw_frame, GridSource(self.excel_processor.get_compact_sheet()), row_heading='Excel行號')
         
-        # 插入數據
-        df = preview_info['preview_dataframe']
-        for idx, row in df.iterrows():
-            values = [str(val) if not pd.isna(val) else '' for val in row.values]
-            tree.insert('', 'end', text=str(idx + 1), values=values)  # 顯示Excel行號
+        jump_frame = ttk.Frame(raw_frame)
+        jump_frame.pack(fill=tk.X, padx=5)
+        ttk.Button(jump_frame, text="跳到開始行", command=lambda: grid.scroll_to_row(self.excel_row_to_index(self.start_row_var, 0))).pack(side=tk.LEFT)
+        ttk.Button(jump_frame, text="跳到結束行", command=lambda: grid.scroll_to_row(preview_info['end_row'] - 1)).pack(side=tk.LEFT, padx=(5, 0))
         
-        # 滾動條
-        v_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=tree.yview)
-        h_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=tree.xview)
-        tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
-        
-        tree.grid(row=0, column=0, sticky='nsew')
-        v_scrollbar.grid(row=0, column=1, sticky='ns')
-        h_scrollbar.grid(row=1, column=0, sticky='ew')
-        
-        tree_frame.grid_rowconfigure(0, weight=1)
-        tree_frame.grid_columnconfigure(0, weight=1)
+        grid.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        grid.scroll_to_row(preview_info['end_row'] - 1)
         
         # 第二個分頁：中間列數據
         middle_frame = ttk.Frame(notebook)
@@ -554,30 +621,12 @@ class MainWindow:
             
             ttk.Label(middle_info_frame, text=middle_info_text, font=('Arial', 10)).pack(anchor=tk.W)
             
-            # 中間列數據表格
-            middle_tree_frame = ttk.Frame(middle_frame)
-            middle_tree_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-            
-            middle_tree = ttk.Treeview(middle_tree_frame, columns=['value'], show='tree headings')
-            middle_tree.heading('#0', text='Excel行號')
-            middle_tree.heading('value', text='數值')
-            middle_tree.column('#0', width=100, minwidth=100)
-            middle_tree.column('value', width=150, minwidth=150)
-            
-            # 插入中間列數據
-            for i, val in enumerate(preview_info['middle_column_data']):
-                display_val = str(val) if not pd.isna(val) else 'NaN'
-                middle_tree.insert('', 'end', text=str(preview_info['preview_start_row'] + i + 1), values=[display_val])  # 顯示Excel行號
-            
-            # 中間列滾動條
-            middle_v_scrollbar = ttk.Scrollbar(middle_tree_frame, orient=tk.VERTICAL, command=middle_tree.yview)
-            middle_tree.configure(yscrollcommand=middle_v_scrollbar.set)
-            
-            middle_tree.grid(row=0, column=0, sticky='nsew')
-            middle_v_scrollbar.grid(row=0, column=1, sticky='ns')
-            
-            middle_tree_frame.grid_rowconfigure(0, weight=1)
-            middle_tree_frame.grid_columnconfigure(0, weight=1)
+            # 中間列數據表格（顯示Excel行號）
+            middle_source = GridSource(preview_info['middle_column_data'], first_row_number=preview_info['preview_start_row'] + 1,
+                                       column_labels=['數值'], empty_text='NaN')
+            middle_grid = VirtualGrid(middle_frame, middle_source, row_heading='Excel行號',
+                                      row_heading_width=100, column_width=150)
+            middle_grid.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         else:
             ttk.Label(middle_info_frame, text="無法取得中間列數據", font=('Arial', 10)).pack(anchor=tk.W)
         
@@ -590,8 +639,12 @@ class MainWindow:
     def show_file_info(self):
         """顯示檔案資訊"""
         info = self.excel_processor.get_data_info()
-        file_type_text = "Excel檔案" if info.get('file_type') == 'excel' else "CSV檔案"
+        file_type_text = {'excel': "Excel檔案", 'numpy': "NumPy檔案", 'npz': "NumPy壓縮檔案",
+                          'parquet': "Parquet檔案", 'feather': "Feather檔案",
+                          'raw': "原始面板檔案"}.get(info.get('file_type'), "CSV檔案")
         sheets_info = f"- 可用工作表: {', '.join(info.get('available_sheets', []))}\n" if info.get('available_sheets') else ""
+        if info.get('loaded_columns') is not None:
+            sheets_info += f"- 串流模式: 只載入第 {', '.join(str(c) for c in info['loaded_columns'])} 欄 (原始檔案共 {info.get('source_column_count')} 欄)\n"
         
         info_text = f"""
 檔案資訊:
@@ -600,13 +653,14 @@ class MainWindow:
 {sheets_info}- 資料形狀: {info.get('shape', 'N/A')}
 - 欄位數量: {len(info.get('columns', []))}
 - 是否有空值: {'是' if info.get('has_null', False) else '否'}
+- 記憶體用量: {info.get('memory_bytes', 0) / 1024 / 1024:.1f} MB
 """
         self.result_text_widget.delete(1.0, tk.END)
         self.result_text_widget.insert(tk.END, info_text)
     
     def calculate_blue_edge(self):
-        """計算Blue Edge Index"""
-        if self.excel_processor.data is None:
+        """計算Blue Edge Index（在背景執行緒計算，完成後顯示結果）"""
+        if not self.excel_processor.has_data:
             messagebox.showwarning("警告", "請先選擇檔案")
             return
         
@@ -629,98 +683,269 @@ class MainWindow:
             self.calculator.set_topside_threshold_percentage(topside_threshold_percent)
             self.calculator.set_bottomside_threshold_percentage(bottomside_threshold_percent)
             self.calculator.set_ng_threshold(ng_threshold)
+        except ValueError as e:
+            messagebox.showerror("錯誤", f"參數輸入錯誤: {e}")
+            return
             
-            # 取得矩陣資料
-            matrix_data = self.excel_processor.get_matrix_data(start_row=start_pandas_index, end_row=end_pandas_index)
-            
-            if matrix_data.size == 0:
-                messagebox.showerror("錯誤", "無法取得有效資料")
-                return
-            
-            # 取得中間列資料
-            middle_column_data = self.excel_processor.get_middle_column_data(matrix_data)
-            
-            # 計算TopSide Blue Edge Index
-            topside_result, topside_judgment = self.calculator.calculate_blue_edge_index(middle_column_data)
-            topside_details = self.calculator.get_calculation_details(middle_column_data)
-            
-            # 計算BottomSide Blue Edge Index
-            bottomside_result, bottomside_judgment = self.calculator.calculate_bottomside_blue_edge_index(middle_column_data)
-            bottomside_details = self.calculator.get_bottomside_calculation_details(middle_column_data)
+        processor = self.excel_processor
+        calculator = self.calculator
+        # 相同檔案、工作表與範圍的計算共用計算器的快取
+        cache_key = (processor.file_path, self.loaded_sheet_name, start_pandas_index, end_pandas_index)
             
-            # 顯示結果
-            topside_threshold_percent = int(float(self.topside_threshold_var.get()))
-            bottomside_threshold_percent = int(float(self.bottomside_threshold_var.get()))
+        def work(progress, cancel_event):
+            progress(None, "計算 Blue Edge Index...")
+            # 取得矩陣視圖（只需要形狀，不複製數據）
+            matrix_view = processor.get_matrix_view(start_row=start_pandas_index, end_row=end_pandas_index)
+            if matrix_view.size == 0:
+                return None
             
-            # 隱藏詳細計算過程 - 使用者不需要這些資訊
-            topside_calculation_details_text = ""
-            bottomside_calculation_details_text = ""
+            # 取得清理後的中間列資料（每次載入只清理一次）
+            sanitized = processor.get_sanitized_middle_column(start_pandas_index, end_pandas_index)
+            if cancel_event.is_set():
+                raise TaskCancelled()
             
-            result_text = f"""
+            # 同時計算TopSide與BottomSide
+            result = calculator.evaluate(sanitized.values, include_details=True, cache_key=cache_key)
+            return matrix_view.shape, sanitized, result
+        
+        def done(outcome):
+            if outcome is None:
+                messagebox.showerror("錯誤", "無法取得有效資料")
+                return
+            matrix_shape, sanitized, result = outcome
+            self.last_calculation = {
+                'cache_key': cache_key,
+                'matrix_shape': matrix_shape,
+                'sanitized': sanitized,
+                'start_excel_row': start_excel_row,
+                'end_pandas_index': end_pandas_index
+            }
+            try:
+                self.show_calculation_result(matrix_shape, sanitized, result, start_excel_row, end_pandas_index,
+                                             ng_threshold)
+            except Exception as e:
+                messagebox.showerror("錯誤", f"計算過程發生錯誤: {e}")
+        
+        self.task_runner.submit(work, done, lambda e: messagebox.showerror("錯誤", f"計算過程發生錯誤: {e}"))
+    
+    def on_threshold_changed(self, *args):
+        """閾值輸入改變時延遲重新計算，連續輸入只計算最後一次"""
+        if self.live_recalc_job is not None:
+            self.root.after_cancel(self.live_recalc_job)
+        self.live_recalc_job = self.root.after(LIVE_RECALC_DELAY_MS, self.live_recalculate)
+    
+    def live_recalculate(self):
+        """以最近一次計算的數據與新的閾值重新計算（使用計算器的快取，在主執行緒直接完成）"""
+        self.live_recalc_job = None
+        last = self.last_calculation
+        if last is None or self.task_runner.busy:
+            return
+        
+        try:
+            topside_threshold_percent = float(self.topside_threshold_var.get()) / 100.0
+            bottomside_threshold_percent = float(self.bottomside_threshold_var.get()) / 100.0
+            ng_threshold = float(self.ng_threshold_var.get())
+        except ValueError:
+            return  # 尚未輸入完成的數值
+        
+        if not (0.0 < topside_threshold_percent <= 1.0 and 0.0 < bottomside_threshold_percent <= 1.0
+                and ng_threshold >= 0.0):
+            return
+        
+        self.calculator.set_topside_threshold_percentage(topside_threshold_percent)
+        self.calculator.set_bottomside_threshold_percentage(bottomside_threshold_percent)
+        self.calculator.set_ng_threshold(ng_threshold)
+        
+        result = self.calculator.evaluate(last['sanitized'].values, include_details=True,
+                                          cache_key=last['cache_key'])
+        self.show_calculation_result(last['matrix_shape'], last['sanitized'], result, last['start_excel_row'],
+                                     last['end_pandas_index'], ng_threshold, notify=False)
+    
+    def show_calculation_result(self, matrix_shape: tuple, sanitized, result, start_excel_row: int,
+                                end_pandas_index: Optional[int], ng_threshold: float, notify: bool = True):
+        """
+        顯示計算結果
+        
+        Args:
+            matrix_shape: 矩陣形狀
+            sanitized: 清理後的中間列資料
+            result: BlueEdgeResult計算結果
+            start_excel_row: 使用的開始行數（Excel行號）
+            end_pandas_index: 使用的結束行數，None表示到檔案結尾
+            ng_threshold: NG判斷閾值
+            notify: 是否顯示計算完成對話框（即時重新計算時不顯示）
+        """
+        topside = result.topside
+        bottomside = result.bottomside
+        end_excel_row = end_pandas_index
+        
+        if result.total_data_points == 0:
+            messagebox.showerror("錯誤", "中間列沒有有效的數值資料")
+            return
+        
+        topside_result, topside_judgment = topside.max_value, topside.judgment
+        bottomside_result, bottomside_judgment = bottomside.max_value, bottomside.judgment
+        
+        # 顯示結果
+        topside_threshold_percent = int(float(self.topside_threshold_var.get()))
+        bottomside_threshold_percent = int(float(self.bottomside_threshold_var.get()))
+        
+        # 隱藏詳細計算過程 - 使用者不需要這些資訊
+        topside_calculation_details_text = ""
+        bottomside_calculation_details_text = ""
+        
+        # 被移除的無效儲存格資訊
+        dropped_text = f"{sanitized.dropped_count}個"
+        if sanitized.dropped_count > 0:
+            dropped_rows = [str(start_excel_row + int(pos)) for pos in sanitized.dropped_positions[:10]]
+            dropped_text += f" (Excel第{', '.join(dropped_rows)}{'...' if sanitized.dropped_count > 10 else ''}行)"
+        
+        result_text = f"""
 === Blue Edge Index 計算結果 ===
 
 【TopSide 結果】
 最大值: {topside_result:.4f}
-最大值位置: 第{topside_details.get('max_position', 'N/A')}個數據
+最大值位置: 第{topside.max_position}個數據
 判斷結果: {topside_judgment}
 
 【BottomSide 結果】
 最大值: {bottomside_result:.4f}
-最大值位置: 倒數第{bottomside_details.get('max_position', 'N/A')}個數據
+最大值位置: 倒數第{bottomside.max_position}個數據
 判斷結果: {bottomside_judgment}
 
 === 計算參數 ===
-總資料點數: {topside_details.get('total_data_points', 'N/A')}
-TopSide {topside_threshold_percent}%資料點數: {topside_details.get('threshold_points', 'N/A')}
-TopSide 基準值 (第{topside_details.get('baseline_position', 'N/A')}個): {topside_details.get('baseline_value', 'N/A'):.4f}
-BottomSide {bottomside_threshold_percent}%資料點數: {bottomside_details.get('threshold_points', 'N/A')}
-BottomSide 基準值 (倒數第{bottomside_details.get('baseline_position', 'N/A')}個): {bottomside_details.get('baseline_value', 'N/A'):.4f}
+總資料點數: {result.total_data_points}
+移除的無效儲存格: {dropped_text}
+TopSide {topside_threshold_percent}%資料點數: {topside.threshold_points}
+TopSide 基準值 (第{topside.baseline_position}個): {topside.baseline_value:.4f}
+BottomSide {bottomside_threshold_percent}%資料點數: {bottomside.threshold_points}
+BottomSide 基準值 (倒數第{bottomside.baseline_position}個): {bottomside.baseline_value:.4f}
 NG判斷閾值: {ng_threshold}
-資料範圍: {topside_details.get('data_range', 'N/A')}
+資料範圍: {result.data_range}
 
 === 矩陣資訊 ===
-矩陣形狀: {matrix_data.shape}
-中間列索引: {matrix_data.shape[1] // 2}
+矩陣形狀: {matrix_shape}
+中間列索引: {self.excel_processor.get_middle_column_index()}
 使用的開始行數: Excel第{start_excel_row}行
 使用的結束行數: {f'Excel第{end_excel_row}行' if end_pandas_index is not None else '到檔案結尾'}
 {topside_calculation_details_text}
 === TopSide 所有計算結果 ===
 """
+        
+        # 添加TopSide所有計算值 - 反向顯示順序
+        if topside.calculated_values is not None and len(topside.calculated_values) > 0:
+            calculated_values = topside.calculated_values
+            max_position = topside.max_position
             
-            # 添加TopSide所有計算值 - 反向顯示順序
-            if 'calculated_values' in topside_details and topside_details['calculated_values']:
-                calculated_values = topside_details['calculated_values']
-                max_position = topside_details.get('max_position', 0)
-                
-                # 反向顯示：從最後一個到第一個
-                for i in range(len(calculated_values) - 1, -1, -1):
-                    value = calculated_values[i]
-                    original_position = i + 1  # 原始位置（從1開始）
-                    display_position = len(calculated_values) - i  # 顯示位置（反向）
-                    is_max = original_position == max_position
-                    result_text += f"第{display_position:2d}個結果: {value:10.4f}{'  ← 最大值' if is_max else ''}\n"
-            
-            result_text += f"{bottomside_calculation_details_text}\n=== BottomSide 所有計算結果 ===\n"
-            
-            # 添加BottomSide所有計算值
-            if 'calculated_values' in bottomside_details and bottomside_details['calculated_values']:
-                for i, value in enumerate(bottomside_details['calculated_values']):
-                    result_text += f"倒數第{i+1:2d}個結果: {value:10.4f}{'  ← 最大值' if i+1 == bottomside_details.get('max_position', 0) else ''}\n"
-            
-            self.result_text_widget.delete(1.0, tk.END)
-            self.result_text_widget.insert(tk.END, result_text)
-            
-            # 顯示結果對話框
+            # 反向顯示：從最後一個到第一個
+            for i in range(len(calculated_values) - 1, -1, -1):
+                value = calculated_values[i]
+                original_position = i + 1  # 原始位置（從1開始）
+                display_position = len(calculated_values) - i  # 顯示位置（反向）
+                is_max = original_position == max_position
+                result_text += f"第{display_position:2d}個結果: {value:10.4f}{'  ← 最大值' if is_max else ''}\n"
+        
+        result_text += f"{bottomside_calculation_details_text}\n=== BottomSide 所有計算結果 ===\n"
+        
+        # 添加BottomSide所有計算值
+        if bottomside.calculated_values is not None and len(bottomside.calculated_values) > 0:
+            for i, value in enumerate(bottomside.calculated_values):
+                result_text += f"倒數第{i+1:2d}個結果: {value:10.4f}{'  ← 最大值' if i+1 == bottomside.max_position else ''}\n"
+        
+        self.result_text_widget.delete(1.0, tk.END)
+        self.result_text_widget.insert(tk.END, result_text)
+        
+        # 顯示結果對話框
+        if notify:
             messagebox.showinfo("計算完成", f"TopSide 最大值: {topside_result:.4f} ({topside_judgment})\nBottomSide 最大值: {bottomside_result:.4f} ({bottomside_judgment})")
+    
+    def show_threshold_sensitivity(self):
+        """計算1% - 50%每個閾值百分比的Blue Edge Index（在背景執行緒計算，完成後顯示曲線）"""
+        if not self.excel_processor.has_data:
+            messagebox.showwarning("警告", "請先選擇檔案")
+            return
+        
+        try:
+            start_excel_row = int(self.start_row_var.get())
+            start_pandas_index = start_excel_row - 1
+            
+            end_pandas_index = None
+            if self.end_row_var.get().strip():
+                end_pandas_index = int(self.end_row_var.get())
             
+            ng_threshold = float(self.ng_threshold_var.get())
+            self.calculator.set_ng_threshold(ng_threshold)
         except ValueError as e:
             messagebox.showerror("錯誤", f"參數輸入錯誤: {e}")
-        except Exception as e:
-            messagebox.showerror("錯誤", f"計算過程發生錯誤: {e}")
+            return
+        
+        processor = self.excel_processor
+        calculator = self.calculator
+        
+        def work(progress, cancel_event):
+            progress(None, "計算閾值敏感度...")
+            sanitized = processor.get_sanitized_middle_column(start_pandas_index, end_pandas_index)
+            if cancel_event.is_set():
+                raise TaskCancelled()
+            return calculator.sweep(sanitized.values, SWEEP_PERCENTAGES)
+        
+        def done(table):
+            if table['topside_threshold_points'].iloc[0] == 0:
+                messagebox.showerror("錯誤", "中間列沒有有效的數值資料")
+                return
+            self.show_sensitivity_window(table, ng_threshold)
+        
+        self.task_runner.submit(work, done, lambda e: messagebox.showerror("錯誤", f"計算閾值敏感度時發生錯誤: {e}"))
+    
+    def show_sensitivity_window(self, table: pd.DataFrame, ng_threshold: float):
+        """
+        顯示閾值敏感度曲線：TopSide/BottomSide最大值隨閾值百分比的變化
+        
+        Args:
+            table: BlueEdgeCalculator.sweep()的結果
+            ng_threshold: NG判斷閾值
+        """
+        sensitivity_window = tk.Toplevel(self.root)
+        sensitivity_window.title("閾值敏感度曲線")
+        sensitivity_window.geometry("1000x600")
+        sensitivity_window.transient(self.root)
+        
+        fig = Figure(figsize=(10, 5), dpi=100)
+        ax = fig.add_subplot(111)
+        
+        x_values = table['percentage'].to_numpy() * 100
+        ax.plot(x_values, table['topside_max_value'], 'b-o', markersize=3, label='TopSide')
+        ax.plot(x_values, table['bottomside_max_value'], 'r-s', markersize=3, label='BottomSide')
+        
+        ng_label = self.get_chart_text(f'NG閾值: {ng_threshold}', f'NG Threshold: {ng_threshold}')
+        ax.axhline(y=ng_threshold, color='orange', linestyle='--', alpha=0.8, label=ng_label)
+        
+        # 標示目前設定的閾值百分比
+        for var, color, name in [(self.topside_threshold_var, 'b', 'TopSide'),
+                                 (self.bottomside_threshold_var, 'r', 'BottomSide')]:
+            try:
+                current = float(var.get())
+            except ValueError:
+                continue
+            ax.axvline(x=current, color=color, linestyle=':', alpha=0.6,
+                       label=self.get_chart_text(f'目前{name} {current:g}%', f'Current {name} {current:g}%'))
+        
+        ax.set_xlabel(self.get_chart_text('閾值百分比 (%)', 'Threshold Percentage (%)'))
+        ax.set_ylabel(self.get_chart_text('Blue Edge Index 最大值', 'Blue Edge Index Max'))
+        ax.set_title(self.get_chart_text('閾值敏感度', 'Threshold Sensitivity'))
+        ax.grid(True, alpha=0.3)
+        ax.legend()
+        fig.tight_layout()
+        
+        canvas = FigureCanvasTkAgg(fig, sensitivity_window)
+        canvas.draw()
+        toolbar = NavigationToolbar2Tk(canvas, sensitivity_window, pack_toolbar=False)
+        toolbar.pack(side=tk.BOTTOM, fill=tk.X)
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
     
     def show_middle_column_chart(self):
         """顯示中間列數據曲線圖"""
-        if self.excel_processor.data is None:
+        if not self.excel_processor.has_data:
             messagebox.showwarning("警告", "請先選擇檔案")
             return
         
@@ -735,16 +960,14 @@ NG判斷閾值: {ng_threshold}
                 end_excel_row = int(self.end_row_var.get())
                 end_pandas_index = end_excel_row
             
-            # 取得矩陣資料
-            matrix_data = self.excel_processor.get_matrix_data(start_row=start_pandas_index, end_row=end_pandas_index)
+            # 取得中間列視圖（不複製數據）
+            middle_column_data = self.excel_processor.get_middle_column_view(start_row=start_pandas_index, end_row=end_pandas_index)
             
-            if matrix_data.size == 0:
+            # 視圖中的文字儲存格為NaN，沒有任何數值時無法計算統計值
+            if middle_column_data.size == 0 or np.isnan(middle_column_data).all():
                 messagebox.showerror("錯誤", "無法取得有效資料")
                 return
             
-            # 取得中間列資料
-            middle_column_data = self.excel_processor.get_middle_column_data(matrix_data)
-            
             # 建立曲線圖視窗
             self.show_chart_window(middle_column_data, start_excel_row, end_pandas_index)
             
@@ -761,10 +984,8 @@ NG判斷閾值: {ng_threshold}
         chart_window.transient(self.root)
         chart_window.grab_set()
         
-        # 計算中間列索引（避免重複計算）
-        start_pandas_index = start_excel_row - 1
-        matrix_data = self.excel_processor.get_matrix_data(start_pandas_index, end_pandas_index)
-        middle_col_index = matrix_data.shape[1] // 2 if matrix_data.size > 0 else 0
+        # 中間列在原始檔案中的欄位索引
+        middle_col_index = self.excel_processor.get_middle_column_index() or 0
         
         # 建立筆記本控件（分頁）
         notebook = ttk.Notebook(chart_window)
@@ -779,12 +1000,28 @@ NG判斷閾值: {ng_threshold}
         ax1 = fig1.add_subplot(111)
         
         # 準備數據 - 重新定義X軸從1開始
-        x_values = list(range(1, len(middle_column_data) + 1))  # 從1開始的連續數值
+        x_values = np.arange(1, len(middle_column_data) + 1)  # 從1開始的連續數值
         y_values = middle_column_data
         excel_row_mapping = list(range(start_excel_row, start_excel_row + len(middle_column_data)))  # 保存Excel行號對應
         
-        # 繪製曲線
-        ax1.plot(x_values, y_values, 'b-', linewidth=1.5, marker='o', markersize=2)
+        # 取得閾值設定
+        topside_threshold = float(self.topside_threshold_var.get()) / 100.0
+        bottomside_threshold = float(self.bottomside_threshold_var.get()) / 100.0
+        
+        # 計算閾值位置
+        total_points = len(middle_column_data)
+        topside_points = int(total_points * topside_threshold)
+        bottomside_points = int(total_points * bottomside_threshold)
+        
+        if topside_points == 0:
+            topside_points = 1
+        if bottomside_points == 0:
+            bottomside_points = 1
+        
+        # 繪製曲線（大量數據點時依可見範圍抽樣，TopSide/BottomSide區域完整繪製）
+        DecimatedLine(ax1, x_values, y_values,
+                      full_resolution=[(0, topside_points), (total_points - bottomside_points, total_points)],
+                      color='b', linestyle='-', linewidth=1.5, markersize=2)
         ax1.set_xlabel(self.get_chart_text('數據序號', 'Data Index'))
         ax1.set_ylabel(self.get_chart_text('數值', 'Value'))
         
@@ -793,10 +1030,10 @@ NG判斷閾值: {ng_threshold}
         ax1.set_title(self.get_chart_text(title_zh, title_en))
         ax1.grid(True, alpha=0.3)
         
-        # 添加統計信息
-        mean_val = float(middle_column_data.mean())
-        max_val = float(middle_column_data.max())
-        min_val = float(middle_column_data.min())
+        # 添加統計信息（忽略非數值儲存格的NaN）
+        mean_val = float(np.nanmean(middle_column_data))
+        max_val = float(np.nanmax(middle_column_data))
+        min_val = float(np.nanmin(middle_column_data))
         
         mean_label = self.get_chart_text(f'平均值: {mean_val:.2f}', f'Mean: {mean_val:.2f}')
         max_label = self.get_chart_text(f'最大值: {max_val:.2f}', f'Max: {max_val:.2f}')
@@ -806,20 +1043,6 @@ NG判斷閾值: {ng_threshold}
         ax1.axhline(y=max_val, color='g', linestyle='--', alpha=0.7, label=max_label)
         ax1.axhline(y=min_val, color='orange', linestyle='--', alpha=0.7, label=min_label)
         
-        # 取得閾值設定
-        topside_threshold = float(self.topside_threshold_var.get()) / 100.0
-        bottomside_threshold = float(self.bottomside_threshold_var.get()) / 100.0
-        
-        # 計算閾值位置
-        total_points = len(middle_column_data)
-        topside_points = int(total_points * topside_threshold)
-        bottomside_points = int(total_points * bottomside_threshold)
-        
-        if topside_points == 0:
-            topside_points = 1
-        if bottomside_points == 0:
-            bottomside_points = 1
-        
         # 添加閾值分界線
         topside_position = topside_points + 0.5  # 在閾值後面畫線
         bottomside_position = total_points - bottomside_points + 0.5  # 在閾值前面畫線
@@ -837,9 +1060,11 @@ NG判斷閾值: {ng_threshold}
         
         fig1.tight_layout()
         
-        # 嵌入tkinter
+        # 嵌入tkinter（工具列縮放/平移時曲線會依可見範圍重新抽樣）
         canvas1 = FigureCanvasTkAgg(fig1, full_chart_frame)
         canvas1.draw()
+        toolbar1 = NavigationToolbar2Tk(canvas1, full_chart_frame, pack_toolbar=False)
+        toolbar1.pack(side=tk.BOTTOM, fill=tk.X)
         canvas1.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
         # 第二個分頁：TopSide和BottomSide數據對比
@@ -876,7 +1101,8 @@ NG判斷閾值: {ng_threshold}
         # 上半部分：TopSide
         ax2_top = fig2.add_subplot(211)
         topside_label = self.get_chart_text('TopSide數據', 'TopSide Data')
-        ax2_top.plot(topside_x, topside_data, 'b-', linewidth=2, marker='o', markersize=3, label=topside_label)
+        DecimatedLine(ax2_top, topside_x, topside_data, full_resolution=[(0, len(topside_x))],
+                      color='b', linestyle='-', linewidth=2, marker='o', markersize=3, label=topside_label)
         ax2_top.set_xlabel(self.get_chart_text('數據序號', 'Data Index'))
         ax2_top.set_ylabel(self.get_chart_text('數值', 'Value'))
         
@@ -893,12 +1119,14 @@ NG判斷閾值: {ng_threshold}
         ax2_top.legend()
         
         # 為TopSide添加互動功能
-        self.add_hover_functionality(fig2, ax2_top, topside_x, topside_data, topside_excel_mapping)
+        comparison_blit = BlitManager(fig2)  # 兩個子圖的標註共用同一個背景
+        self.add_hover_functionality(fig2, ax2_top, topside_x, topside_data, topside_excel_mapping, comparison_blit)
         
         # 下半部分：BottomSide
         ax2_bottom = fig2.add_subplot(212)
         bottomside_label = self.get_chart_text('BottomSide數據', 'BottomSide Data')
-        ax2_bottom.plot(bottomside_x, bottomside_data, 'r-', linewidth=2, marker='s', markersize=3, label=bottomside_label)
+        DecimatedLine(ax2_bottom, bottomside_x, bottomside_data, full_resolution=[(0, len(bottomside_x))],
+                      color='r', linestyle='-', linewidth=2, marker='s', markersize=3, label=bottomside_label)
         ax2_bottom.set_xlabel(self.get_chart_text('數據序號', 'Data Index'))
         ax2_bottom.set_ylabel(self.get_chart_text('數值', 'Value'))
         
@@ -915,13 +1143,15 @@ NG判斷閾值: {ng_threshold}
         ax2_bottom.legend()
         
         # 為BottomSide添加互動功能
-        self.add_hover_functionality(fig2, ax2_bottom, bottomside_x, bottomside_data, bottomside_excel_mapping)
+        self.add_hover_functionality(fig2, ax2_bottom, bottomside_x, bottomside_data, bottomside_excel_mapping, comparison_blit)
         
         fig2.tight_layout()
         
         # 嵌入tkinter
         canvas2 = FigureCanvasTkAgg(fig2, comparison_frame)
         canvas2.draw()
+        toolbar2 = NavigationToolbar2Tk(canvas2, comparison_frame, pack_toolbar=False)
+        toolbar2.pack(side=tk.BOTTOM, fill=tk.X)
         canvas2.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
         # 第三個分頁：統計資訊
@@ -933,7 +1163,17 @@ NG判斷閾值: {ng_threshold}
         stats_scrollbar = ttk.Scrollbar(stats_frame, orient=tk.VERTICAL, command=stats_text.yview)
         stats_text.configure(yscrollcommand=stats_scrollbar.set)
         
-        # 計算統計資訊
+        # 計算統計資訊（忽略NaN；TopSide/BottomSide全為非數值時顯示nan）
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            topside_mean, topside_max, topside_min = (
+                float(np.nanmean(topside_data)), float(np.nanmax(topside_data)), float(np.nanmin(topside_data)))
+            bottomside_mean, bottomside_max, bottomside_min = (
+                float(np.nanmean(bottomside_data)), float(np.nanmax(bottomside_data)), float(np.nanmin(bottomside_data)))
+        # 整體趨勢比較第一個與最後一個數值
+        valid_positions = np.flatnonzero(~np.isnan(y_values))
+        first_value, last_value = y_values[valid_positions[0]], y_values[valid_positions[-1]]
+        
         if self.use_chinese:
             stats_info = f"""
 === 中間列數據統計資訊 ===
@@ -946,27 +1186,27 @@ NG判斷閾值: {ng_threshold}
 平均值: {mean_val:.4f}
 最大值: {max_val:.4f}
 最小值: {min_val:.4f}
-標準差: {float(middle_column_data.std()):.4f}
-變異數: {float(middle_column_data.var()):.4f}
+標準差: {float(np.nanstd(middle_column_data)):.4f}
+變異數: {float(np.nanvar(middle_column_data)):.4f}
 
 === TopSide 統計 (前{int(topside_threshold*100)}%) ===
 數據點數: {topside_points}
-平均值: {float(topside_data.mean()):.4f}
-最大值: {float(topside_data.max()):.4f}
-最小值: {float(topside_data.min()):.4f}
+平均值: {topside_mean:.4f}
+最大值: {topside_max:.4f}
+最小值: {topside_min:.4f}
 
 === BottomSide 統計 (後{int(bottomside_threshold*100)}%) ===
 數據點數: {bottomside_points}
-平均值: {float(bottomside_data.mean()):.4f}
-最大值: {float(bottomside_data.max()):.4f}
-最小值: {float(bottomside_data.min()):.4f}
+平均值: {bottomside_mean:.4f}
+最大值: {bottomside_max:.4f}
+最小值: {bottomside_min:.4f}
 
 === 趨勢分析 ===
-整體趨勢: {'上升' if y_values[-1] > y_values[0] else '下降' if y_values[-1] < y_values[0] else '平穩'}
-TopSide vs BottomSide 平均值比較: {float(topside_data.mean()) / float(bottomside_data.mean()):.4f}
+整體趨勢: {'上升' if last_value > first_value else '下降' if last_value < first_value else '平穩'}
+TopSide vs BottomSide 平均值比較: {topside_mean / bottomside_mean:.4f}
 """
         else:
-            trend = 'Rising' if y_values[-1] > y_values[0] else 'Falling' if y_values[-1] < y_values[0] else 'Stable'
+            trend = 'Rising' if last_value > first_value else 'Falling' if last_value < first_value else 'Stable'
             stats_info = f"""
 === Middle Column Data Statistics ===
 
@@ -978,24 +1218,24 @@ Data Column Index: {middle_col_index}
 Mean: {mean_val:.4f}
 Maximum: {max_val:.4f}
 Minimum: {min_val:.4f}
-Standard Deviation: {float(middle_column_data.std()):.4f}
-Variance: {float(middle_column_data.var()):.4f}
+Standard Deviation: {float(np.nanstd(middle_column_data)):.4f}
+Variance: {float(np.nanvar(middle_column_data)):.4f}
 
 === TopSide Statistics (Top {int(topside_threshold*100)}%) ===
 Data Points: {topside_points}
-Mean: {float(topside_data.mean()):.4f}
-Maximum: {float(topside_data.max()):.4f}
-Minimum: {float(topside_data.min()):.4f}
+Mean: {topside_mean:.4f}
+Maximum: {topside_max:.4f}
+Minimum: {topside_min:.4f}
 
 === BottomSide Statistics (Bottom {int(bottomside_threshold*100)}%) ===
 Data Points: {bottomside_points}
-Mean: {float(bottomside_data.mean()):.4f}
-Maximum: {float(bottomside_data.max()):.4f}
-Minimum: {float(bottomside_data.min()):.4f}
+Mean: {bottomside_mean:.4f}
+Maximum: {bottomside_max:.4f}
+Minimum: {bottomside_min:.4f}
 
 === Trend Analysis ===
 Overall Trend: {trend}
-TopSide vs BottomSide Mean Ratio: {float(topside_data.mean()) / float(bottomside_data.mean()):.4f}
+TopSide vs BottomSide Mean Ratio: {topside_mean / bottomside_mean:.4f}
 """
         
         stats_text.insert(tk.END, stats_info)
@@ -1010,80 +1250,101 @@ TopSide vs BottomSide Mean Ratio: {float(topside_data.mean()) / float(bottomside
         
         ttk.Button(button_frame, text="關閉", command=chart_window.destroy).pack(side=tk.RIGHT)
     
-    def add_hover_functionality(self, fig, ax, x_values, y_values, excel_row_mapping):
-        """為圖表添加滑鼠懸停顯示座標功能"""
+    def add_hover_functionality(self, fig, ax, x_values, y_values, excel_row_mapping, blit_manager=None):
+        """
+        為圖表添加滑鼠懸停顯示座標功能
+        
+        以二分搜尋找出螢幕距離最近的數據點，並以blitting只重繪標註。
+        
+        Args:
+            fig: matplotlib圖形
+            ax: 座標軸
+            x_values: X軸數值（遞增）
+            y_values: Y軸數值
+            excel_row_mapping: 各數據點對應的Excel行號
+            blit_manager: 同一圖形共用的BlitManager，預設為None（建立新的）
+        """
+        x_array = np.asarray(x_values)
+        y_array = np.asarray(y_values, dtype=np.float64)
+        if blit_manager is None:
+            blit_manager = BlitManager(fig)
+        
         # 創建文字標註
         annotation = ax.annotate('', xy=(0, 0), xytext=(20, 20), 
                                textcoords="offset points",
                                bbox=dict(boxstyle="round", fc="w", alpha=0.9, edgecolor="gray"),
                                arrowprops=dict(arrowstyle="->", color="gray"))
         annotation.set_visible(False)
+        blit_manager.add_artist(annotation)
+        shown_index = [None]  # 目前標註的數據點
+        
+        def hide():
+            if annotation.get_visible():
+                annotation.set_visible(False)
+                shown_index[0] = None
+                blit_manager.update()
         
         def on_hover(event):
             if event.inaxes == ax:
-                # 找到最接近滑鼠位置的數據點
-                if len(x_values) > 0 and len(y_values) > 0:
-                    # 計算距離最近的點
-                    distances = [(abs(x - event.xdata), abs(y - event.ydata), i) 
-                               for i, (x, y) in enumerate(zip(x_values, y_values))]
-                    distances.sort(key=lambda x: x[0]**2 + x[1]**2)
-                    
-                    if distances and len(distances) > 0:
-                        closest_idx = distances[0][2]
-                        x_val = x_values[closest_idx]
-                        y_val = y_values[closest_idx]
-                        excel_row = excel_row_mapping[closest_idx]
-                        
-                        # 設定顯示文字
-                        if self.use_chinese:
-                            text = f'數據序號: {x_val}\n數值: {y_val:.4f}\nX軸座標: {x_val}\n(Excel行號: {excel_row})'
-                        else:
-                            text = f'Data Index: {x_val}\nValue: {y_val:.4f}\nX-axis: {x_val}\n(Excel Row: {excel_row})'
-                        
-                        # 智能定位：根據數據點位置調整資訊框位置
-                        x_range = ax.get_xlim()
-                        y_range = ax.get_ylim()
-                        
-                        # 計算數據點在圖表中的相對位置
-                        x_ratio = (x_val - x_range[0]) / (x_range[1] - x_range[0])
-                        y_ratio = (y_val - y_range[0]) / (y_range[1] - y_range[0])
-                        
-                        # 智能選擇資訊框位置
-                        if x_ratio > 0.7:  # 右側
-                            if y_ratio > 0.7:  # 右上角
-                                offset_x, offset_y = -120, -80
-                            elif y_ratio < 0.3:  # 右下角
-                                offset_x, offset_y = -120, 30
-                            else:  # 右側中間
-                                offset_x, offset_y = -120, -20
-                        elif x_ratio < 0.3:  # 左側
-                            if y_ratio > 0.7:  # 左上角
-                                offset_x, offset_y = 20, -80
-                            elif y_ratio < 0.3:  # 左下角
-                                offset_x, offset_y = 20, 30
-                            else:  # 左側中間
-                                offset_x, offset_y = 20, -20
-                        else:  # 中間
-                            if y_ratio > 0.7:  # 上方
-                                offset_x, offset_y = 20, -80
-                            elif y_ratio < 0.3:  # 下方
-                                offset_x, offset_y = 20, 30
-                            else:  # 中央
-                                offset_x, offset_y = 20, 20
-                        
-                        # 更新標註位置和文字
-                        annotation.xy = (x_val, y_val)
-                        annotation.xytext = (offset_x, offset_y)
-                        annotation.set_text(text)
-                        annotation.set_visible(True)
-                        fig.canvas.draw_idle()
+                x_range = ax.get_xlim()
+                y_range = ax.get_ylim()
+                
+                # 找到螢幕距離最接近滑鼠位置的數據點（每個數據單位的像素數作為權重）
+                x_scale = ax.bbox.width / abs(x_range[1] - x_range[0])
+                y_scale = ax.bbox.height / abs(y_range[1] - y_range[0])
+                closest_idx = nearest_point_index(x_array, y_array, event.xdata, event.ydata, x_scale, y_scale)
+                if closest_idx < 0 or closest_idx == shown_index[0]:
+                    return
+                
+                shown_index[0] = closest_idx
+                x_val = x_array[closest_idx]
+                y_val = y_array[closest_idx]
+                excel_row = excel_row_mapping[closest_idx]
+                
+                # 設定顯示文字
+                if self.use_chinese:
+                    text = f'數據序號: {x_val}\n數值: {y_val:.4f}\nX軸座標: {x_val}\n(Excel行號: {excel_row})'
+                else:
+                    text = f'Data Index: {x_val}\nValue: {y_val:.4f}\nX-axis: {x_val}\n(Excel Row: {excel_row})'
+                
+                # 計算數據點在圖表中的相對位置
+                x_ratio = (x_val - x_range[0]) / (x_range[1] - x_range[0])
+                y_ratio = (y_val - y_range[0]) / (y_range[1] - y_range[0])
+                
+                # 智能選擇資訊框位置
+                if x_ratio > 0.7:  # 右側
+                    if y_ratio > 0.7:  # 右上角
+                        offset_x, offset_y = -120, -80
+                    elif y_ratio < 0.3:  # 右下角
+                        offset_x, offset_y = -120, 30
+                    else:  # 右側中間
+                        offset_x, offset_y = -120, -20
+                elif x_ratio < 0.3:  # 左側
+                    if y_ratio > 0.7:  # 左上角
+                        offset_x, offset_y = 20, -80
+                    elif y_ratio < 0.3:  # 左下角
+                        offset_x, offset_y = 20, 30
+                    else:  # 左側中間
+                        offset_x, offset_y = 20, -20
+                else:  # 中間
+                    if y_ratio > 0.7:  # 上方
+                        offset_x, offset_y = 20, -80
+                    elif y_ratio < 0.3:  # 下方
+                        offset_x, offset_y = 20, 30
+                    else:  # 中央
+                        offset_x, offset_y = 20, 20
+                
+                # 更新標註位置和文字（只重繪標註）
+                annotation.xy = (x_val, y_val)
+                annotation.xytext = (offset_x, offset_y)
+                annotation.set_text(text)
+                annotation.set_visible(True)
+                blit_manager.update()
             else:
-                annotation.set_visible(False)
-                fig.canvas.draw_idle()
+                hide()
         
         def on_leave(event):
-            annotation.set_visible(False)
-            fig.canvas.draw_idle()
+            hide()
         
         # 綁定事件
         fig.canvas.mpl_connect('motion_notify_event', on_hover)
@@ -1102,6 +1363,7 @@ TopSide vs BottomSide Mean Ratio: {float(topside_data.mean()) / float(bottomside
     def clear_result(self):
         """清除結果"""
         self.result_text_widget.delete(1.0, tk.END)
+        self.last_calculation = None
 
 
 def run_application():
@@ -0,0 +1,298 @@
+"""
+虛擬化表格模組
+只建立可見範圍的Treeview列，捲動時才從底層陣列取出並格式化儲存格，
+數千行、數百列的工作表也能即時捲動
+"""
+
+import tkinter as tk
+from tkinter import ttk
+import numpy as np
+import pandas as pd
+from typing import List, Optional, Sequence, Tuple, Union
+
+from ..core.compact_sheet import CompactSheet
+
+
+class Viewport:
+    """
+    一維捲動視窗：總數total個項目中，從offset開始顯示size個
+    """
+    
+    def __init__(self, total: int, size: int = 1):
+        """
+        Args:
+            total: 項目總數
+            size: 可見項目數
+        """
+        self.total = max(int(total), 0)
+        self.size = max(int(size), 1)
+        self.offset = 0
+    
+    @property
+    def max_offset(self) -> int:
+        """最大的開始位置（最後一頁完整顯示）"""
+        return max(self.total - self.size, 0)
+    
+    def set_offset(self, offset: int) -> bool:
+        """
+        設定開始位置（自動限制在有效範圍內）
+        
+        Returns:
+            bool: 開始位置是否改變
+        """
+        offset = min(max(int(offset), 0), self.max_offset)
+        changed = offset != self.offset
+        self.offset = offset
+        return changed
+    
+    def set_size(self, size: int) -> bool:
+        """設定可見項目數，回傳開始位置或大小是否改變"""
+        size = max(int(size), 1)
+        changed = size != self.size
+        self.size = size
+        return self.set_offset(self.offset) or changed
+    
+    def scroll(self, amount: int, what: str = 'units') -> bool:
+        """依項目數（units）或頁數（pages）捲動"""
+        step = amount * max(self.size - 1, 1) if what == 'pages' else amount
+        return self.set_offset(self.offset + step)
+    
+    def moveto(self, fraction: float) -> bool:
+        """捲動到總長度的指定比例（捲軸拖曳）"""
+        return self.set_offset(round(float(fraction) * self.total))
+    
+    def show(self, index: int) -> bool:
+        """捲動使index可見，不在可見範圍內時置於上方三分之一處"""
+        start, stop = self.range()
+        if start <= index < stop:
+            return False
+        return self.set_offset(index - self.size // 3)
+    
+    def range(self) -> Tuple[int, int]:
+        """目前可見的範圍[開始, 結束)"""
+        return self.offset, min(self.offset + self.size, self.total)
+    
+    def fractions(self) -> Tuple[float, float]:
+        """捲軸的(開始比例, 結束比例)"""
+        if self.total == 0:
+            return 0.0, 1.0
+        start, stop = self.range()
+        return start / self.total, stop / self.total
+
+
+class GridSource:
+    """
+    表格資料來源，只在需要時格式化指定範圍的儲存格
+    """
+    
+    def __init__(self, values: Union[CompactSheet, pd.DataFrame, np.ndarray], first_row_number: int = 1,
+                 column_labels: Optional[Sequence[str]] = None, empty_text: str = ''):
+        """
+        Args:
+            values: CompactSheet、DataFrame或一維/二維陣列（不會被複製）
+            first_row_number: 第一行顯示的行號
+            column_labels: 欄位標題，預設為None（工作表欄名或欄位序號）
+            empty_text: 空值顯示的文字
+        """
+        if isinstance(values, np.ndarray) and values.ndim == 1:
+            values = values.reshape(-1, 1)
+        self.values = values
+        self.first_row_number = first_row_number
+        self.empty_text = empty_text
+        
+        if column_labels is not None:
+            self.column_labels = [str(label) for label in column_labels]
+        elif isinstance(values, (CompactSheet, pd.DataFrame)):
+            self.column_labels = [str(col) for col in values.columns]
+        else:
+            self.column_labels = [str(col) for col in range(values.shape[1])]
+    
+    @property
+    def row_count(self) -> int:
+        return self.values.shape[0]
+    
+    @property
+    def column_count(self) -> int:
+        return self.values.shape[1]
+    
+    def row_label(self, row: int) -> str:
+        """行號文字"""
+        return str(self.first_row_number + row)
+    
+    def format_block(self, row_start: int, row_stop: int, col_start: int, col_stop: int) -> List[List[str]]:
+        """
+        取出並格式化[row_start, row_stop) x [col_start, col_stop)範圍的儲存格
+        
+        Returns:
+            List[List[str]]: 每行的儲存格文字
+        """
+        if isinstance(self.values, CompactSheet):
+            block = self.values.cell_block(row_start, row_stop, col_start, col_stop)
+        elif isinstance(self.values, pd.DataFrame):
+            block = self.values.iloc[row_start:row_stop, col_start:col_stop].to_numpy(dtype=object)
+        else:
+            block = self.values[row_start:row_stop, col_start:col_stop]
+        
+        empty = self.empty_text
+        return [[empty if pd.isna(val) else str(val) for val in row] for row in block]
+
+
+class VirtualGrid(ttk.Frame):
+    """
+    虛擬化的表格元件
+    
+    Treeview只保留填滿可見區域所需的列，捲動時重新填入文字；
+    欄位同樣只建立可見的數量，水平捲動時更換標題與內容。
+    """
+    
+    def __init__(self, master, source: GridSource, row_heading: str = '行號',
+                 row_heading_width: int = 80, column_width: int = 100):
+        """
+        Args:
+            master: 父元件
+            source: 表格資料來源
+            row_heading: 行號欄標題
+            row_heading_width: 行號欄寬度
+            column_width: 每欄寬度
+        """
+        super().__init__(master)
+        self.source = source
+        self.row_heading_width = row_heading_width
+        self.column_width = column_width
+        self.rows = Viewport(source.row_count)
+        self.columns = Viewport(source.column_count)
+        self.highlight_row = None
+        self._items = []
+        self._refresh_pending = False
+        
+        self.tree = ttk.Treeview(self, show='tree headings', selectmode='none')
+        self.tree.heading('#0', text=row_heading)
+        self.tree.column('#0', width=row_heading_width, minwidth=row_heading_width, stretch=False)
+        self.tree.tag_configure('highlight', background='#cce5ff')
+        
+        self.v_scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_yscroll)
+        self.h_scrollbar = ttk.Scrollbar(self, orient=tk.HORIZONTAL, command=self._on_xscroll)
+        
+        self.tree.grid(row=0, column=0, sticky='nsew')
+        self.v_scrollbar.grid(row=0, column=1, sticky='ns')
+        self.h_scrollbar.grid(row=1, column=0, sticky='ew')
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        
+        self.tree.bind('<Configure>', self._on_configure)
+        self.tree.bind('<MouseWheel>', self._on_mousewheel)
+        self.tree.bind('<Shift-MouseWheel>', self._on_shift_mousewheel)
+        self.tree.bind('<Button-4>', lambda event: self._scroll_rows(-3))
+        self.tree.bind('<Button-5>', lambda event: self._scroll_rows(3))
+        for key, amount, what in [('<Up>', -1, 'units'), ('<Down>', 1, 'units'),
+                                  ('<Prior>', -1, 'pages'), ('<Next>', 1, 'pages')]:
+            self.tree.bind(key, lambda event, amount=amount, what=what: self._scroll_rows(amount, what))
+        self.tree.bind('<Home>', lambda event: self.scroll_to_row(0, highlight=False) or 'break')
+        self.tree.bind('<End>', lambda event: self.scroll_to_row(self.rows.total - 1, highlight=False) or 'break')
+        
+        self._set_column_count(1)
+        self.refresh()
+    
+    def scroll_to_row(self, row: int, highlight: bool = True):
+        """
+        捲動到指定行（資料來源中的索引）
+        
+        Args:
+            row: 行索引
+            highlight: 是否以底色標示該行
+        """
+        if highlight:
+            self.highlight_row = row
+        self.rows.show(row)
+        self.refresh()
+    
+    def _scroll_rows(self, amount: int, what: str = 'units'):
+        if self.rows.scroll(amount, what):
+            self.refresh()
+        return 'break'
+    
+    def _on_mousewheel(self, event):
+        # Windows的delta為120的倍數，macOS為較小的整數
+        step = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self._scroll_rows(-3 * step)
+    
+    def _on_shift_mousewheel(self, event):
+        step = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        if self.columns.scroll(-step):
+            self.refresh()
+        return 'break'
+    
+    def _on_yscroll(self, command, amount, what='units'):
+        changed = self.rows.moveto(amount) if command == 'moveto' else self.rows.scroll(int(amount), what)
+        if changed:
+            self.refresh()
+    
+    def _on_xscroll(self, command, amount, what='units'):
+        changed = self.columns.moveto(amount) if command == 'moveto' else self.columns.scroll(int(amount), what)
+        if changed:
+            self.refresh()
+    
+    def _on_configure(self, event):
+        # 視窗大小改變時重新計算可見欄數與行數
+        width = max(event.width - self.row_heading_width, self.column_width)
+        self._set_column_count(min(max(width // self.column_width, 1), max(self.source.column_count, 1)))
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.after_idle(self._measure_rows)
+    
+    def _set_column_count(self, count: int):
+        if count == self.columns.size and self.tree['columns']:
+            return
+        names = [f'c{i}' for i in range(count)]
+        self.tree.configure(columns=names)
+        for name in names:
+            self.tree.column(name, width=self.column_width, minwidth=60, stretch=True)
+        self.columns.set_size(count)
+        self.refresh()
+    
+    def _measure_rows(self):
+        """依第一列的實際高度計算可填滿的行數"""
+        self._refresh_pending = False
+        if not self._items:
+            self._set_row_count(1)
+        bbox = self.tree.bbox(self._items[0]) if self._items else None
+        if not bbox:
+            return
+        top, row_height = bbox[1], max(bbox[3], 1)
+        self._set_row_count(max((self.tree.winfo_height() - top) // row_height, 1))
+    
+    def _set_row_count(self, count: int):
+        if count == len(self._items):
+            return
+        while len(self._items) < count:
+            self._items.append(self.tree.insert('', 'end', text=''))
+        while len(self._items) > count:
+            self.tree.delete(self._items.pop())
+        self.rows.set_size(count)
+        self.refresh()
+    
+    def refresh(self):
+        """依目前的捲動位置重新填入可見的儲存格"""
+        if not self._items:
+            self._set_row_count(1)
+            return
+        
+        row_start, row_stop = self.rows.range()
+        col_start, col_stop = self.columns.range()
+        
+        names = self.tree['columns']
+        for i, name in enumerate(names):
+            col = col_start + i
+            self.tree.heading(name, text=self.source.column_labels[col] if col < col_stop else '')
+        
+        block = self.source.format_block(row_start, row_stop, col_start, col_stop)
+        for i, item in enumerate(self._items):
+            row = row_start + i
+            if i < len(block):
+                tags = ('highlight',) if row == self.highlight_row else ()
+                self.tree.item(item, text=self.source.row_label(row), values=block[i], tags=tags)
+            else:
+                self.tree.item(item, text='', values=(), tags=())
+        
+        self.v_scrollbar.set(*self.rows.fractions())
+        self.h_scrollbar.set(*self.columns.fractions())
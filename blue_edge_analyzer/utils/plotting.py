@@ -0,0 +1,250 @@
+"""
+繪圖工具
+大量數據點的最小/最大值包絡抽樣，縮放或平移時依可見範圍重新抽樣
+"""
+
+import numpy as np
+from typing import Iterable, Optional, Tuple
+
+
+# 可見數據點少於此數量時才繪製標記
+MARKER_THRESHOLD = 2000
+
+
+def minmax_envelope_indices(y: np.ndarray, start: int, stop: int, n_bins: int) -> np.ndarray:
+    """
+    將[start, stop)範圍分成n_bins個區間，每個區間保留最小值與最大值的索引
+    
+    峰值與谷值都會被保留，抽樣後的曲線外形與原始數據相同。
+    
+    Args:
+        y: 數值陣列（float）
+        start: 開始索引
+        stop: 結束索引（不包含）
+        n_bins: 區間數量（通常為圖表寬度的像素數）
+        
+    Returns:
+        np.ndarray: 依原始順序排列的索引
+    """
+    count = stop - start
+    n_bins = max(int(n_bins), 1)
+    if count <= 2 * n_bins:
+        return np.arange(start, stop)
+    
+    bin_size = count // n_bins
+    body_stop = start + n_bins * bin_size
+    body = y[start:body_stop].reshape(n_bins, bin_size)
+    offsets = start + np.arange(n_bins) * bin_size
+    
+    # NaN不參與比較（全為NaN的區間保留第一個點，繪圖時成為斷點）
+    lows = offsets + np.where(np.isnan(body), np.inf, body).argmin(axis=1)
+    highs = offsets + np.where(np.isnan(body), -np.inf, body).argmax(axis=1)
+    indices = [lows, highs, np.array([start, stop - 1])]
+    
+    if body_stop < stop:
+        tail = y[body_stop:stop]
+        indices.append(body_stop + np.array([
+            np.where(np.isnan(tail), np.inf, tail).argmin(),
+            np.where(np.isnan(tail), -np.inf, tail).argmax()
+        ]))
+    
+    return np.unique(np.concatenate(indices))
+
+
+def decimation_indices(y: np.ndarray, start: int, stop: int, n_bins: int,
+                       full_resolution: Iterable[Tuple[int, int]] = ()) -> np.ndarray:
+    """
+    取得[start, stop)範圍內要繪製的索引，full_resolution範圍內的點全部保留
+    
+    Args:
+        y: 數值陣列（float）
+        start: 開始索引
+        stop: 結束索引（不包含）
+        n_bins: 整個範圍的區間數量
+        full_resolution: 必須完整繪製的索引範圍[(開始, 結束), ...]
+        
+    Returns:
+        np.ndarray: 依原始順序排列的索引
+    """
+    count = max(stop - start, 1)
+    segments = []
+    cursor = start
+    
+    def envelope(lo, hi):
+        # 依區段長度分配區間數量
+        return minmax_envelope_indices(y, lo, hi, max(1, round(n_bins * (hi - lo) / count)))
+    
+    for lo, hi in sorted(full_resolution):
+        lo, hi = max(lo, start), min(hi, stop)
+        if lo >= hi:
+            continue
+        if cursor < lo:
+            segments.append(envelope(cursor, lo))
+        segments.append(np.arange(max(lo, cursor), hi))
+        cursor = max(cursor, hi)
+    
+    if cursor < stop:
+        segments.append(envelope(cursor, stop))
+    
+    if not segments:
+        return np.arange(0)
+    return np.unique(np.concatenate(segments))
+
+
+class DecimatedLine:
+    """
+    依可見範圍抽樣繪製的曲線
+    
+    初次繪製與每次縮放/平移（xlim改變）時，只繪製可見範圍內每個像素的最小值與最大值；
+    可見數據點少於marker_threshold時才繪製標記。x必須遞增。
+    """
+    
+    def __init__(self, ax, x, y, full_resolution: Iterable[Tuple[int, int]] = (),
+                 max_bins: Optional[int] = None, marker_threshold: int = MARKER_THRESHOLD,
+                 marker: str = 'o', **plot_kwargs):
+        """
+        Args:
+            ax: matplotlib座標軸
+            x: X軸數值（遞增）
+            y: Y軸數值
+            full_resolution: 必須完整繪製的索引範圍（例如TopSide/BottomSide閾值區域）
+            max_bins: 區間數量，預設為None（座標軸寬度的像素數）
+            marker_threshold: 可見數據點少於此數量時繪製標記
+            marker: 標記樣式
+            **plot_kwargs: 傳給ax.plot的其他參數
+        """
+        self.ax = ax
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.full_resolution = list(full_resolution)
+        self.max_bins = max_bins
+        self.marker_threshold = marker_threshold
+        self.marker = marker
+        
+        indices, visible_count = self._visible_indices(0, len(self.x))
+        self.line, = ax.plot(self.x[indices], self.y[indices], **plot_kwargs)
+        self._update_marker(visible_count)
+        
+        # CallbackRegistry只以弱參照保存bound method，呼叫端不保留此物件時會被回收而不再重新抽樣；
+        # 以閉包連接，由座標軸持有此物件
+        self._xlim_cid = ax.callbacks.connect('xlim_changed', lambda changed_ax: self._on_xlim_changed(changed_ax))
+    
+    def _bins(self) -> int:
+        if self.max_bins is not None:
+            return self.max_bins
+        return max(int(self.ax.bbox.width), 100)
+    
+    def _visible_indices(self, start: int, stop: int) -> Tuple[np.ndarray, int]:
+        indices = decimation_indices(self.y, start, stop, self._bins(), self.full_resolution)
+        return indices, stop - start
+    
+    def _update_marker(self, visible_count: int):
+        self.line.set_marker(self.marker if visible_count <= self.marker_threshold else 'None')
+    
+    def _on_xlim_changed(self, ax):
+        self.update()
+    
+    def update(self):
+        """依目前的X軸範圍重新抽樣"""
+        x_min, x_max = sorted(self.ax.get_xlim())
+        # 多取範圍外各一點，讓曲線延伸到圖表邊緣
+        start = max(int(np.searchsorted(self.x, x_min, side='left')) - 1, 0)
+        stop = min(int(np.searchsorted(self.x, x_max, side='right')) + 1, len(self.x))
+        
+        indices, visible_count = self._visible_indices(start, stop)
+        self.line.set_data(self.x[indices], self.y[indices])
+        self._update_marker(visible_count)
+
+
+def nearest_point_index(x: np.ndarray, y: np.ndarray, x0: float, y0: float,
+                        x_scale: float = 1.0, y_scale: float = 1.0) -> int:
+    """
+    以二分搜尋找出距離(x0, y0)最近的數據點
+    
+    距離以 (dx * x_scale)² + (dy * y_scale)² 計算；傳入每個數據單位的像素數時即為螢幕距離。
+    先以searchsorted取得x0兩側的點作為初始最近距離，只有x方向距離小於此距離的點才可能更近，
+    因此只需檢查一小段範圍，不必對所有點排序。距離相同時回傳索引較小的點。
+    
+    Args:
+        x: 遞增的X軸數值
+        y: Y軸數值（NaN不會被選取）
+        x0: 查詢點X座標
+        y0: 查詢點Y座標
+        x_scale: X方向的距離權重
+        y_scale: Y方向的距離權重
+        
+    Returns:
+        int: 最近點的索引，沒有有效點時為-1
+    """
+    n = len(x)
+    if n == 0:
+        return -1
+    
+    def squared_distances(lo, hi):
+        distances = ((x[lo:hi] - x0) * x_scale) ** 2 + ((y[lo:hi] - y0) * y_scale) ** 2
+        return np.where(np.isnan(distances), np.inf, distances)
+    
+    pos = int(np.searchsorted(x, x0))
+    lo, hi = max(pos - 1, 0), min(pos + 1, n)
+    best = squared_distances(lo, hi).min()
+    
+    if np.isfinite(best) and x_scale > 0:
+        reach = np.sqrt(best) / x_scale
+        lo = int(np.searchsorted(x, x0 - reach, side='left'))
+        hi = int(np.searchsorted(x, x0 + reach, side='right'))
+    else:
+        lo, hi = 0, n
+    
+    distances = squared_distances(lo, hi)
+    offset = int(distances.argmin())
+    if not np.isfinite(distances[offset]):
+        return -1
+    return lo + offset
+
+
+class BlitManager:
+    """
+    以blitting只重繪動態元件（例如滑鼠懸停的標註）
+    
+    動態元件設為animated，不參與一般繪製；每次完整繪製後保存背景，
+    之後只需還原背景並重繪動態元件，不必重繪整個圖表。
+    同一個圖形的所有動態元件應共用一個BlitManager，否則彼此會被對方的背景覆蓋。
+    """
+    
+    def __init__(self, fig):
+        """
+        Args:
+            fig: matplotlib圖形（嵌入FigureCanvasTkAgg前後皆可建立）
+        """
+        self.fig = fig
+        self.artists = []
+        self._background = None
+        # 與DecimatedLine相同，以閉包連接，由圖形持有此物件
+        fig.canvas.mpl_connect('draw_event', lambda event: self._on_draw(event))
+    
+    def add_artist(self, artist):
+        """加入動態元件"""
+        artist.set_animated(True)
+        self.artists.append(artist)
+    
+    def _on_draw(self, event):
+        canvas = self.fig.canvas
+        if getattr(canvas, 'supports_blit', False):
+            self._background = canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_animated()
+    
+    def _draw_animated(self):
+        for artist in self.artists:
+            if artist.get_visible():
+                self.fig.draw_artist(artist)
+    
+    def update(self):
+        """重繪動態元件"""
+        canvas = self.fig.canvas
+        if self._background is None:
+            # 尚未完整繪製過或畫布不支援blitting
+            canvas.draw_idle()
+            return
+        canvas.restore_region(self._background)
+        self._draw_animated()
+        canvas.blit(self.fig.bbox)
@@ -0,0 +1,187 @@
+"""
+數值資料清理工具
+以向量化方式將欄位資料轉換為float並移除無效值
+"""
+
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+
+
+@dataclass
+class SanitizedData:
+    """數值清理結果"""
+    
+    values: np.ndarray  # 清理後的float64陣列（已移除NaN）
+    dropped_count: int  # 被移除的儲存格數量
+    dropped_positions: np.ndarray  # 被移除儲存格在原始陣列中的位置
+    non_numeric_positions: np.ndarray  # 其中屬於非數值內容（如文字）的位置
+    
+    @property
+    def total_count(self) -> int:
+        """原始儲存格數量"""
+        return len(self.values) + self.dropped_count
+
+
+# float()接受、但to_numeric視為無效的NaN字串（去除空白、不分大小寫）
+NAN_STRINGS = ('nan', '+nan', '-nan')
+
+
+def _recheck_rejected(series: pd.Series, float_data: np.ndarray, rejected: np.ndarray):
+    """
+    以與float()相同的規則重新判斷被to_numeric拒絕的儲存格（就地更新float_data與rejected）
+    
+    先以向量化的str.strip()處理空白並再轉換一次，辨識'nan'等字串；只有含底線（'1_000'）
+    或非ASCII字元（全形數字等）的少數字串才逐個以float()確認，一般文字不需要逐個處理。
+    
+    Args:
+        series: 原始數據（object dtype）
+        float_data: to_numeric的轉換結果
+        rejected: 非空值但轉換失敗的布林遮罩
+    """
+    positions = np.flatnonzero(rejected)
+    candidates = series.iloc[positions]
+    # 只有字串需要再確認，其他型態（日期時間等）仍視為非數值
+    if pd.api.types.infer_dtype(candidates, skipna=False) != 'string':
+        is_string = np.fromiter((isinstance(value, str) for value in candidates), dtype=bool,
+                                count=len(candidates))
+        positions, candidates = positions[is_string], candidates[is_string]
+    if len(candidates) == 0:
+        return
+    
+    # 去除空白後內容改變的字串（例如全形空白）再轉換一次
+    stripped = candidates.str.strip()
+    changed = (stripped != candidates).to_numpy()
+    second = np.full(len(stripped), np.nan)
+    if changed.any():
+        second[changed] = pd.to_numeric(stripped[changed], errors='coerce').to_numpy(dtype=np.float64,
+                                                                                   na_value=np.nan)
+    is_nan_string = stripped.str.lower().isin(NAN_STRINGS).to_numpy()
+    accepted = ~np.isnan(second) | is_nan_string
+    float_data[positions[accepted]] = second[accepted]
+    rejected[positions[accepted]] = False
+    
+    remaining = ~accepted & (~stripped.str.isascii() | stripped.str.contains('_', regex=False)).to_numpy()
+    for position in positions[remaining]:
+        try:
+            float_data[position] = float(series.iat[position])
+        except (ValueError, TypeError):
+            continue
+        rejected[position] = False
+
+
+def _coerce_to_float(data: np.ndarray) -> tuple:
+    """
+    將任意dtype的一維陣列轉換為float64
+    
+    Args:
+        data: 輸入的數據陣列
+        
+    Returns:
+        tuple: (float64陣列, 非數值內容的布林遮罩)
+    """
+    if data.dtype.kind in 'biuf':
+        return data.astype(np.float64, copy=False), np.zeros(len(data), dtype=bool)
+    
+    series = pd.Series(data, dtype=object, copy=False)
+    float_data = pd.to_numeric(series, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    rejected = np.isnan(float_data) & series.notna().to_numpy()
+    
+    if rejected.any():
+        float_data = float_data.copy()
+        _recheck_rejected(series, float_data, rejected)
+    
+    return float_data, rejected
+
+
+def coerce_numeric_column(data) -> tuple:
+    """
+    將一欄數據轉換為float64，同時判斷每個儲存格是否為非空值、以及是否可轉換為數字
+    （與逐個 float() 的結果相同）
+    
+    Args:
+        data: 一維數據（numpy陣列或pandas Series）
+        
+    Returns:
+        tuple: (float64陣列（非數值內容為NaN）, 可轉換為數字的布林遮罩, 非空值的布林遮罩)
+    """
+    series = data if isinstance(data, pd.Series) else pd.Series(np.asarray(data), copy=False)
+    non_null = series.notna().to_numpy()
+    
+    if series.dtype.kind in 'biuf':
+        return series.to_numpy(dtype=np.float64, na_value=np.nan), non_null.copy(), non_null
+    if series.dtype.kind in 'mM':
+        # 日期時間無法以float()轉換
+        return np.full(len(series), np.nan), np.zeros(len(series), dtype=bool), non_null
+    
+    float_data, non_numeric = _coerce_to_float(series.to_numpy(dtype=object))
+    return float_data, non_null & ~non_numeric, non_null
+
+
+def numeric_cell_mask(data) -> tuple:
+    """
+    判斷每個儲存格是否為非空值、以及是否可轉換為數字（與逐個 float() 的結果相同）
+    
+    Args:
+        data: 一維數據（numpy陣列或pandas Series）
+        
+    Returns:
+        tuple: (可轉換為數字的布林遮罩, 非空值的布林遮罩)
+    """
+    _, numeric, non_null = coerce_numeric_column(data)
+    return numeric, non_null
+
+
+def sanitize_numeric(data) -> SanitizedData:
+    """
+    將數據轉換為float並移除NaN與非數值內容
+    
+    Args:
+        data: 輸入的數據（numpy陣列、pandas Series或list）
+        
+    Returns:
+        SanitizedData: 清理後的數值及被移除儲存格的數量與位置
+    """
+    data = np.asarray(data)
+    if data.ndim != 1:
+        data = data.ravel()
+    
+    float_data, non_numeric = _coerce_to_float(data)
+    invalid = np.isnan(float_data)
+    
+    return SanitizedData(
+        values=float_data[~invalid],
+        dropped_count=int(invalid.sum()),
+        dropped_positions=np.flatnonzero(invalid),
+        non_numeric_positions=np.flatnonzero(non_numeric)
+    )
+
+
+def coerce_numeric_matrix(matrix) -> np.ndarray:
+    """
+    將二維矩陣逐欄向量化轉換為float64，非數值內容轉為NaN
+    
+    Args:
+        matrix: 輸入的二維矩陣（可為object dtype）或DataFrame
+        
+    Returns:
+        np.ndarray: float64矩陣（輸入為DataFrame時為欄優先順序，每欄的切片都是連續記憶體）
+    """
+    if isinstance(matrix, pd.DataFrame):
+        # 逐欄轉換，混合型態的DataFrame不必先整個複製成object陣列
+        result = np.empty(matrix.shape, dtype=np.float64, order='F')
+        for col in range(matrix.shape[1]):
+            result[:, col] = coerce_numeric_column(matrix.iloc[:, col])[0]
+        return result
+    
+    matrix = np.asarray(matrix)
+    if matrix.ndim != 2:
+        matrix = np.atleast_2d(matrix)
+    
+    if matrix.dtype.kind in 'biuf':
+        return matrix.astype(np.float64, copy=False)
+    
+    result = np.empty(matrix.shape, dtype=np.float64)
+    for col in range(matrix.shape[1]):
+        result[:, col] = _coerce_to_float(matrix[:, col])[0]
+    return result
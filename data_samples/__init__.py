@@ -0,0 +1,3 @@
+"""
+測試數據生成工具套件
+"""
@@ -0,0 +1,277 @@
+"""
+迴歸測試數據集生成器
+以多個行程平行產生大量邊緣衰減面板（不同大小、衰減程度與雜訊程度），
+不開啟任何視窗，並寫出記錄種子與預期Blue Edge Index的manifest，
+可在CI中依manifest重新產生完全相同的數據集
+
+使用方式（於專案根目錄執行）:
+    python -m data_samples.corpus_generator                                  # 依DataGeneratorConfig的參數產生
+    python -m data_samples.corpus_generator --sizes 400 --decays 10 20 -j 4  # 自訂參數
+    python -m data_samples.corpus_generator --rebuild test_corpus/manifest.json  # 依manifest重新產生並驗證
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import List, Optional
+
+import matplotlib
+matplotlib.use('Agg')  # 只儲存圖檔，不開啟視窗
+import numpy as np
+
+from blue_edge_analyzer.core.blue_edge_calculator import BlueEdgeCalculator
+from .data_generator_config import DataGeneratorConfig
+from .test_data_generator import OUTPUT_FORMATS, DisplayTestDataGenerator
+
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+# 預期結果使用的計算參數（與GUI預設值相同）
+EXPECTED_SETTINGS = {'topside_percentage': 0.1, 'bottomside_percentage': 0.1, 'ng_threshold': 10.0}
+
+
+def build_entries(sizes: List[int], decay_percentages: List[float], noise_levels: List[float],
+                  replicates: int, seed: int, file_format: str) -> List[dict]:
+    """
+    展開參數組合，並以SeedSequence為每個面板產生獨立的種子
+    
+    Args:
+        sizes: 矩陣大小（邊長格數）
+        decay_percentages: 衰減百分比
+        noise_levels: 雜訊程度
+        replicates: 每組參數的面板數
+        seed: 基礎隨機種子
+        file_format: OUTPUT_FORMATS中的格式
+        
+    Returns:
+        List[dict]: 每個面板的參數（尚未包含預期結果）
+    """
+    grid = list(itertools.product(sizes, decay_percentages, noise_levels, range(replicates)))
+    children = np.random.SeedSequence(seed).spawn(len(grid))
+    
+    entries = []
+    for index, ((size, decay, noise, replicate), child) in enumerate(zip(grid, children)):
+        entries.append({
+            'file': f'panel_{index:04d}_{size}_decay{decay * 100:g}_noise{noise * 100:g}_r{replicate}.{file_format}',
+            'size': int(size),
+            'decay_percentage': float(decay),
+            'noise_level': float(noise),
+            'replicate': int(replicate),
+            'seed': int(child.generate_state(1)[0]),
+        })
+    return entries
+
+
+def generate_panel_data(entry: dict) -> np.ndarray:
+    """依面板參數產生數據（相同參數與種子產生相同的數據）"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator = DisplayTestDataGenerator(seed=entry['seed'])
+    generator.matrix_size = entry['size']
+    return generator.generate_edge_decay_data(entry['decay_percentage'], DataGeneratorConfig.DECAY_START_POSITION,
+                                              noise_level=entry['noise_level'])
+
+
+def data_digest(data: np.ndarray) -> str:
+    """數據內容的SHA-256（與檔案格式無關）"""
+    return hashlib.sha256(np.ascontiguousarray(data, dtype='<f8').tobytes()).hexdigest()
+
+
+def expected_result(data: np.ndarray) -> dict:
+    """以分析器的計算方式取得中間列的預期Blue Edge Index"""
+    calculator = BlueEdgeCalculator()
+    calculator.set_topside_threshold_percentage(EXPECTED_SETTINGS['topside_percentage'])
+    calculator.set_bottomside_threshold_percentage(EXPECTED_SETTINGS['bottomside_percentage'])
+    calculator.set_ng_threshold(EXPECTED_SETTINGS['ng_threshold'])
+    
+    result = calculator.evaluate(data[:, data.shape[1] // 2])
+    return {
+        'total_data_points': result.total_data_points,
+        'topside_max': result.topside.max_value,
+        'topside_position': result.topside.max_position,
+        'topside_judgment': result.topside.judgment,
+        'bottomside_max': result.bottomside.max_value,
+        'bottomside_position': result.bottomside.max_position,
+        'bottomside_judgment': result.bottomside.judgment,
+    }
+
+
+def write_panel(entry: dict, output_dir: str, plots: bool = False) -> dict:
+    """
+    產生並寫出一個面板（在工作行程中執行）
+    
+    Args:
+        entry: 面板參數
+        output_dir: 輸出目錄
+        plots: 是否同時儲存視覺化圖檔
+        
+    Returns:
+        dict: 加上數據雜湊值與預期結果的面板參數
+    """
+    data = generate_panel_data(entry)
+    path = os.path.join(output_dir, entry['file'])
+    base_path, file_format = os.path.splitext(path)
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator = DisplayTestDataGenerator()
+        generator.matrix_size = entry['size']
+        generator.save_data(data, base_path, output_format=file_format[1:])
+        if plots:
+            generator.create_visualization(data, os.path.basename(base_path), base_path + '.png', show=False)
+    
+    return dict(entry, data_sha256=data_digest(data), expected=expected_result(data))
+
+
+def _run_panels(entries: List[dict], output_dir: str, workers: Optional[int], plots: bool) -> List[dict]:
+    """以多個行程產生面板，結果順序與輸入順序一致"""
+    os.makedirs(output_dir, exist_ok=True)
+    worker = partial(write_panel, output_dir=output_dir, plots=plots)
+    
+    if workers == 1 or len(entries) <= 1:
+        return [worker(entry) for entry in entries]
+    
+    # 面板數量多時每次傳送多個面板的參數，減少行程間通訊
+    chunksize = max(len(entries) // (4 * (workers or os.cpu_count() or 1)), 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(worker, entries, chunksize=chunksize))
+
+
+def generate_corpus(output_dir: str = DataGeneratorConfig.CORPUS_OUTPUT_DIR,
+                    sizes: List[int] = DataGeneratorConfig.CORPUS_SIZES,
+                    decay_percentages: List[float] = DataGeneratorConfig.CORPUS_DECAY_PERCENTAGES,
+                    noise_levels: List[float] = DataGeneratorConfig.CORPUS_NOISE_LEVELS,
+                    replicates: int = DataGeneratorConfig.CORPUS_REPLICATES,
+                    seed: int = DataGeneratorConfig.CORPUS_SEED,
+                    file_format: str = DataGeneratorConfig.CORPUS_FORMAT,
+                    workers: Optional[int] = None, plots: bool = False) -> dict:
+    """
+    平行產生迴歸測試數據集並寫出manifest
+    
+    Args:
+        output_dir: 輸出目錄
+        sizes: 矩陣大小（邊長格數）
+        decay_percentages: 衰減百分比
+        noise_levels: 雜訊程度
+        replicates: 每組參數的面板數
+        seed: 基礎隨機種子
+        file_format: OUTPUT_FORMATS中的格式
+        workers: 行程數，預設為None（CPU核心數）；1表示在目前行程中依序執行
+        plots: 是否同時儲存視覺化圖檔
+        
+    Returns:
+        dict: manifest內容
+    """
+    if file_format not in OUTPUT_FORMATS:
+        raise ValueError(f"不支援的檔案格式: {file_format}")
+    
+    entries = build_entries(sizes, decay_percentages, noise_levels, replicates, seed, file_format)
+    panels = _run_panels(entries, output_dir, workers, plots)
+    
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'seed': seed,
+        'parameters': {
+            'sizes': list(sizes),
+            'decay_percentages': list(decay_percentages),
+            'noise_levels': list(noise_levels),
+            'replicates': replicates,
+            'format': file_format,
+            'decay_start_position': DataGeneratorConfig.DECAY_START_POSITION,
+        },
+        'expected_settings': EXPECTED_SETTINGS,
+        'panels': panels
+    }
+    with open(os.path.join(output_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    
+    return manifest
+
+
+def rebuild_corpus(manifest_path: str, output_dir: Optional[str] = None, workers: Optional[int] = None,
+                   plots: bool = False) -> List[str]:
+    """
+    依manifest重新產生數據集，並驗證數據雜湊值與預期結果
+    
+    Args:
+        manifest_path: manifest檔案路徑
+        output_dir: 輸出目錄，預設為None（manifest所在目錄）
+        workers: 行程數
+        plots: 是否同時儲存視覺化圖檔
+        
+    Returns:
+        List[str]: 與manifest不一致的檔案（全部一致時為空）
+    """
+    with open(manifest_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    
+    if output_dir is None:
+        output_dir = os.path.dirname(os.path.abspath(manifest_path))
+    
+    entries = [{key: panel[key] for key in ('file', 'size', 'decay_percentage', 'noise_level', 'replicate', 'seed')}
+               for panel in manifest['panels']]
+    rebuilt = _run_panels(entries, output_dir, workers, plots)
+    
+    return [panel['file'] for panel, expected in zip(rebuilt, manifest['panels'])
+            if panel['data_sha256'] != expected['data_sha256'] or panel['expected'] != expected['expected']]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """建立命令列參數解析器"""
+    config = DataGeneratorConfig
+    parser = argparse.ArgumentParser(description='Blue Edge 迴歸測試數據集生成器')
+    parser.add_argument('-o', '--output', default=config.CORPUS_OUTPUT_DIR,
+                        help=f'輸出目錄，預設為 {config.CORPUS_OUTPUT_DIR}')
+    parser.add_argument('--sizes', nargs='+', type=int, default=config.CORPUS_SIZES, help='矩陣大小（邊長格數）')
+    parser.add_argument('--decays', nargs='+', type=float, default=[p * 100 for p in config.CORPUS_DECAY_PERCENTAGES],
+                        help='衰減百分比（%%）')
+    parser.add_argument('--noise-levels', nargs='+', type=float, default=[n * 100 for n in config.CORPUS_NOISE_LEVELS],
+                        help='雜訊程度（%%）')
+    parser.add_argument('--replicates', type=int, default=config.CORPUS_REPLICATES, help='每組參數的面板數')
+    parser.add_argument('--seed', type=int, default=config.CORPUS_SEED, help='基礎隨機種子')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default=config.CORPUS_FORMAT, help='檔案格式')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='平行行程數，預設為CPU核心數')
+    parser.add_argument('--plots', action='store_true', help='同時儲存每個面板的視覺化圖檔')
+    parser.add_argument('--rebuild', default=None, metavar='MANIFEST',
+                        help='依manifest重新產生數據集並驗證（忽略其他參數）')
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令列主程式
+    
+    Returns:
+        int: 結束代碼，重新產生的數據與manifest不一致時為1
+    """
+    args = build_parser().parse_args(argv)
+    
+    if args.rebuild:
+        print(f"依manifest重新產生: {args.rebuild}")
+        mismatched = rebuild_corpus(args.rebuild, workers=args.workers, plots=args.plots)
+        if mismatched:
+            print(f"⚠️ {len(mismatched)} 個面板與manifest不一致:")
+            for name in mismatched:
+                print(f"  - {name}")
+            return 1
+        print("✅ 所有面板與manifest一致")
+        return 0
+    
+    print("=== 產生迴歸測試數據集 ===")
+    manifest = generate_corpus(args.output, args.sizes, [d / 100 for d in args.decays],
+                               [n / 100 for n in args.noise_levels], args.replicates, args.seed, args.format,
+                               args.workers, args.plots)
+    print(f"完成: {len(manifest['panels'])} 個面板")
+    print(f"manifest已儲存: {os.path.join(args.output, MANIFEST_NAME)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -30,6 +30,18 @@ class DataGeneratorConfig:
     # 檔案輸出參數
     OUTPUT_DIR = "test_data"        # 輸出目錄
     EXCEL_ENGINE = 'openpyxl'       # Excel引擎
+    OUTPUT_FORMAT = 'xlsx'          # 輸出格式 ('xlsx'、'csv'、'npy'、'parquet' 或 'bep')
+    CSV_FLOAT_FORMAT = '%.17g'      # CSV數值格式 (np.savetxt，17位有效數字可無損還原)
+    RAW_PANEL_DTYPE = 'float64'     # 原始面板數值型態 ('float64'、'float32' 或 'uint16'，只有float64無損)
+    
+    # 迴歸測試數據集參數（corpus_generator.py）
+    CORPUS_OUTPUT_DIR = "test_corpus"                   # 輸出目錄
+    CORPUS_SIZES = [400, 1000, 2000]                    # 矩陣大小 (邊長格數)
+    CORPUS_DECAY_PERCENTAGES = [0.0, 0.05, 0.10, 0.15, 0.20, 0.30]  # 衰減百分比
+    CORPUS_NOISE_LEVELS = [0.005, 0.01, 0.02]           # 雜訊程度
+    CORPUS_REPLICATES = 3                               # 每組參數的面板數（種子不同）
+    CORPUS_SEED = 20240601                              # 基礎隨機種子
+    CORPUS_FORMAT = 'csv'                               # 檔案格式 (同OUTPUT_FORMAT)
     
     @classmethod
     def get_matrix_size(cls) -> int:
@@ -52,6 +64,7 @@ class DataGeneratorConfig:
         print(f"衰減開始位置: {cls.DECAY_START_POSITION}格 ({cls.get_decay_start_distance_mm()}mm)")
         print(f"衰減百分比: {[f'{p*100:.0f}%' for p in cls.DECAY_PERCENTAGES]}")
         print(f"輸出目錄: {cls.OUTPUT_DIR}")
+        print(f"輸出格式: {cls.OUTPUT_FORMAT}")
 
 
 # 預設配置實例
@@ -6,7 +6,7 @@
 1. 生成400x400矩陣數據（對應40mm x 40mm，解析度0.1mm）
 2. 創建不同邊緣衰減程度的測試數據
 3. 生成偽色圖和等高線圖進行視覺化
-4. 輸出Excel檔案供分析使用
+4. 輸出Excel、CSV、NumPy (.npy)、Parquet或原始面板 (.bep) 檔案供分析使用
 """
 
 import numpy as np
@@ -14,27 +14,36 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.colors as colors
 from matplotlib import cm
-import seaborn as sns
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 import os
 from datetime import datetime
 
+from blue_edge_analyzer.core.raw_panel import write_raw_panel
+from .data_generator_config import DataGeneratorConfig
+
+
+# 支援的輸出格式（副檔名）
+OUTPUT_FORMATS = ('xlsx', 'csv', 'npy', 'parquet', 'bep')
+
 
 class DisplayTestDataGenerator:
     """顯示器測試數據生成器"""
     
-    def __init__(self, size_mm: float = 40.0, resolution_mm: float = 0.1):
+    def __init__(self, size_mm: float = 40.0, resolution_mm: float = 0.1, seed: Optional[int] = None):
         """
         初始化生成器
         
         Args:
             size_mm: 顯示器尺寸 (mm)
             resolution_mm: 解析度 (mm)
+            seed: 隨機種子，相同種子產生相同的數據，預設為None（每次不同）
         """
         self.size_mm = size_mm
         self.resolution_mm = resolution_mm
         self.matrix_size = int(size_mm / resolution_mm)  # 400x400
         self.center_value = 30000  # 中心亮度值
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
         
         print(f"初始化測試數據生成器:")
         print(f"  - 顯示器尺寸: {size_mm}mm x {size_mm}mm")
@@ -52,31 +61,30 @@ class DisplayTestDataGenerator:
         Returns:
             np.ndarray: 400x400的均勻數據矩陣
         """
-        # 基礎均勻數據
-        base_matrix = np.full((self.matrix_size, self.matrix_size), self.center_value, dtype=float)
-        
-        # 加入輕微的隨機變化，模擬實際測量的微小差異
-        noise = np.random.normal(0, self.center_value * noise_level, (self.matrix_size, self.matrix_size))
+        # 以中心亮度值為平均值的常態分佈，模擬實際測量的微小差異（直接產生，不另外建立基礎矩陣）
+        result = self.rng.normal(self.center_value, self.center_value * noise_level,
+                                 (self.matrix_size, self.matrix_size))
         
         # 確保數值在合理範圍內 (28000-32000)
-        result = base_matrix + noise
-        result = np.clip(result, self.center_value * 0.93, self.center_value * 1.07)
+        np.clip(result, self.center_value * 0.93, self.center_value * 1.07, out=result)
         
         return result
     
-    def generate_edge_decay_data(self, decay_percentage: float, decay_start_position: int = 20) -> np.ndarray:
+    def generate_edge_decay_data(self, decay_percentage: float, decay_start_position: int = 20,
+                                 noise_level: float = 0.01) -> np.ndarray:
         """
         生成邊緣衰減的測試數據
         
         Args:
             decay_percentage: 衰減百分比 (0.1 = 10%)
             decay_start_position: 從邊緣開始衰減的位置 (格數)
+            noise_level: 雜訊程度 (0.01 = 1%)，同時用於中心區域與衰減區域
             
         Returns:
             np.ndarray: 400x400的邊緣衰減數據矩陣
         """
         # 先生成均勻數據作為基礎
-        matrix = self.generate_uniform_data(noise_level=0.01)
+        matrix = self.generate_uniform_data(noise_level=noise_level)
         
         # 計算衰減後的邊緣值
         edge_value = self.center_value * (1 - decay_percentage)
@@ -98,23 +106,20 @@ class DisplayTestDataGenerator:
         
         # 創建衰減遮罩
         decay_mask = min_edge_distance < decay_start_position
+        edge_dist = min_edge_distance[decay_mask]
+        
+        # 在衰減區域內，根據距離邊緣的遠近進行平滑衰減 (cosine函數)
+        # 同一距離的衰減值相同，先計算每個距離的值再依距離取出
+        profile = self.center_value * (1 - decay_percentage * 0.5 * (
+            1 + np.cos(np.pi * np.arange(decay_start_position) / decay_start_position)))
+        current_values = profile[edge_dist]
         
-        # 在衰減區域內，根據距離邊緣的遠近進行平滑衰減
-        for i in range(self.matrix_size):
-            for j in range(self.matrix_size):
-                edge_dist = min_edge_distance[i, j]
-                if edge_dist < decay_start_position:
-                    # 使用平滑的衰減曲線 (cosine函數)
-                    decay_ratio = 0.5 * (1 + np.cos(np.pi * edge_dist / decay_start_position))
-                    current_value = self.center_value * (1 - decay_percentage * decay_ratio)
-                    
-                    # 加入一些隨機雜訊
-                    noise = np.random.normal(0, current_value * 0.01)
-                    matrix[i, j] = current_value + noise
+        # 加入一些隨機雜訊（標準差為各點衰減值的noise_level倍）
+        matrix[decay_mask] = current_values + self.rng.standard_normal(len(current_values)) * (current_values * noise_level)
         
         return matrix
     
-    def create_visualization(self, data: np.ndarray, title: str, save_path: str = None):
+    def create_visualization(self, data: np.ndarray, title: str, save_path: str = None, show: bool = True):
         """
         創建數據視覺化圖表（偽色圖和等高線圖）
         
@@ -122,6 +127,7 @@ class DisplayTestDataGenerator:
             data: 數據矩陣
             title: 圖表標題
             save_path: 儲存路徑
+            show: 是否顯示圖表視窗（無介面環境應設為False，只儲存圖檔）
         """
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
         
@@ -166,7 +172,10 @@ class DisplayTestDataGenerator:
             plt.savefig(save_path, dpi=300, bbox_inches='tight')
             print(f"視覺化圖表已儲存: {save_path}")
         
-        plt.show()
+        if show:
+            plt.show()
+        else:
+            plt.close(fig)
     
     def save_to_excel(self, data: np.ndarray, filename: str, sheet_name: str = 'TestData'):
         """
@@ -181,20 +190,115 @@ class DisplayTestDataGenerator:
         df = pd.DataFrame(data)
         
         # 儲存為Excel
-        with pd.ExcelWriter(filename, engine='openpyxl') as writer:
+        with pd.ExcelWriter(filename, engine=DataGeneratorConfig.EXCEL_ENGINE) as writer:
             df.to_excel(writer, sheet_name=sheet_name, index=False, header=False)
         
         print(f"Excel檔案已儲存: {filename}")
         print(f"  - 工作表: {sheet_name}")
+        self._print_data_summary(data)
+    
+    def save_to_csv(self, data: np.ndarray, filename: str):
+        """
+        將數據儲存為CSV檔案（沒有標題行，以np.savetxt寫出，比逐儲存格寫入Excel快得多）
+        
+        Args:
+            data: 數據矩陣
+            filename: 檔案名稱
+        """
+        np.savetxt(filename, data, delimiter=',', fmt=DataGeneratorConfig.CSV_FLOAT_FORMAT)
+        
+        print(f"CSV檔案已儲存: {filename}")
+        self._print_data_summary(data)
+    
+    def save_to_npy(self, data: np.ndarray, filename: str):
+        """
+        將數據儲存為NumPy .npy檔案（二進位，載入時不需要解析文字）
+        
+        Args:
+            data: 數據矩陣
+            filename: 檔案名稱
+        """
+        np.save(filename, np.ascontiguousarray(data), allow_pickle=False)
+        
+        print(f"NumPy檔案已儲存: {filename}")
+        self._print_data_summary(data)
+    
+    def save_to_parquet(self, data: np.ndarray, filename: str):
+        """
+        將數據儲存為Parquet檔案（需要安裝pyarrow）
+        
+        Args:
+            data: 數據矩陣
+            filename: 檔案名稱
+        """
+        # Parquet的欄位名稱必須是字串
+        df = pd.DataFrame(data, columns=[str(col) for col in range(data.shape[1])])
+        df.to_parquet(filename, index=False)
+        
+        print(f"Parquet檔案已儲存: {filename}")
+        self._print_data_summary(data)
+    
+    def save_to_raw_panel(self, data: np.ndarray, filename: str, dtype: Optional[str] = None):
+        """
+        將數據儲存為原始面板檔案（.bep，模擬亮度量測儀器的二進位輸出）
+        
+        Args:
+            data: 數據矩陣
+            filename: 檔案名稱
+            dtype: 'float64'、'float32'或'uint16'，預設為DataGeneratorConfig.RAW_PANEL_DTYPE
+        """
+        dtype = dtype or DataGeneratorConfig.RAW_PANEL_DTYPE
+        write_raw_panel(filename, data, dtype)
+        
+        print(f"原始面板檔案已儲存: {filename}")
+        print(f"  - 數值型態: {dtype}")
+        self._print_data_summary(data)
+    
+    def save_data(self, data: np.ndarray, filename: str, sheet_name: str = 'TestData',
+                  output_format: Optional[str] = None) -> str:
+        """
+        依輸出格式儲存數據
+        
+        Args:
+            data: 數據矩陣
+            filename: 檔案名稱（不含副檔名）
+            sheet_name: 工作表名稱（僅適用於Excel）
+            output_format: 'xlsx'、'csv'、'npy'、'parquet' 或 'bep'，預設為DataGeneratorConfig.OUTPUT_FORMAT
+            
+        Returns:
+            str: 含副檔名的檔案路徑
+        """
+        output_format = output_format or DataGeneratorConfig.OUTPUT_FORMAT
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"不支援的輸出格式: {output_format}")
+        
+        path = f"{filename}.{output_format}"
+        if output_format == 'xlsx':
+            self.save_to_excel(data, path, sheet_name)
+        elif output_format == 'csv':
+            self.save_to_csv(data, path)
+        elif output_format == 'npy':
+            self.save_to_npy(data, path)
+        elif output_format == 'bep':
+            self.save_to_raw_panel(data, path)
+        else:
+            self.save_to_parquet(data, path)
+        return path
+    
+    def _print_data_summary(self, data: np.ndarray):
+        """印出已儲存數據的大小與數值範圍"""
         print(f"  - 數據大小: {data.shape}")
         print(f"  - 數值範圍: {data.min():.0f} ~ {data.max():.0f}")
     
-    def generate_test_suite(self, output_dir: str = "test_data"):
+    def generate_test_suite(self, output_dir: str = "test_data", show: bool = True,
+                            output_format: Optional[str] = None):
         """
         生成完整的測試數據套件
         
         Args:
             output_dir: 輸出目錄
+            show: 是否顯示每個圖表視窗
+            output_format: 數據檔案格式，預設為DataGeneratorConfig.OUTPUT_FORMAT
         """
         # 創建輸出目錄
         os.makedirs(output_dir, exist_ok=True)
@@ -207,11 +311,11 @@ class DisplayTestDataGenerator:
         # 1. 生成均勻數據
         print("\n1. 生成均勻分佈數據...")
         uniform_data = self.generate_uniform_data()
-        uniform_filename = os.path.join(output_dir, f"uniform_data_{timestamp}.xlsx")
+        uniform_filename = os.path.join(output_dir, f"uniform_data_{timestamp}")
         uniform_viz_path = os.path.join(output_dir, f"uniform_data_{timestamp}.png")
         
-        self.save_to_excel(uniform_data, uniform_filename, "UniformData")
-        self.create_visualization(uniform_data, "均勻分佈測試數據", uniform_viz_path)
+        self.save_data(uniform_data, uniform_filename, "UniformData", output_format)
+        self.create_visualization(uniform_data, "均勻分佈測試數據", uniform_viz_path, show=show)
         
         # 2. 生成不同衰減程度的數據
         decay_percentages = [0.10, 0.15, 0.20, 0.30]  # 10%, 15%, 20%, 30%
@@ -220,14 +324,14 @@ class DisplayTestDataGenerator:
             print(f"\n2. 生成邊緣衰減數據 ({decay_pct*100:.0f}%)...")
             
             decay_data = self.generate_edge_decay_data(decay_pct)
-            decay_filename = os.path.join(output_dir, f"edge_decay_{int(decay_pct*100)}percent_{timestamp}.xlsx")
+            decay_filename = os.path.join(output_dir, f"edge_decay_{int(decay_pct*100)}percent_{timestamp}")
             decay_viz_path = os.path.join(output_dir, f"edge_decay_{int(decay_pct*100)}percent_{timestamp}.png")
             
-            self.save_to_excel(decay_data, decay_filename, f"EdgeDecay_{int(decay_pct*100)}pct")
-            self.create_visualization(decay_data, f"邊緣衰減 {decay_pct*100:.0f}% 測試數據", decay_viz_path)
+            self.save_data(decay_data, decay_filename, f"EdgeDecay_{int(decay_pct*100)}pct", output_format)
+            self.create_visualization(decay_data, f"邊緣衰減 {decay_pct*100:.0f}% 測試數據", decay_viz_path, show=show)
         
         print(f"\n✅ 測試數據套件生成完成！")
-        print(f"總共生成了 {len(decay_percentages) + 1} 個Excel檔案和對應的視覺化圖表")
+        print(f"總共生成了 {len(decay_percentages) + 1} 個數據檔案和對應的視覺化圖表")
 
 
 def main():
@@ -0,0 +1,131 @@
+"""
+背景工作測試
+"""
+
+import threading
+import time
+import pytest
+from blue_edge_analyzer.gui.background_task import BackgroundTaskRunner, TaskCancelled
+
+
+class FakeRoot:
+    """以手動執行排程取代tkinter的root.after"""
+    
+    def __init__(self):
+        self.scheduled = []
+    
+    def after(self, delay, callback):
+        self.scheduled.append(callback)
+    
+    def run_until_idle(self, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while self.scheduled and time.monotonic() < deadline:
+            callback = self.scheduled.pop(0)
+            callback()
+            time.sleep(0.005)
+
+
+class TestBackgroundTaskRunner:
+    """背景工作測試類別"""
+    
+    def setup_method(self):
+        """測試前的設置"""
+        self.root = FakeRoot()
+        self.busy_states = []
+        self.progress = []
+        self.runner = BackgroundTaskRunner(self.root, on_busy_changed=self.busy_states.append,
+                                           on_progress=lambda fraction, message: self.progress.append(message))
+    
+    def test_result_returned_on_main_thread(self):
+        """測試結果與進度透過輪詢送回呼叫端的執行緒"""
+        results = []
+        main_thread = threading.current_thread()
+        
+        def work(progress, cancel_event):
+            progress(0.5, 'half')
+            return threading.current_thread() is not main_thread
+        
+        self.runner.submit(work, lambda result: results.append((result, threading.current_thread())))
+        self.root.run_until_idle()
+        
+        assert results == [(True, main_thread)]
+        assert self.progress == ['half']
+        assert self.busy_states == [True, False]
+        assert not self.runner.busy
+    
+    def test_stale_result_is_dropped(self):
+        """測試較早提交的工作結果不會覆蓋較新的結果"""
+        results = []
+        release = threading.Event()
+        
+        def slow(progress, cancel_event):
+            release.wait(5)
+            return 'old'
+        
+        self.runner.submit(slow, results.append)
+        self.runner.submit(lambda progress, cancel_event: 'new', results.append)
+        release.set()
+        self.root.run_until_idle()
+        
+        assert results == ['new']
+    
+    def test_cancel_discards_result(self):
+        """測試取消後工作可提早結束且結果被捨棄"""
+        results = []
+        errors = []
+        started = threading.Event()
+        finished = threading.Event()
+        
+        def work(progress, cancel_event):
+            started.set()
+            cancel_event.wait(5)
+            finished.set()
+            if cancel_event.is_set():
+                raise TaskCancelled()
+            return 'done'
+        
+        self.runner.submit(work, results.append, errors.append)
+        started.wait(5)
+        self.runner.cancel()
+        assert finished.wait(5)
+        self.root.run_until_idle()
+        
+        assert results == [] and errors == []
+        assert self.busy_states == [True, False]
+        assert not self.runner.busy
+    
+    def test_busy_until_cancelled_worker_stops(self):
+        """測試取消後仍保持忙碌，直到背景執行緒結束工作（包括還原處理）"""
+        release = threading.Event()
+        restored = []
+        
+        def work(progress, cancel_event):
+            release.wait(5)
+            progress(0.5, 'late')
+            restored.append(True)  # 模擬取消後還原原本的數據
+            raise TaskCancelled()
+        
+        self.runner.submit(work, lambda result: pytest.fail('不應成功'))
+        self.runner.cancel()
+        assert self.runner.busy and self.runner.cancelling
+        self.root.scheduled.pop(0)()  # 背景執行緒尚未結束時輪詢
+        assert self.runner.busy and self.busy_states == [True]
+        
+        release.set()
+        self.root.run_until_idle()
+        assert restored == [True]
+        assert not self.runner.busy
+        assert self.busy_states == [True, False]
+        assert self.progress == []  # 取消後的進度不再顯示
+    
+    def test_error_reported(self):
+        """測試工作中的例外送到on_error"""
+        errors = []
+        
+        def work(progress, cancel_event):
+            raise ValueError('bad file')
+        
+        self.runner.submit(work, lambda result: pytest.fail('不應成功'), errors.append)
+        self.root.run_until_idle()
+        
+        assert len(errors) == 1 and str(errors[0]) == 'bad file'
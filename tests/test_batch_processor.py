@@ -0,0 +1,91 @@
+"""
+批次分析模組測試
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from blue_edge_analyzer.core.batch_processor import analyze_file, collect_files, run_batch, write_results
+from blue_edge_analyzer.cli import main
+
+
+def write_measurement_csv(path, values):
+    """寫入含有標題列的3欄量測CSV"""
+    rows = [['Title', 'Panel', ''], ['X', 'Y', 'Z']]
+    rows += [[v * 0.9, v, v * 1.1] for v in values]
+    pd.DataFrame(rows).to_csv(path, header=False, index=False)
+
+
+class TestBatchProcessor:
+    """批次分析測試類別"""
+    
+    def setup_method(self):
+        """設定測試數據"""
+        self.values = np.linspace(100.0, 200.0, 50)
+    
+    def test_analyze_file(self, tmp_path):
+        """測試單一檔案分析與自動偵測"""
+        path = tmp_path / 'panel.csv'
+        write_measurement_csv(path, self.values)
+        
+        row = analyze_file(str(path), topside_percentage=0.2, bottomside_percentage=0.2)
+        
+        assert row['status'] == 'ok'
+        assert row['start_row'] == 3  # Excel第3行開始
+        assert row['end_row'] == 52
+        assert row['total_data_points'] == 50
+        assert row['topside_judgment'] in ['Pass', 'NG']
+    
+    def test_analyze_missing_file(self, tmp_path):
+        """測試無法載入的檔案"""
+        row = analyze_file(str(tmp_path / 'missing.csv'))
+        assert row['status'] == 'error'
+        assert row['error'].startswith('FileNotFoundError')
+        
+        (tmp_path / 'panel.txt').write_text('1,2,3')
+        row = analyze_file(str(tmp_path / 'panel.txt'))
+        assert row['status'] == 'error'
+        assert row['error'] == '不支援的檔案格式: .txt'
+    
+    def test_invalid_worker_count(self, tmp_path):
+        """測試行程數小於1時直接回報錯誤"""
+        write_measurement_csv(tmp_path / 'panel.csv', self.values)
+        with pytest.raises(ValueError, match='行程數'):
+            run_batch([str(tmp_path / 'panel.csv')] * 2, workers=0)
+        with pytest.raises(SystemExit):
+            main(['batch', str(tmp_path / '*.csv'), '-j', '0'])
+    
+    def test_run_batch_order_is_deterministic(self, tmp_path):
+        """測試平行執行時結果順序與檔案順序一致"""
+        for i in range(4):
+            write_measurement_csv(tmp_path / f'panel_{i}.csv', self.values * (i + 1))
+        (tmp_path / 'notes.txt').write_text('ignored')
+        
+        files = collect_files([str(tmp_path)])
+        assert [f.rsplit('_', 1)[-1] for f in files] == ['0.csv', '1.csv', '2.csv', '3.csv']
+        
+        serial = run_batch(files, workers=1)
+        parallel = run_batch(files, workers=2)
+        
+        pd.testing.assert_frame_equal(serial, parallel)
+        assert list(parallel['file']) == files
+    
+    def test_write_results(self, tmp_path):
+        """測試CSV與JSON lines輸出"""
+        results = pd.DataFrame([{'file': 'a.csv', 'topside_max': 1.5}])
+        
+        write_results(results, str(tmp_path / 'out.csv'))
+        write_results(results, str(tmp_path / 'out.jsonl'))
+        
+        assert pd.read_csv(tmp_path / 'out.csv')['topside_max'].tolist() == [1.5]
+        assert pd.read_json(tmp_path / 'out.jsonl', lines=True)['file'].tolist() == ['a.csv']
+    
+    def test_cli_batch(self, tmp_path):
+        """測試batch子命令"""
+        write_measurement_csv(tmp_path / 'panel.csv', self.values)
+        output = tmp_path / 'results.jsonl'
+        
+        exit_code = main(['batch', str(tmp_path / '*.csv'), '-o', str(output), '-j', '1'])
+        
+        assert exit_code == 0
+        assert len(pd.read_json(output, lines=True)) == 1
@@ -0,0 +1,43 @@
+"""
+效能測試工具的測試
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+from run_benchmarks import Benchmark, build_benchmarks, compare_results, run_benchmarks, time_benchmark
+
+
+class TestBenchmarks:
+    """效能測試工具測試類別"""
+    
+    def test_time_benchmark_runs_setup_each_repeat(self):
+        """測試每次量測前都執行setup，且在次數上限停止"""
+        setups = []
+        benchmark = Benchmark('noop', lambda: setups.append(1) or len(setups), lambda state: state)
+        
+        stats = time_benchmark(benchmark, min_repeats=3, max_repeats=5, max_time=10.0)
+        
+        assert stats['repeats'] == len(setups) == 5
+        assert 0.0 <= stats['min'] <= stats['median'] <= max(stats['mean'], stats['median']) + stats['stdev']
+    
+    def test_small_fixture_suite_and_compare(self, tmp_path):
+        """測試以小型測試檔案執行所有測試，並比較兩次結果"""
+        benchmarks = build_benchmarks([(60, 30)], ['csv'], str(tmp_path))
+        names = [benchmark.name for benchmark in benchmarks]
+        assert 'load_file[60x30.csv]' in names and 'calculate_blue_edge[60x30]' in names
+        assert os.path.exists(tmp_path / 'panel_60x30_seed0.csv')
+        
+        results = run_benchmarks(benchmarks, max_time=0.01)
+        assert set(results['benchmarks']) == set(names)
+        assert results['machine']['numpy']
+        
+        slower = {'benchmarks': {name: dict(stats, median=stats['median'] * 2)
+                                 for name, stats in results['benchmarks'].items()}}
+        comparison = compare_results(results, slower, tolerance=0.5)
+        assert comparison['regression'].all()
+        assert comparison['ratio'].tolist() == pytest.approx([2.0] * len(names))
+        assert not compare_results(slower, results)['regression'].any()
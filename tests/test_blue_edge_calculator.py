@@ -7,6 +7,33 @@ import numpy as np
 from blue_edge_analyzer.core.blue_edge_calculator import BlueEdgeCalculator
 
 
+def loop_reference(clean_data, percentage, side):
+    """原始逐點迴圈版本的計算，用於驗證向量化核心的結果"""
+    threshold_index = int(len(clean_data) * percentage)
+    if threshold_index == 0:
+        threshold_index = 1
+    
+    if side == 'TopSide':
+        threshold_data = clean_data[:threshold_index]
+        baseline_value = threshold_data[-1]
+    else:
+        threshold_data = clean_data[-threshold_index:]
+        baseline_value = threshold_data[0]
+    
+    calculated_values = []
+    for i in range(threshold_index):
+        current_value = threshold_data[i]
+        if current_value != 0:
+            ratio = baseline_value / current_value
+            calculated_values.append((ratio - 1) * 100)
+        else:
+            calculated_values.append(0.0)
+    
+    max_value = max(calculated_values)
+    max_position = calculated_values.index(max_value) + 1
+    return calculated_values, max_value, max_position
+
+
 class TestBlueEdgeCalculator:
     """Blue Edge Index計算器測試類別"""
     
@@ -32,13 +59,18 @@ class TestBlueEdgeCalculator:
     
     def test_calculate_blue_edge_index_basic(self):
         """測試基本Blue Edge Index計算"""
-        # 測試遞增數據
+        # 測試遞增數據：前50%為1-5，基準值為5，最大值在第1個 (5 / 1 - 1) * 100
         data = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
+        self.calculator.set_topside_threshold_percentage(0.5)
         result, judgment = self.calculator.calculate_blue_edge_index(data)
         
         assert isinstance(result, float)
-        assert judgment in ['Pass', 'NG']
-        assert result > 0
+        assert result == 400.0
+        assert judgment == 'NG'
+        
+        # 預設10%時只有1個點，即基準值本身
+        self.calculator.set_topside_threshold_percentage(0.1)
+        assert self.calculator.calculate_blue_edge_index(data) == (0.0, 'Pass')
     
     def test_calculate_blue_edge_index_empty(self):
         """測試空數據"""
@@ -54,13 +86,205 @@ class TestBlueEdgeCalculator:
         details = self.calculator.get_calculation_details(data)
         
         assert 'total_data_points' in details
-        assert 'top_10_percent_points' in details
-        assert 'top_10_percent_avg' in details
-        assert 'overall_avg' in details
+        assert 'threshold_points' in details
+        assert 'baseline_value' in details
+        assert 'calculated_values' in details
         assert 'data_range' in details
         assert 'threshold_percentage' in details
         
         assert details['total_data_points'] == 10
-        assert details['top_10_percent_points'] == 1  # 10% of 10 = 1
-        assert details['overall_avg'] == 5.5
+        assert details['threshold_points'] == 1  # 10% of 10 = 1
+        assert details['baseline_value'] == 1.0
         assert details['data_range'] == (1, 10)
+        assert details['side_type'] == 'TopSide'
+    
+    
+    @pytest.mark.parametrize('seed', [0, 1, 2])
+    @pytest.mark.parametrize('percentage', [0.01, 0.1, 0.25, 0.5, 1.0])
+    def test_vectorized_kernel_matches_loop(self, seed, percentage):
+        """測試向量化核心與原始迴圈結果完全一致"""
+        rng = np.random.default_rng(seed)
+        data = rng.normal(30000, 300, 997)
+        data[rng.integers(0, len(data), 20)] = 0.0  # 包含除以0的情況
+        
+        self.calculator.set_topside_threshold_percentage(percentage)
+        self.calculator.set_bottomside_threshold_percentage(percentage)
+        
+        for side, calculate, get_details in [
+            ('TopSide', self.calculator.calculate_blue_edge_index, self.calculator.get_calculation_details),
+            ('BottomSide', self.calculator.calculate_bottomside_blue_edge_index,
+             self.calculator.get_bottomside_calculation_details),
+        ]:
+            expected_values, expected_max, expected_position = loop_reference(data, percentage, side)
+            
+            result, judgment = calculate(data)
+            details = get_details(data)
+            
+            assert result == expected_max
+            assert judgment == ('NG' if expected_max > self.calculator.ng_threshold else 'Pass')
+            assert details['calculated_values'] == expected_values
+            assert details['max_value'] == expected_max
+            assert details['max_position'] == expected_position
+    
+    def test_zero_values_and_ties(self):
+        """測試數據為0與最大值重複時的處理"""
+        data = np.array([0.0, 5.0, 0.0, 5.0, 10.0, 10.0, 10.0, 10.0, 10.0, 10.0])
+        self.calculator.set_topside_threshold_percentage(0.5)
+        
+        details = self.calculator.get_calculation_details(data)
+        
+        assert details['calculated_values'] == [0.0, 100.0, 0.0, 100.0, 0.0]
+        assert details['calculation_details'][0]['ratio'] == 0.0
+        assert details['max_value'] == 100.0
+        assert details['max_position'] == 2  # 取第一個最大值
+    
+    def test_evaluate_matches_individual_methods(self):
+        """測試evaluate一次取得的結果與各別方法一致"""
+        rng = np.random.default_rng(3)
+        data = rng.normal(30000, 300, 500).astype(object)
+        data[[0, 10, 250]] = np.nan
+        self.calculator.set_topside_threshold_percentage(0.2)
+        self.calculator.set_bottomside_threshold_percentage(0.05)
+        
+        result = self.calculator.evaluate(data, include_details=True)
+        topside_details = self.calculator.get_calculation_details(data)
+        bottomside_details = self.calculator.get_bottomside_calculation_details(data)
+        
+        assert (result.topside.max_value, result.topside.judgment) == self.calculator.calculate_blue_edge_index(data)
+        assert (result.bottomside.max_value, result.bottomside.judgment) == \
+            self.calculator.calculate_bottomside_blue_edge_index(data)
+        assert result.total_data_points == topside_details['total_data_points'] == 497
+        assert result.topside.max_position == topside_details['max_position']
+        assert result.topside.baseline_position == topside_details['baseline_position']
+        assert result.bottomside.max_position == bottomside_details['max_position']
+        assert result.bottomside.threshold_points == bottomside_details['threshold_points']
+        assert result.topside.calculated_values.tolist() == topside_details['calculated_values']
+        assert result.bottomside.calculated_values.tolist() == bottomside_details['calculated_values']
+    
+    def test_evaluate_without_details_and_empty(self):
+        """測試evaluate不帶詳細資料及空數據的情況"""
+        result = self.calculator.evaluate(np.array([3.0, 2.0, 1.0] * 10))
+        assert result.topside.calculated_values is None
+        assert result.bottomside.ratios is None
+        
+        empty = self.calculator.evaluate(np.array([]))
+        assert empty.total_data_points == 0
+        assert (empty.topside.max_value, empty.topside.judgment) == (0.0, 'NG')
+        assert (empty.bottomside.max_value, empty.bottomside.judgment) == (0.0, 'NG')
+    
+    def test_evaluate_matrix_matches_per_column(self):
+        """測試整個矩陣的評估結果與逐列evaluate一致"""
+        rng = np.random.default_rng(4)
+        matrix = rng.normal(30000, 600, (120, 37))
+        matrix[rng.integers(0, 120, 60), rng.integers(0, 37, 60)] = np.nan
+        matrix[rng.integers(0, 120, 10), rng.integers(0, 37, 10)] = 0.0
+        matrix[:, 5] = np.nan  # 整列無有效數據
+        self.calculator.set_topside_threshold_percentage(0.15)
+        self.calculator.set_bottomside_threshold_percentage(0.3)
+        self.calculator.set_ng_threshold(3.0)
+        
+        result = self.calculator.evaluate_matrix(matrix, include_rows=True)
+        
+        for axis_values, topside, bottomside in [
+            (matrix.T, result.topside, result.bottomside),
+            (matrix, result.leftside, result.rightside),
+        ]:
+            for i, line in enumerate(axis_values):
+                expected = self.calculator.evaluate(line)
+                assert topside.max_values[i] == expected.topside.max_value
+                assert topside.max_positions[i] == expected.topside.max_position
+                assert topside.judgments[i] == expected.topside.judgment
+                assert bottomside.max_values[i] == expected.bottomside.max_value
+                assert bottomside.max_positions[i] == expected.bottomside.max_position
+                assert bottomside.judgments[i] == expected.bottomside.judgment
+        
+        assert result.total_data_points[5] == 0
+        assert result.topside.judgments[5] == 'NG'
+    
+    def test_evaluate_matrix_object_dtype(self):
+        """測試含文字標題的object矩陣"""
+        matrix = np.array([['X', 'Y', 'Z'], [3, 6, 9], [2, 5, 8], [1, 4, 7]], dtype=object)
+        self.calculator.set_topside_threshold_percentage(1.0)
+        
+        result = self.calculator.evaluate_matrix(matrix)
+        
+        assert result.total_data_points.tolist() == [3, 3, 3]
+        assert result.topside.max_positions.tolist() == [3, 3, 3]
+        assert result.leftside is None
+    
+    def test_cached_evaluation_recomputes_only_changes(self, monkeypatch):
+        """測試以cache_key評估時，NG閾值改變只重新判斷，百分比改變只重新計算該側"""
+        rng = np.random.default_rng(5)
+        data = rng.normal(30000, 300, 1000)
+        key = ('panel.xlsx', 'Sheet1', 2, 1002)
+        
+        cleaned = []
+        original_clean = BlueEdgeCalculator._clean_data
+        monkeypatch.setattr(BlueEdgeCalculator, '_clean_data',
+                            staticmethod(lambda values: cleaned.append(1) or original_clean(values)))
+        computed = []
+        original_side = self.calculator._calculate_side
+        monkeypatch.setattr(self.calculator, '_calculate_side',
+                            lambda values, side: computed.append(side) or original_side(values, side))
+        
+        first = self.calculator.evaluate(data, include_details=True, cache_key=key)
+        assert (len(cleaned), computed) == (1, ['TopSide', 'BottomSide'])
+        
+        self.calculator.set_ng_threshold(first.topside.max_value)
+        rejudged = self.calculator.evaluate(data, include_details=True, cache_key=key)
+        assert (len(cleaned), len(computed)) == (1, 2)
+        assert rejudged.topside.judgment == 'Pass'
+        assert rejudged.topside.max_value == first.topside.max_value
+        
+        self.calculator.set_bottomside_threshold_percentage(0.25)
+        changed = self.calculator.evaluate(data, include_details=True, cache_key=key)
+        assert computed == ['TopSide', 'BottomSide', 'BottomSide']
+        
+        self.calculator.set_bottomside_threshold_percentage(0.1)
+        self.calculator.evaluate(data, include_details=True, cache_key=key)
+        assert len(computed) == 3  # 之前計算過的閾值點數直接取用
+        
+        # 與不使用快取的結果相同
+        self.calculator.set_bottomside_threshold_percentage(0.25)
+        expected = self.calculator.evaluate(data, include_details=True)
+        assert changed.bottomside.max_value == expected.bottomside.max_value
+        assert changed.bottomside.max_position == expected.bottomside.max_position
+        assert changed.bottomside.judgment == expected.bottomside.judgment
+        assert changed.bottomside.calculated_values.tolist() == expected.bottomside.calculated_values.tolist()
+        assert changed.data_range == expected.data_range
+        
+        self.calculator.evaluate(data, cache_key=('other.xlsx', 'Sheet1', 2, 1002))
+        assert len(cleaned) == 3
+    
+    def test_sweep_matches_evaluate(self):
+        """測試閾值掃描的每一行與逐一設定百分比後evaluate的結果相同"""
+        rng = np.random.default_rng(6)
+        data = rng.normal(30000, 300, 997).astype(object)
+        data[rng.integers(0, len(data), 15)] = 0.0
+        data[[3, 500]] = np.nan
+        percentages = np.arange(1, 51) / 100
+        self.calculator.set_ng_threshold(2.0)
+        self.calculator.SWEEP_BLOCK_SIZE = 5000  # 強制分批計算
+        
+        table = self.calculator.sweep(data, percentages)
+        
+        assert len(table) == 50
+        np.testing.assert_array_equal(table['percentage'], percentages)
+        for row in table.itertuples():
+            self.calculator.set_topside_threshold_percentage(row.percentage)
+            self.calculator.set_bottomside_threshold_percentage(row.percentage)
+            expected = self.calculator.evaluate(data)
+            assert row.topside_threshold_points == expected.topside.threshold_points
+            assert row.topside_max_value == expected.topside.max_value
+            assert row.topside_max_position == expected.topside.max_position
+            assert row.topside_judgment == expected.topside.judgment
+            assert row.bottomside_threshold_points == expected.bottomside.threshold_points
+            assert row.bottomside_max_value == expected.bottomside.max_value
+            assert row.bottomside_max_position == expected.bottomside.max_position
+            assert row.bottomside_judgment == expected.bottomside.judgment
+        
+        empty = self.calculator.sweep(np.array([]), [0.1, 0.2])
+        assert empty['topside_judgment'].tolist() == ['NG', 'NG']
+        
+        with pytest.raises(ValueError):
+            self.calculator.sweep(data, [0.0, 0.1])
@@ -0,0 +1,93 @@
+"""
+精簡工作表測試
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from blue_edge_analyzer.core.compact_sheet import CompactSheet
+from blue_edge_analyzer.core.excel_processor import ExcelProcessor
+
+
+class TestCompactSheet:
+    """精簡工作表測試類別"""
+    
+    def setup_method(self):
+        """測試前的設置"""
+        rng = np.random.default_rng(0)
+        body = pd.DataFrame(rng.normal(size=(2000, 50)))
+        header = pd.DataFrame([['Title'] + [None] * 49, [f'C{i}' for i in range(50)]])
+        footer = pd.DataFrame([['Summary', 'nan', ''] + [None] * 47])
+        # 與header=None讀取的工作表相同：每一欄都是object dtype
+        self.sheet = pd.concat([header, body, footer], ignore_index=True).astype(object)
+    
+    def test_round_trip(self):
+        """測試還原的DataFrame內容與原始工作表相同"""
+        compact = CompactSheet.from_frame(self.sheet)
+        restored = compact.to_frame()
+        
+        assert restored.shape == self.sheet.shape
+        assert restored.iloc[0, 0] == 'Title' and restored.iloc[1, 49] == 'C49'
+        assert restored.iloc[2002, 1] == 'nan' and restored.iloc[2002, 2] == ''
+        np.testing.assert_array_equal(restored.iloc[2:2002].to_numpy(dtype=float),
+                                      self.sheet.iloc[2:2002].to_numpy(dtype=float))
+        assert pd.isna(restored.iloc[0, 1])
+        
+        preview = compact.to_frame(1, 4, max_cols=3)
+        assert list(preview.index) == [1, 2, 3] and preview.shape == (3, 3)
+        assert preview.iloc[0, 2] == 'C2'
+    
+    def test_memory_reduced(self):
+        """測試float32矩陣佔用的記憶體遠少於object DataFrame（每個儲存格4位元組，而非指標加Python物件）"""
+        object_bytes = self.sheet.memory_usage(deep=True).sum()
+        compact = CompactSheet.from_frame(self.sheet, dtype=np.float32)
+        
+        assert compact.values.dtype == np.float32 and compact.values.flags.f_contiguous
+        assert compact.nbytes * 7 < object_bytes
+    
+    def test_row_counts_match_processor(self):
+        """測試保存的逐行計數與開始/結束行偵測與原始DataFrame相同"""
+        compact = CompactSheet.from_frame(self.sheet)
+        assert compact.non_null_count[0] == 1 and compact.numeric_count[0] == 0
+        # 'nan'字串可以float()轉換，與原始逐個判斷的方式相同計為數值
+        assert compact.numeric_count[2002] == 1 and compact.non_null_count[2002] == 3
+        
+        processor = ExcelProcessor(dtype=np.float32)
+        processor.data = self.sheet
+        assert processor.detect_data_start_row() == 2
+        assert processor.detect_data_end_row(2) == 2002
+        assert processor.get_float_block() is processor.get_compact_sheet().values
+        
+        sanitized = processor.get_sanitized_middle_column(2, 2002)
+        np.testing.assert_allclose(sanitized.values, self.sheet.iloc[2:2002, 25].to_numpy(dtype=float), rtol=1e-6)
+    
+    def test_data_frame_reused_while_referenced(self):
+        """測試還原的DataFrame仍被引用時重複使用，整數欄位恢復型態"""
+        processor = ExcelProcessor()
+        processor.data = pd.DataFrame({'a': [1, 2, 3], 'b': ['x', 2.5, None]})
+        
+        frame = processor.data
+        assert processor.data is frame
+        assert frame['a'].dtype == np.int64
+        assert frame['b'].tolist()[:2] == ['x', 2.5]
+        assert dict(processor.get_compact_sheet().dtypes) == dict(frame.dtypes)
+        assert processor.get_data_info()['has_null']
+    
+    def test_from_array(self):
+        """測試由數值陣列建立的工作表與由DataFrame建立的結果相同"""
+        values = np.arange(12, dtype=np.float64).reshape(4, 3)
+        values[1, 2] = np.nan
+        
+        compact = CompactSheet.from_array(values)
+        reference = CompactSheet.from_frame(pd.DataFrame(values))
+        np.testing.assert_array_equal(compact.values, reference.values)
+        np.testing.assert_array_equal(compact.numeric_count, reference.numeric_count)
+        np.testing.assert_array_equal(compact.non_null_count, reference.non_null_count)
+        assert compact.columns == [0, 1, 2] and len(compact.text_values) == 0
+        
+        integers = CompactSheet.from_array(np.arange(5, dtype=np.int32))
+        assert integers.shape == (5, 1)
+        assert integers.to_frame()[0].dtype == np.int32
+        
+        with pytest.raises(ValueError):
+            CompactSheet.from_array(np.zeros((2, 2, 2)))
@@ -0,0 +1,68 @@
+"""
+迴歸測試數據集生成器測試
+"""
+
+import json
+import os
+
+import pytest
+
+from blue_edge_analyzer.core.batch_processor import analyze_file
+from data_samples.corpus_generator import MANIFEST_NAME, generate_corpus, rebuild_corpus
+
+
+class TestCorpusGenerator:
+    """迴歸測試數據集生成器測試類別"""
+    
+    def test_parallel_corpus_matches_analyzer(self, tmp_path):
+        """測試平行產生的數據集：manifest的預期結果與分析器讀取檔案後的結果相同"""
+        manifest = generate_corpus(str(tmp_path), sizes=[60, 80], decay_percentages=[0.0, 0.2],
+                                   noise_levels=[0.01], replicates=2, seed=11, workers=2)
+        
+        assert len(manifest['panels']) == 8
+        assert len({panel['seed'] for panel in manifest['panels']}) == 8
+        with open(tmp_path / MANIFEST_NAME, encoding='utf-8') as f:
+            assert json.load(f)['panels'] == manifest['panels']
+        
+        for panel in manifest['panels']:
+            row = analyze_file(str(tmp_path / panel['file']))
+            assert row['status'] == 'ok'
+            for key, value in panel['expected'].items():
+                # CSV以文字保存，解析後的數值可能有最後一位的誤差
+                assert row[key] == (pytest.approx(value, rel=1e-12) if isinstance(value, float) else value)
+        
+        # 衰減20%的面板Blue Edge Index高於沒有衰減的面板
+        def largest(decay):
+            return max(max(panel['expected']['topside_max'], panel['expected']['bottomside_max'])
+                       for panel in manifest['panels'] if panel['decay_percentage'] == decay)
+        assert largest(0.2) > largest(0.0)
+    
+    def test_raw_panel_corpus_matches_manifest(self, tmp_path):
+        """測試原始面板格式的數據集無損，分析結果與manifest的預期結果完全相同"""
+        manifest = generate_corpus(str(tmp_path), sizes=[40], decay_percentages=[0.15], noise_levels=[0.01],
+                                   replicates=2, seed=3, file_format='bep', workers=1)
+        
+        for panel in manifest['panels']:
+            assert panel['file'].endswith('.bep')
+            row = analyze_file(str(tmp_path / panel['file']))
+            assert row['status'] == 'ok'
+            for key, value in panel['expected'].items():
+                assert row[key] == value
+    
+    def test_rebuild_from_manifest(self, tmp_path):
+        """測試依manifest在另一個目錄重新產生完全相同的數據集"""
+        generate_corpus(str(tmp_path / 'a'), sizes=[50], decay_percentages=[0.1], noise_levels=[0.02],
+                        replicates=3, seed=5, workers=1)
+        manifest_path = str(tmp_path / 'a' / MANIFEST_NAME)
+        
+        assert rebuild_corpus(manifest_path, output_dir=str(tmp_path / 'b'), workers=2) == []
+        for name in os.listdir(tmp_path / 'a'):
+            if name != MANIFEST_NAME:
+                assert (tmp_path / 'a' / name).read_bytes() == (tmp_path / 'b' / name).read_bytes()
+        
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+        manifest['panels'][1]['seed'] += 1
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        assert rebuild_corpus(manifest_path, output_dir=str(tmp_path / 'c'), workers=1) == [manifest['panels'][1]['file']]
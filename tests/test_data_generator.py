@@ -0,0 +1,68 @@
+"""
+測試數據生成器測試
+"""
+
+import numpy as np
+import pytest
+import matplotlib
+matplotlib.use('Agg')
+
+from data_samples.test_data_generator import DisplayTestDataGenerator
+
+
+class TestDataGenerator:
+    """測試數據生成器測試類別"""
+    
+    def setup_method(self):
+        """測試前的設置"""
+        self.generator = DisplayTestDataGenerator(size_mm=10.0, resolution_mm=0.1, seed=7)
+    
+    def test_edge_decay_reproducible(self):
+        """測試相同種子產生相同的數據，不同種子不同"""
+        data = self.generator.generate_edge_decay_data(0.2)
+        again = DisplayTestDataGenerator(size_mm=10.0, resolution_mm=0.1, seed=7).generate_edge_decay_data(0.2)
+        other = DisplayTestDataGenerator(size_mm=10.0, resolution_mm=0.1, seed=8).generate_edge_decay_data(0.2)
+        
+        assert data.shape == (100, 100)
+        np.testing.assert_array_equal(data, again)
+        assert not np.array_equal(data, other)
+    
+    def test_edge_decay_profile(self):
+        """測試衰減區域依距離邊緣的cosine曲線衰減，中心區域不受影響"""
+        decay_start_position = 20
+        data = self.generator.generate_edge_decay_data(0.2, decay_start_position)
+        center = self.generator.center_value
+        
+        # 最外圈為衰減20%（雜訊1%），距離相同的點平均後接近理論值
+        ring = np.concatenate([data[0], data[-1], data[1:-1, 0], data[1:-1, -1]])
+        assert abs(ring.mean() - center * 0.8) < center * 0.8 * 0.005
+        
+        for distance in (5, 10, 15):
+            expected = center * (1 - 0.2 * 0.5 * (1 + np.cos(np.pi * distance / decay_start_position)))
+            values = data[distance, distance:100 - distance]
+            assert abs(values.mean() - expected) < expected * 0.01
+        
+        inner = data[decay_start_position:-decay_start_position, decay_start_position:-decay_start_position]
+        assert inner.min() >= center * 0.93 and inner.max() <= center * 1.07
+        assert abs(inner.mean() - center) < center * 0.002
+    
+    def test_save_data_formats(self, tmp_path):
+        """測試CSV、.npy與原始面板輸出可由ExcelProcessor載入，數值與原始數據相同"""
+        from blue_edge_analyzer.core.excel_processor import ExcelProcessor
+        
+        data = self.generator.generate_edge_decay_data(0.1)
+        for output_format in ('csv', 'npy'):
+            path = self.generator.save_data(data, str(tmp_path / 'panel'), output_format=output_format)
+            assert path == str(tmp_path / f'panel.{output_format}')
+            
+            processor = ExcelProcessor()
+            assert processor.load_file(path)
+            np.testing.assert_allclose(processor.get_float_block(), data, rtol=1e-15)
+        
+        path = self.generator.save_data(data, str(tmp_path / 'panel'), output_format='bep')
+        processor = ExcelProcessor()
+        assert processor.load_file(path)
+        np.testing.assert_array_equal(processor.get_float_block(), data)  # 預設float64，無損
+        
+        with pytest.raises(ValueError):
+            self.generator.save_data(data, str(tmp_path / 'panel'), output_format='txt')
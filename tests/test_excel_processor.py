@@ -8,6 +8,39 @@ import pandas as pd
 from blue_edge_analyzer.core.excel_processor import ExcelProcessor
 
 
+def row_counts_reference(row_data):
+    """原始逐個儲存格float()判斷的計數方式"""
+    numeric_count = 0
+    total_non_nan = 0
+    for val in row_data:
+        if pd.notna(val):
+            total_non_nan += 1
+            try:
+                float(val)
+                numeric_count += 1
+            except (ValueError, TypeError):
+                pass
+    return numeric_count, total_non_nan
+
+
+def detect_start_reference(data):
+    """原始逐行迴圈的開始行偵測"""
+    for i in range(len(data)):
+        numeric_count, total_non_nan = row_counts_reference(data.iloc[i])
+        if total_non_nan > 0 and numeric_count / total_non_nan > 0.5 and numeric_count >= 1:
+            return i
+    return 0
+
+
+def detect_end_reference(data, start_row):
+    """原始逐行迴圈的結束行偵測"""
+    for i in range(start_row, len(data)):
+        numeric_count, total_non_nan = row_counts_reference(data.iloc[i])
+        if total_non_nan == 0 or (total_non_nan > 0 and numeric_count / total_non_nan < 0.5):
+            return i
+    return len(data)
+
+
 class TestExcelProcessor:
     """Excel處理器測試類別"""
     
@@ -52,3 +85,338 @@ class TestExcelProcessor:
         # 測試偵測
         start_row = self.processor.detect_data_start_row(column_index=0)
         assert start_row == 2  # 第一個非空值在索引2
+    
+    def test_sanitized_middle_column_cached(self):
+        """測試中間列清理結果的快取與重新載入時的失效"""
+        self.processor.data = pd.DataFrame({
+            'A': ['Title', 1, 2, 3],
+            'B': ['Value', 10, 'bad', 30],
+            'C': ['', 7, 8, 9]
+        })
+        
+        sanitized = self.processor.get_sanitized_middle_column(start_row=1)
+        assert sanitized.values.tolist() == [10.0, 30.0]
+        assert sanitized.dropped_positions.tolist() == [1]
+        assert self.processor.get_sanitized_middle_column(start_row=1) is sanitized
+        
+        self.processor.data = pd.DataFrame({'A': [1, 2], 'B': [5, 6], 'C': [0, 0]})
+        assert self.processor.get_sanitized_middle_column().values.tolist() == [5.0, 6.0]
+
+    
+    def test_detect_rows_match_loop(self):
+        """測試向量化偵測與原始逐行迴圈結果完全一致"""
+        rng = np.random.default_rng(0)
+        pool = ['Header', '', None, np.nan, 1, 2.5, '3', 'nan', '1_000', True, pd.Timestamp('2020-01-01')]
+        
+        for _ in range(100):
+            rows, cols = rng.integers(1, 10), rng.integers(1, 6)
+            test_data = pd.DataFrame([[pool[k] for k in rng.integers(0, len(pool), cols)] for _ in range(rows)])
+            self.processor.data = test_data
+            
+            assert self.processor.detect_data_start_row() == detect_start_reference(test_data)
+            for start_row in range(len(test_data) + 1):
+                assert self.processor.detect_data_end_row(start_row) == detect_end_reference(test_data, start_row)
+    
+    def test_detect_data_end_row(self):
+        """測試自動偵測數據結束行數"""
+        self.processor.data = pd.DataFrame({
+            'A': ['Title', 1, 2, 3, 'Summary', None],
+            'B': ['', 4, 5, 6, 'x', None]
+        })
+        
+        start_row = self.processor.detect_data_start_row()
+        assert start_row == 1
+        assert self.processor.detect_data_end_row(start_row) == 4
+    
+    def test_row_classification_cached(self):
+        """測試逐行分類只計算一次，並在更換數據時失效"""
+        self.processor.data = pd.DataFrame({
+            'A': ['Title', 1, 2, 'End', 5],
+            'B': ['', 4, 5, '', 6]
+        })
+        
+        classification = self.processor.get_row_classification()
+        assert classification.numeric_count.tolist() == [0, 2, 2, 0, 2]
+        assert classification.end_rows.tolist() == [0, 3]
+        assert self.processor.detect_data_start_row() == 1
+        assert self.processor.detect_data_end_row(1) == 3
+        assert self.processor.detect_data_end_row(4) == 5
+        assert self.processor.get_row_classification() is classification
+        
+        self.processor.data = pd.DataFrame({'A': [1, 2, 3]})
+        assert self.processor.get_row_classification() is not classification
+        assert self.processor.detect_data_end_row(0) == 3
+    
+    def test_matrix_views_share_float_block(self):
+        """測試矩陣與中間列視圖共用同一個float矩陣，文字轉為NaN"""
+        self.processor.data = pd.DataFrame({
+            'A': ['Title', 1, 2, 3],
+            'B': ['Value', 10.5, 'bad', '30'],
+            'C': [None, 7, 8, 9]
+        })
+        
+        block = self.processor.get_float_block()
+        assert self.processor.get_float_block() is block
+        
+        view = self.processor.get_matrix_view(1, 3)
+        assert view.shape == (2, 3) and np.shares_memory(view, block)
+        
+        middle = self.processor.get_middle_column_view(start_row=1)
+        assert np.shares_memory(middle, block)
+        np.testing.assert_array_equal(middle, [10.5, np.nan, 30.0])
+        
+        preview = self.processor.get_preview_data(start_row=1, max_rows=2)
+        assert preview['matrix_shape'] == (3, 3)
+        np.testing.assert_array_equal(preview['middle_column_data'], [10.5, np.nan])
+        
+        self.processor.data = pd.DataFrame({'A': [1, 2]})
+        assert self.processor.get_float_block() is not block
+        assert self.processor.get_middle_column_view().tolist() == [1.0, 2.0]
+    
+    def test_switch_sheets_from_memory(self, tmp_path, monkeypatch):
+        """測試同一活頁簿只開啟一次，切換過的工作表直接從記憶體取得"""
+        file_path = tmp_path / 'panel.xlsx'
+        with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
+            pd.DataFrame([['Title'], [1.0], [2.0]]).to_excel(writer, sheet_name='A', index=False, header=False)
+            pd.DataFrame([[5.0], [6.0]]).to_excel(writer, sheet_name='B', index=False, header=False)
+        
+        opened = []
+        original_excel_file = pd.ExcelFile
+        monkeypatch.setattr(pd, 'ExcelFile', lambda *args, **kwargs: opened.append(args) or original_excel_file(*args, **kwargs))
+        
+        assert self.processor.load_file(str(file_path))
+        assert self.processor.get_available_sheets() == ['A', 'B']
+        assert self.processor.detect_data_start_row() == 1
+        sheet_a = self.processor.data
+        classification_a = self.processor.get_row_classification()
+        
+        assert self.processor.load_file(str(file_path), 'B')
+        assert self.processor.data.iloc[:, 0].tolist() == [5.0, 6.0]
+        
+        assert self.processor.load_file(str(file_path), 'A')
+        assert self.processor.data is sheet_a
+        assert self.processor.get_row_classification() is classification_a  # 分類結果一併還原
+        assert len(opened) == 1
+        
+        self.processor.close()
+    
+    def test_streaming_csv_middle_column(self, tmp_path):
+        """測試串流模式只讀取CSV中間列，偵測結果與完整載入一致"""
+        file_path = tmp_path / 'panel.csv'
+        rows = [['Title'], ['X', 'Y', 'Z', 'W', 'V']]
+        rows += [[i, i * 10, i * 100, i * 1000, i * 10000] for i in range(1, 31)]
+        rows += [['Summary', 'done']]
+        pd.DataFrame(rows).to_csv(file_path, header=False, index=False)
+        
+        full = ExcelProcessor()
+        assert full.load_file(str(file_path), streaming=False)
+        
+        assert self.processor.load_file(str(file_path), streaming=True)
+        assert self.processor.data.shape == (33, 1)
+        assert self.processor.loaded_columns == [2]
+        assert self.processor.source_column_count == 5
+        assert self.processor.get_middle_column_index() == full.get_middle_column_index() == 2
+        
+        start_row = self.processor.detect_data_start_row()
+        end_row = self.processor.detect_data_end_row(start_row)
+        assert (start_row, end_row) == (full.detect_data_start_row(), full.detect_data_end_row(start_row)) == (2, 32)
+        
+        streamed = self.processor.get_sanitized_middle_column(start_row, end_row).values
+        np.testing.assert_array_equal(streamed, full.get_sanitized_middle_column(start_row, end_row).values)
+        
+        assert self.processor.load_file(str(file_path), columns=[1, 3])
+        assert list(self.processor.data.columns) == [1, 3]
+    
+    def test_streaming_csv_end_row_uses_whole_rows(self, tmp_path):
+        """測試串流模式以整行判斷結束行：中間列有空白儲存格時，結果仍與完整載入相同"""
+        from blue_edge_analyzer.core.blue_edge_calculator import BlueEdgeCalculator
+        
+        file_path = tmp_path / 'panel.csv'
+        rows = [['Title'], ['X', 'Y', 'Z', 'W', 'V']]
+        rows += [[i, i * 10, None if i in (7, 8) else i * 100 + i % 3, i * 1000, i * 10000] for i in range(1, 31)]
+        rows += [['Summary', 'done']]
+        pd.DataFrame(rows).to_csv(file_path, header=False, index=False)
+        
+        full = ExcelProcessor()
+        assert full.load_file(str(file_path), streaming=False)
+        assert self.processor.load_file(str(file_path), streaming=True)
+        
+        start_row = self.processor.detect_data_start_row()
+        assert start_row == full.detect_data_start_row() == 2
+        streamed_end = self.processor.get_row_classification().find_end_row(start_row)
+        assert streamed_end == full.get_row_classification().find_end_row(start_row) == 32
+        
+        calculator = BlueEdgeCalculator()
+        streamed = calculator.evaluate(self.processor.get_sanitized_middle_column(start_row, streamed_end).values)
+        expected = calculator.evaluate(full.get_sanitized_middle_column(start_row, streamed_end).values)
+        assert streamed.total_data_points == expected.total_data_points == 28
+        assert streamed.topside == expected.topside and streamed.bottomside == expected.bottomside
+    
+    def test_streaming_csv_memory_is_bounded(self, tmp_path):
+        """測試串流讀取CSV時暫存的記憶體由每段儲存格數決定，遠小於整個工作表"""
+        import tracemalloc
+        
+        file_path = tmp_path / 'wide.csv'
+        values = np.random.default_rng(1).normal(size=(4000, 200)).round(4)
+        pd.DataFrame([['Title']] + values.tolist() + [['Summary', 'done']]).to_csv(
+            file_path, header=False, index=False)
+        
+        self.processor.CSV_CHUNK_CELLS = 20000  # 每段100行
+        tracemalloc.start()
+        try:
+            assert self.processor.load_file(str(file_path), streaming=True)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        
+        assert peak < values.nbytes / 3
+        start_row = self.processor.detect_data_start_row()
+        assert (start_row, self.processor.detect_data_end_row(start_row)) == (1, 4001)
+        np.testing.assert_array_equal(self.processor.get_sanitized_middle_column(1, 4001).values, values[:, 100])
+    
+    def test_streaming_xlsx_middle_column(self, tmp_path):
+        """測試以openpyxl唯讀模式串流讀取.xlsx，結果與完整載入一致"""
+        file_path = tmp_path / 'panel.xlsx'
+        rows = [['Title'], ['X', 'Y', 'Z', 'W', 'V']]
+        rows += [[i, i * 10, i * 100 if i != 7 else 'bad', i * 1000, i * 10000] for i in range(1, 31)]
+        rows[6] = [5, 'NULL', 500, 'N/A', '#N/A']  # pandas預設的NA字串視為空值，不是結束行
+        rows += [['Summary', 'done']]
+        pd.DataFrame(rows).to_excel(file_path, header=False, index=False)
+        
+        full = ExcelProcessor()
+        assert full.load_file(str(file_path), streaming=False)
+        
+        assert self.processor.load_file(str(file_path), streaming=True)
+        assert self.processor.data.shape == (33, 1)
+        assert self.processor.loaded_columns == [2]
+        assert self.processor.source_column_count == 5
+        
+        start_row = self.processor.detect_data_start_row()
+        end_row = self.processor.detect_data_end_row(start_row)
+        assert (start_row, end_row) == (full.detect_data_start_row(), full.detect_data_end_row(start_row))
+        assert end_row == 32
+        
+        streamed = self.processor.get_sanitized_middle_column(start_row, end_row)
+        expected = full.get_sanitized_middle_column(start_row, end_row)
+        np.testing.assert_array_equal(streamed.values, expected.values)
+        assert streamed.dropped_count == expected.dropped_count == 1
+        
+        assert self.processor.load_file(str(file_path), columns=[0, 4])
+        assert list(self.processor.data.columns) == [0, 4]
+        assert len(self.processor.data) == 33
+        full.close()
+        self.processor.close()
+    
+    def test_streaming_width_beyond_sniffed_rows(self, tmp_path):
+        """測試前SNIFF_LINES行之後才出現較寬的行時，串流模式與完整載入選擇相同的中間列"""
+        rows = [[f'meta {i}'] for i in range(ExcelProcessor.SNIFF_LINES + 10)]
+        rows += [[i, i * 10, i * 100, i * 1000, i * 10000] for i in range(1, 31)]
+        file_path = tmp_path / 'panel.xlsx'
+        pd.DataFrame(rows).to_excel(file_path, header=False, index=False)
+        
+        full = ExcelProcessor()
+        assert full.load_file(str(file_path), streaming=False)
+        assert self.processor.load_file(str(file_path), streaming=True)
+        assert self.processor.get_middle_column_index() == full.get_middle_column_index() == 2
+        start_row = self.processor.detect_data_start_row()
+        np.testing.assert_array_equal(self.processor.get_sanitized_middle_column(start_row).values,
+                                      np.arange(1, 31) * 100.0)
+        
+        # 指定欄位時不需要改用完整載入，只更正原始欄位數
+        assert self.processor.load_file(str(file_path), columns=[3])
+        assert self.processor.loaded_columns == [3]
+        assert self.processor.source_column_count == 5
+        
+        # CSV中比偵測寬度更寬的行兩種模式都無法解析
+        csv_path = tmp_path / 'panel.csv'
+        csv_path.write_text('\n'.join(','.join(str(value) for value in row) for row in rows))
+        assert not ExcelProcessor().load_file(str(csv_path), streaming=False)
+        assert not self.processor.load_file(str(csv_path), streaming=True)
+        assert 'ParserError' in self.processor.last_error
+    
+    def test_load_npy(self, tmp_path):
+        """測試直接載入.npy數值陣列，偵測與中間列結果與相同內容的CSV一致"""
+        values = np.arange(1.0, 121.0).reshape(24, 5)
+        values[10, 2] = np.nan
+        np.save(tmp_path / 'panel.npy', values)
+        pd.DataFrame(values).to_csv(tmp_path / 'panel.csv', header=False, index=False)
+        
+        csv_processor = ExcelProcessor()
+        assert csv_processor.load_file(str(tmp_path / 'panel.csv'))
+        assert self.processor.load_file(str(tmp_path / 'panel.npy'))
+        assert self.processor.get_file_type() == 'numpy'
+        assert self.processor.get_available_sheets() == ['NumPy陣列']
+        assert self.processor.data.shape == (24, 5)
+        
+        start_row = self.processor.detect_data_start_row()
+        end_row = self.processor.detect_data_end_row(start_row)
+        assert (start_row, end_row) == (csv_processor.detect_data_start_row(),
+                                        csv_processor.detect_data_end_row(start_row)) == (0, 24)
+        
+        sanitized = self.processor.get_sanitized_middle_column(start_row, end_row)
+        expected = csv_processor.get_sanitized_middle_column(start_row, end_row)
+        np.testing.assert_array_equal(sanitized.values, expected.values)
+        assert sanitized.dropped_count == 1
+    
+    def test_load_parquet(self, tmp_path):
+        """測試載入Parquet檔案（需要pyarrow）"""
+        pytest.importorskip('pyarrow')
+        values = np.arange(1.0, 61.0).reshape(12, 5)
+        pd.DataFrame(values, columns=list('abcde')).to_parquet(tmp_path / 'panel.parquet', index=False)
+        
+        assert self.processor.load_file(str(tmp_path / 'panel.parquet'))
+        assert self.processor.get_file_type() == 'parquet'
+        assert list(self.processor.data.columns) == [0, 1, 2, 3, 4]
+        np.testing.assert_array_equal(self.processor.get_middle_column_view(), values[:, 2])
+    
+    def test_npy_memory_mapped(self, tmp_path):
+        """測試.npy以記憶體映射載入，保留檔案型態且不複製"""
+        values = np.arange(200, dtype=np.float32).reshape(20, 10)
+        np.save(tmp_path / 'frame.npy', values)
+        
+        assert self.processor.load_file(str(tmp_path / 'frame.npy'))
+        block = self.processor.get_float_block()
+        assert block.dtype == np.float32
+        assert isinstance(block, np.memmap) or isinstance(block.base, np.memmap)
+        np.testing.assert_array_equal(self.processor.get_middle_column_view(), values[:, 5])
+    
+    def test_integer_source_skips_row_scan(self, tmp_path):
+        """測試整數陣列不可能有NaN，偵測開始/結束行時不需要掃描數據"""
+        np.save(tmp_path / 'frame.npy', np.arange(60, dtype=np.uint16).reshape(12, 5))
+        
+        assert self.processor.load_file(str(tmp_path / 'frame.npy'))
+        sheet = self.processor.get_compact_sheet()
+        assert sheet._numeric_count is None
+        assert (self.processor.detect_data_start_row(), self.processor.detect_data_end_row(0)) == (0, 12)
+        assert sheet.numeric_count.tolist() == [5] * 12
+        assert self.processor.get_sanitized_middle_column().values.tolist() == list(range(2, 60, 5))
+    
+    def test_load_npz_sheets(self, tmp_path):
+        """測試.npz中的每個陣列視為一個工作表"""
+        first = np.arange(30.0).reshape(6, 5)
+        second = np.arange(100.0, 124.0).reshape(8, 3)
+        second[-2:] = np.nan
+        np.savez(tmp_path / 'frames.npz', first=first, second=second)
+        
+        assert self.processor.load_file(str(tmp_path / 'frames.npz'))
+        assert self.processor.get_file_type() == 'npz'
+        assert self.processor.get_available_sheets() == ['first', 'second']
+        assert self.processor.data.shape == (6, 5)
+        
+        assert self.processor.load_file(str(tmp_path / 'frames.npz'), 'second')
+        assert self.processor.detect_data_end_row(self.processor.detect_data_start_row()) == 6
+        np.testing.assert_array_equal(self.processor.get_middle_column_view(0, 6), second[:6, 1])
+        
+        assert not self.processor.load_file(str(tmp_path / 'frames.npz'), 'missing')
+    
+    def test_load_feather(self, tmp_path):
+        """測試載入Feather檔案（需要pyarrow）"""
+        pytest.importorskip('pyarrow')
+        values = np.arange(1.0, 61.0).reshape(12, 5)
+        values[3, 2] = np.nan
+        pd.DataFrame(values, columns=list('abcde')).to_feather(tmp_path / 'panel.feather')
+        
+        assert self.processor.load_file(str(tmp_path / 'panel.feather'))
+        assert self.processor.get_file_type() == 'feather'
+        np.testing.assert_array_equal(self.processor.get_middle_column_view(), values[:, 2])
+        assert self.processor.get_sanitized_middle_column().dropped_count == 1
@@ -0,0 +1,163 @@
+"""
+磁碟快取測試
+"""
+
+import datetime
+import os
+import threading
+import pytest
+import numpy as np
+import pandas as pd
+from blue_edge_analyzer.core.compact_sheet import CompactSheet
+from blue_edge_analyzer.core.excel_processor import ExcelProcessor
+from blue_edge_analyzer.core.file_cache import ParsedFileCache
+
+
+class TestParsedFileCache:
+    """磁碟快取測試類別"""
+    
+    def setup_method(self):
+        """測試前的設置"""
+        self.sheet = pd.DataFrame(
+            [['Title', None, None], ['X', 'Y', 'Z']]
+            + [[i, i * 0.5, '7' if i == 3 else i * 2.0] for i in range(1, 21)]
+            + [['Summary', 'bad', None]]
+        )
+    
+    def write_workbook(self, file_path):
+        with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
+            self.sheet.to_excel(writer, sheet_name='A', index=False, header=False)
+            pd.DataFrame([[5.0], [6.0]]).to_excel(writer, sheet_name='B', index=False, header=False)
+    
+    def test_second_load_uses_disk_cache(self, tmp_path, monkeypatch):
+        """測試第二次載入直接映射快取，不再開啟Excel檔案，結果與解析相同"""
+        file_path = tmp_path / 'panel.xlsx'
+        self.write_workbook(file_path)
+        cache_dir = tmp_path / 'cache'
+        
+        first = ExcelProcessor(cache_dir=str(cache_dir))
+        assert first.load_file(str(file_path))
+        start_row = first.detect_data_start_row()
+        end_row = first.detect_data_end_row(start_row)
+        expected = first.get_sanitized_middle_column(start_row, end_row)
+        first.close()
+        
+        def fail(*args, **kwargs):
+            raise AssertionError('不應重新解析檔案')
+        monkeypatch.setattr(pd, 'ExcelFile', fail)
+        
+        second = ExcelProcessor(cache_dir=str(cache_dir))
+        assert second.load_file(str(file_path))
+        assert second.get_available_sheets() == ['A', 'B']
+        assert second.data.shape == first.data.shape
+        assert second.get_row_classification() is not None
+        assert second.detect_data_start_row() == start_row == 2
+        assert second.detect_data_end_row(start_row) == end_row == 22
+        
+        assert isinstance(second.get_float_block(), np.memmap)  # 直接使用映射的矩陣
+        cached = second.get_sanitized_middle_column(start_row, end_row)
+        np.testing.assert_array_equal(cached.values, expected.values)
+        assert cached.dropped_count == expected.dropped_count
+        assert second.data.iloc[0, 0] == 'Title'
+        assert second.data.iloc[22, 1] == 'bad'
+    
+    def test_integer_columns_and_streaming_variant(self, tmp_path):
+        """測試整數欄位還原為整數，串流模式與完整載入分開快取"""
+        file_path = tmp_path / 'panel.csv'
+        pd.DataFrame({'a': range(10), 'b': np.linspace(0, 1, 10), 'c': range(10)}).to_csv(
+            file_path, header=False, index=False)
+        cache_dir = tmp_path / 'cache'
+        
+        assert ExcelProcessor(cache_dir=str(cache_dir)).load_file(str(file_path))
+        assert ExcelProcessor(cache_dir=str(cache_dir)).load_file(str(file_path), columns=[2])
+        
+        processor = ExcelProcessor(cache_dir=str(cache_dir))
+        assert processor.load_file(str(file_path))
+        assert processor.data.iloc[:, 0].dtype == np.int64
+        assert processor.data.iloc[:, 0].tolist() == list(range(10))
+        
+        assert processor.load_file(str(file_path), columns=[2])
+        assert processor.loaded_columns == [2]
+        assert processor.source_column_count == 3
+        assert list(processor.data.columns) == [2]
+    
+    def test_modified_file_is_reparsed(self, tmp_path):
+        """測試檔案被覆寫後快取自動失效"""
+        file_path = tmp_path / 'panel.csv'
+        cache_dir = tmp_path / 'cache'
+        pd.DataFrame([[1.0], [2.0]]).to_csv(file_path, header=False, index=False)
+        assert ExcelProcessor(cache_dir=str(cache_dir)).load_file(str(file_path))
+        
+        pd.DataFrame([[3.0], [4.0], [5.0]]).to_csv(file_path, header=False, index=False)
+        os.utime(file_path, ns=(0, 10 ** 18))
+        
+        processor = ExcelProcessor(cache_dir=str(cache_dir))
+        assert processor.load_file(str(file_path))
+        assert processor.data.iloc[:, 0].tolist() == [3.0, 4.0, 5.0]
+    
+    def test_lru_eviction(self, tmp_path):
+        """測試超過大小上限時刪除最久未使用的快取"""
+        cache = ParsedFileCache(str(tmp_path / 'cache'), max_bytes=3000)
+        data = pd.DataFrame(np.ones((100, 1)))
+        counts = np.ones(100, dtype=np.int64)
+        
+        for i in range(3):
+            cache.store_sheet(('file', i, 0), 'CSV資料', None, data, counts, counts, 0, 100)
+            assert cache.total_bytes() <= 3000
+        
+        assert cache.load_sheet(('file', 0, 0), 'CSV資料') is None
+        assert cache.load_sheet(('file', 2, 0), 'CSV資料') is not None
+        
+        cache.clear()
+        assert cache.total_bytes() == 0
+    
+    def test_unwritable_cache_dir_disables_cache(self, tmp_path):
+        """測試快取目錄無法建立時停用磁碟快取，仍可正常載入"""
+        blocker = tmp_path / 'not_a_dir'
+        blocker.write_text('')
+        file_path = tmp_path / 'panel.csv'
+        pd.DataFrame([[1.0], [2.0]]).to_csv(file_path, header=False, index=False)
+        
+        processor = ExcelProcessor(cache_dir=str(blocker / 'cache'))
+        assert processor.load_file(str(file_path))
+        assert processor.data.iloc[:, 0].tolist() == [1.0, 2.0]
+    
+    def test_text_cell_types_survive_cache(self, tmp_path):
+        """測試快取後文字儲存格保留原本的型態（整數、日期時間不會變成字串）"""
+        cache = ParsedFileCache(str(tmp_path / 'cache'))
+        measured = datetime.datetime(2024, 5, 1, 8, 30)
+        data = pd.DataFrame({0: ['Title', 7, measured, pd.Timestamp('2024-05-02'), datetime.date(2024, 5, 3), 1.5],
+                             1: [None, None, None, None, None, 2.5]})
+        counts = np.ones(6, dtype=np.int64)
+        cache.store_sheet(('file', 1, 0), 'A', None, data, counts, counts, 0, 6)
+        
+        expected = CompactSheet.from_frame(data).column(0).tolist()
+        column = cache.load_sheet(('file', 1, 0), 'A')['sheet'].column(0).tolist()
+        assert column == expected
+        assert [type(value) for value in column] == [type(value) for value in expected]
+        assert column[2] == measured and type(column[2]) is datetime.datetime
+        assert type(column[3]) is pd.Timestamp
+        
+        # 無法保存型態的文字儲存格不寫入快取
+        data.iloc[0, 0] = object()
+        cache.store_sheet(('file', 2, 0), 'A', None, data, counts, counts, 0, 6)
+        assert cache.load_sheet(('file', 2, 0), 'A') is None
+    
+    def test_concurrent_stores_keep_every_sheet(self, tmp_path):
+        """測試同時快取同一檔案的多個工作表時，meta.json不會遺失任何一個"""
+        cache_dir = str(tmp_path / 'cache')
+        data = pd.DataFrame(np.ones((10, 2)))
+        counts = np.full(10, 2, dtype=np.int64)
+        
+        def store(index):
+            ParsedFileCache(cache_dir).store_sheet(('file', 1, 0), f'S{index}', None, data, counts, counts, 0, 10)
+        
+        threads = [threading.Thread(target=store, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        cache = ParsedFileCache(cache_dir)
+        assert all(cache.load_sheet(('file', 1, 0), f'S{i}') is not None for i in range(8))
+        assert not [name for name in os.listdir(cache._entry_dir(('file', 1, 0))) if name.endswith('.tmp')]
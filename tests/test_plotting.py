@@ -0,0 +1,129 @@
+"""
+繪圖抽樣測試
+"""
+
+import pytest
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from blue_edge_analyzer.utils.plotting import (
+    BlitManager, DecimatedLine, decimation_indices, minmax_envelope_indices, nearest_point_index
+)
+
+
+class TestPlotting:
+    """繪圖抽樣測試類別"""
+    
+    def setup_method(self):
+        """測試前的設置"""
+        rng = np.random.default_rng(0)
+        self.y = rng.normal(size=100000).cumsum()
+    
+    def test_envelope_keeps_extremes(self):
+        """測試每個區間的最小值與最大值都被保留"""
+        indices = minmax_envelope_indices(self.y, 0, len(self.y), 500)
+        
+        assert len(indices) <= 2 * 500 + 4
+        assert np.all(np.diff(indices) > 0)
+        assert indices[0] == 0 and indices[-1] == len(self.y) - 1
+        assert self.y[indices].max() == self.y.max()
+        assert self.y[indices].min() == self.y.min()
+        
+        bin_size = len(self.y) // 500
+        for b in (0, 123, 499):
+            chunk = slice(b * bin_size, (b + 1) * bin_size)
+            assert b * bin_size + self.y[chunk].argmax() in indices
+            assert b * bin_size + self.y[chunk].argmin() in indices
+    
+    def test_small_range_not_decimated(self):
+        """測試點數少於區間數兩倍時不抽樣"""
+        np.testing.assert_array_equal(minmax_envelope_indices(self.y, 10, 60, 100), np.arange(10, 60))
+    
+    def test_envelope_ignores_nan(self):
+        """測試NaN不影響最小/最大值的選擇"""
+        y = np.array([np.nan, 1.0, 5.0, np.nan, -2.0, 0.0] * 100)
+        indices = minmax_envelope_indices(y, 0, len(y), 10)
+        assert np.nanmax(y[indices]) == 5.0
+        assert np.nanmin(y[indices]) == -2.0
+    
+    def test_full_resolution_ranges(self):
+        """測試閾值區域內的點全部保留"""
+        n = len(self.y)
+        indices = decimation_indices(self.y, 0, n, 500, full_resolution=[(0, 10000), (n - 10000, n)])
+        
+        assert np.all(np.isin(np.arange(10000), indices))
+        assert np.all(np.isin(np.arange(n - 10000, n), indices))
+        assert len(indices) < 20000 + 2 * 500 + 10
+        assert np.all(np.diff(indices) > 0)
+    
+    def test_redecimate_on_zoom(self):
+        """測試縮放後依可見範圍重新抽樣並在點數少時顯示標記"""
+        fig = Figure(figsize=(8, 4), dpi=100)
+        ax = fig.add_subplot(111)
+        x = np.arange(1, len(self.y) + 1)
+        decimated = DecimatedLine(ax, x, self.y, max_bins=400, marker_threshold=1000)
+        
+        assert len(decimated.line.get_xdata()) <= 2 * 400 + 4
+        assert decimated.line.get_marker() == 'None'
+        
+        ax.set_xlim(5000, 5500)
+        xdata = decimated.line.get_xdata()
+        np.testing.assert_array_equal(xdata, np.arange(4999, 5502))
+        assert decimated.line.get_marker() == 'o'
+        
+        ax.set_xlim(1, len(self.y))
+        assert len(decimated.line.get_xdata()) <= 2 * 400 + 4
+        assert decimated.line.get_marker() == 'None'
+    
+    def test_redecimate_without_keeping_reference(self):
+        """測試呼叫端不保留DecimatedLine時，縮放後仍會重新抽樣"""
+        import gc
+        
+        fig = Figure(figsize=(8, 4), dpi=100)
+        ax = fig.add_subplot(111)
+        DecimatedLine(ax, np.arange(1, len(self.y) + 1), self.y, max_bins=400, marker_threshold=1000)
+        gc.collect()
+        
+        ax.set_xlim(5000, 5500)
+        line = ax.lines[0]
+        np.testing.assert_array_equal(line.get_xdata(), np.arange(4999, 5502))
+        assert line.get_marker() == 'o'
+    
+    def test_nearest_point_matches_brute_force(self):
+        """測試二分搜尋的最近點與逐點比較的結果相同"""
+        rng = np.random.default_rng(1)
+        x = np.arange(1, 2001)
+        y = self.y[:2000].copy()
+        y[rng.integers(0, 2000, 50)] = np.nan
+        
+        for x_scale, y_scale in [(1.0, 1.0), (0.05, 20.0), (3.0, 0.01)]:
+            for x0, y0 in zip(rng.uniform(-50, 2050, 200), rng.uniform(np.nanmin(y) - 20, np.nanmax(y) + 20, 200)):
+                distances = ((x - x0) * x_scale) ** 2 + ((y - y0) * y_scale) ** 2
+                expected = int(np.where(np.isnan(distances), np.inf, distances).argmin())
+                assert nearest_point_index(x, y, x0, y0, x_scale, y_scale) == expected
+        
+        assert nearest_point_index(x[:0], y[:0], 1.0, 1.0) == -1
+        assert nearest_point_index(x[:3], np.full(3, np.nan), 1.0, 1.0) == -1
+    
+    def test_blit_manager_redraws_only_artists(self):
+        """測試完整繪製後以blitting更新動態元件，不再重繪整個圖形"""
+        fig = Figure(figsize=(4, 3), dpi=100)
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111)
+        ax.plot(self.y[:100])
+        annotation = ax.annotate('point', xy=(10, 0))
+        
+        manager = BlitManager(fig)
+        manager.add_artist(annotation)
+        assert annotation.get_animated()
+        
+        draws = []
+        fig.canvas.mpl_connect('draw_event', draws.append)
+        canvas.draw()
+        assert len(draws) == 1
+        
+        annotation.xy = (50, 0)
+        manager.update()
+        assert len(draws) == 1
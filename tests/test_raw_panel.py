@@ -0,0 +1,104 @@
+"""
+原始面板格式測試
+"""
+
+import pytest
+import numpy as np
+from blue_edge_analyzer.core.excel_processor import ExcelProcessor
+from blue_edge_analyzer.core.raw_panel import (
+    HEADER, HEADER_SIZE, MAGIC, open_raw_panel, read_raw_panel_header, write_raw_panel
+)
+
+
+class TestRawPanel:
+    """原始面板格式測試類別"""
+    
+    def setup_method(self):
+        """測試前的設置"""
+        rng = np.random.default_rng(3)
+        self.data = rng.normal(30000, 300, (40, 25))
+    
+    def test_header_layout(self, tmp_path):
+        """測試檔頭為16位元組的little-endian欄位，數值逐行排列"""
+        path = str(tmp_path / 'frame.bep')
+        write_raw_panel(path, self.data, np.float32)
+        
+        with open(path, 'rb') as f:
+            raw = f.read()
+        assert HEADER_SIZE == 16
+        assert raw[:4] == MAGIC
+        assert int.from_bytes(raw[4:8], 'little') == 25
+        assert int.from_bytes(raw[8:12], 'little') == 40
+        assert int.from_bytes(raw[12:14], 'little') == 1
+        assert len(raw) == 16 + 40 * 25 * 4
+        np.testing.assert_array_equal(np.frombuffer(raw[16:], dtype='<f4')[:25], self.data[0].astype(np.float32))
+    
+    def test_memory_mapped_round_trip(self, tmp_path):
+        """測試以記憶體映射讀回，uint16會四捨五入"""
+        path = str(tmp_path / 'frame.bep')
+        write_raw_panel(path, self.data, 'uint16')
+        
+        frame = open_raw_panel(path)
+        assert isinstance(frame, np.memmap)
+        assert frame.dtype == np.uint16 and frame.shape == (40, 25)
+        np.testing.assert_array_equal(frame, np.rint(self.data).astype(np.uint16))
+        
+        header = read_raw_panel_header(path)
+        assert header.shape == (40, 25) and header.data_bytes == 40 * 25 * 2
+    
+    def test_invalid_files(self, tmp_path):
+        """測試魔術字串、型態代碼或大小不符時拒絕讀取"""
+        path = tmp_path / 'frame.bep'
+        
+        path.write_bytes(b'NOPE' + bytes(12))
+        with pytest.raises(ValueError):
+            read_raw_panel_header(str(path))
+        
+        path.write_bytes(HEADER.pack(MAGIC, 4, 4, 9, 0) + bytes(64))
+        with pytest.raises(ValueError):
+            read_raw_panel_header(str(path))
+        
+        path.write_bytes(HEADER.pack(MAGIC, 4, 4, 1, 0) + bytes(63))
+        with pytest.raises(ValueError):
+            read_raw_panel_header(str(path))
+        
+        with pytest.raises(ValueError):
+            write_raw_panel(str(path), self.data, np.int64)
+    
+    def test_processor_loads_memory_mapped(self, tmp_path):
+        """測試ExcelProcessor載入原始面板：數值矩陣直接映射，中間列與原始數據相同"""
+        path = str(tmp_path / 'frame.bep')
+        write_raw_panel(path, self.data, np.float32)
+        
+        processor = ExcelProcessor()
+        assert processor.load_file(path)
+        assert processor.get_file_type() == 'raw'
+        assert isinstance(processor.get_float_block(), np.memmap)
+        assert processor.get_float_block().dtype == np.float32
+        
+        assert (processor.detect_data_start_row(), processor.detect_data_end_row(0)) == (0, 40)
+        middle = processor.get_sanitized_middle_column(0, 40).values
+        np.testing.assert_array_equal(middle, self.data[:, 12].astype(np.float32))
+    
+    def test_nan_border_rows_match_npy(self, tmp_path):
+        """測試全為NaN的壞行/空白行不視為數據行，偵測結果與相同數據的.npy一致"""
+        data = self.data[:20].copy()
+        data[:3] = np.nan
+        data[-2:] = np.nan
+        bep_path, npy_path = str(tmp_path / 'frame.bep'), str(tmp_path / 'frame.npy')
+        write_raw_panel(bep_path, data)
+        np.save(npy_path, data)
+        
+        results = []
+        for path in (bep_path, npy_path):
+            processor = ExcelProcessor()
+            assert processor.load_file(path)
+            start_row = processor.detect_data_start_row()
+            results.append((start_row, processor.detect_data_end_row(start_row)))
+        assert results[0] == results[1] == (3, 18)
+        
+        # 整數面板不可能有NaN，不需要掃描數據
+        write_raw_panel(bep_path, self.data, 'uint16')
+        processor = ExcelProcessor()
+        assert processor.load_file(bep_path)
+        assert (processor.detect_data_start_row(), processor.detect_data_end_row(0)) == (0, 40)
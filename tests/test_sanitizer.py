@@ -0,0 +1,62 @@
+"""
+數值資料清理工具測試
+"""
+
+import pytest
+import numpy as np
+from blue_edge_analyzer.utils.sanitizer import sanitize_numeric
+
+
+def loop_reference(data):
+    """原始逐個float()轉換的清理方式"""
+    clean_list = []
+    for val in data:
+        try:
+            float_val = float(val)
+            if not np.isnan(float_val):
+                clean_list.append(float_val)
+        except (ValueError, TypeError):
+            continue
+    return clean_list
+
+
+class TestSanitizer:
+    """數值資料清理測試類別"""
+    
+    def test_numeric_array(self):
+        """測試純數值陣列"""
+        result = sanitize_numeric(np.array([1.0, np.nan, 3.0]))
+        
+        assert result.values.tolist() == [1.0, 3.0]
+        assert result.dropped_count == 1
+        assert result.dropped_positions.tolist() == [1]
+        assert result.non_numeric_positions.tolist() == []
+        assert result.total_count == 3
+    
+    def test_object_array_with_text(self):
+        """測試含有文字儲存格的object陣列"""
+        data = np.array(['Header', 1, '2.5', None, ' 3 ', np.nan, '', '1_000', 'nan', True, 'abc'], dtype=object)
+        result = sanitize_numeric(data)
+        
+        assert result.values.tolist() == loop_reference(data)
+        assert result.dropped_count == 6
+        assert result.dropped_positions.tolist() == [0, 3, 5, 6, 8, 10]
+        assert result.non_numeric_positions.tolist() == [0, 6, 10]
+    
+    def test_empty(self):
+        """測試空陣列"""
+        result = sanitize_numeric(np.array([]))
+        
+        assert len(result.values) == 0
+        assert result.dropped_count == 0
+    
+    def test_strings_rejected_by_to_numeric(self):
+        """測試to_numeric拒絕但float()接受的字串（空白、NaN字串、底線、全形數字）與逐個轉換結果相同"""
+        data = np.array([' 1 ', '\t2\n', ' nan ', '-NaN', '1_000', '１２', '　3　', 'abc', '', '1,000',
+                         '1__0', '0x10', None, 4.5, 'Summary'], dtype=object)
+        result = sanitize_numeric(data)
+        
+        assert result.values.tolist() == loop_reference(data) == [1.0, 2.0, 1000.0, 12.0, 3.0, 4.5]
+        # NaN字串可轉換為數字，但仍被移除；其餘被移除的是非數值內容
+        assert result.dropped_positions.tolist() == [2, 3, 7, 8, 9, 10, 11, 12, 14]
+        assert result.non_numeric_positions.tolist() == [7, 8, 9, 10, 11, 14]
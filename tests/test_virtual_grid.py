@@ -0,0 +1,66 @@
+"""
+虛擬化表格測試
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from blue_edge_analyzer.gui.virtual_grid import GridSource, Viewport
+
+
+class TestVirtualGrid:
+    """虛擬化表格測試類別"""
+    
+    def setup_method(self):
+        """測試前的設置"""
+        self.viewport = Viewport(4000, size=30)
+    
+    def test_viewport_scroll_is_clamped(self):
+        """測試捲動範圍限制在第一頁與最後一頁之間"""
+        assert not self.viewport.scroll(-5)
+        assert self.viewport.range() == (0, 30)
+        
+        assert self.viewport.scroll(2, 'pages')
+        assert self.viewport.offset == 2 * 29
+        
+        self.viewport.moveto(1.0)
+        assert self.viewport.range() == (3970, 4000)
+        assert self.viewport.fractions() == (3970 / 4000, 1.0)
+        
+        # 可見行數變多時開始位置往前移，最後一頁仍然填滿
+        self.viewport.set_size(50)
+        assert self.viewport.range() == (3950, 4000)
+    
+    def test_viewport_show_row(self):
+        """測試跳到指定行時該行位於可見範圍內"""
+        assert self.viewport.show(2500)
+        start, stop = self.viewport.range()
+        assert start == 2500 - 10 and start <= 2500 < stop
+        
+        assert not self.viewport.show(2505)
+        
+        self.viewport.show(3999)
+        assert self.viewport.range() == (3970, 4000)
+    
+    def test_format_only_requested_block(self):
+        """測試只格式化指定範圍的儲存格，空值顯示為指定文字"""
+        frame = pd.DataFrame(np.arange(4000 * 400, dtype=float).reshape(4000, 400))
+        frame[0] = frame[0].astype(object)
+        frame.iloc[10, 0] = 'Summary'
+        frame.iloc[11, 1] = np.nan
+        
+        source = GridSource(frame)
+        assert (source.row_count, source.column_count) == (4000, 400)
+        assert source.row_label(0) == '1'
+        
+        block = source.format_block(10, 12, 0, 3)
+        assert block == [['Summary', '4001.0', '4002.0'], ['4400.0', '', '4402.0']]
+    
+    def test_array_source(self):
+        """測試一維陣列來源（中間列數據）的行號與NaN顯示"""
+        source = GridSource(np.array([1.5, np.nan, 3.0]), first_row_number=8,
+                            column_labels=['數值'], empty_text='NaN')
+        
+        assert source.column_count == 1 and source.column_labels == ['數值']
+        assert source.row_label(2) == '10'
+        assert source.format_block(0, 3, 0, 1) == [['1.5'], ['NaN'], ['3.0']]